@@ -7,6 +7,11 @@ import io
 from dotenv import load_dotenv
 from openai import OpenAI
 
+from image_prep import prepare_vision_image
+from log_util import get_logger, Preview
+
+logger = get_logger(__name__)
+
 # .env 파일 로드
 load_dotenv()
 
@@ -15,16 +20,10 @@ api_key = os.getenv('OPENAI_API_KEY')
 client = None
 if api_key:
     client = OpenAI(api_key=api_key)
-    print("OpenAI API 키가 설정되었습니다.")
-else:
-    print("OpenAI API 키가 설정되지 않았습니다. 이미지 분석 기능을 사용할 수 없습니다.")
-
-# API 키 확인
-if not os.getenv('OPENAI_API_KEY'):
-    print("OpenAI API 키가 설정되지 않았습니다!")
-    print("환경변수 OPENAI_API_KEY를 설정해주세요.")
+    logger.info("OpenAI API 키가 설정되었습니다.")
 else:
-    print("OpenAI API 키가 설정되었습니다.")
+    logger.warning("OpenAI API 키가 설정되지 않았습니다. 이미지 분석 기능을 사용할 수 없습니다. "
+                   "환경변수 OPENAI_API_KEY를 설정해주세요.")
 
 def call_ai_service(prompt):
     """AI 서비스 호출 함수"""
@@ -51,7 +50,7 @@ def call_ai_service(prompt):
         return response.choices[0].message.content
         
     except Exception as e:
-        print(f"AI 서비스 호출 오류: {str(e)}")
+        logger.error("AI 서비스 호출 오류: %s", e)
         return f"AI 서비스 호출 중 오류가 발생했습니다: {str(e)}"
 
 def extract_text_from_image(image_data):
@@ -60,9 +59,8 @@ def extract_text_from_image(image_data):
         if not client:
             return "OpenAI API 키가 설정되지 않았습니다."
         
-        # base64 데이터 부분만 추출
-        if ',' in image_data:
-            image_data = image_data.split(',')[1]
+        # 글자가 읽히는 범위에서 축소/재인코딩 (메타데이터 제거)
+        image_url = prepare_vision_image(image_data)['data_url']
         
         # OpenAI GPT Vision으로 텍스트 추출
         response = client.chat.completions.create(
@@ -78,7 +76,7 @@ def extract_text_from_image(image_data):
                         {
                             "type": "image_url",
                             "image_url": {
-                                "url": f"data:image/jpeg;base64,{image_data}"
+                                "url": image_url
                             }
                         }
                     ]
@@ -90,20 +88,18 @@ def extract_text_from_image(image_data):
         extracted_text = response.choices[0].message.content
         
         # 디버깅을 위한 로그
-        print(f"=== 텍스트 추출 결과 ===")
-        print(f"추출된 텍스트: {extracted_text}")
-        print(f"=======================")
+        logger.debug("[텍스트 추출] 결과: %s", Preview(extracted_text, 500))
         
         # 텍스트가 없거나 "텍스트가 없습니다"라는 메시지인 경우
         if not extracted_text.strip() or "텍스트가 없습니다" in extracted_text:
-            print("텍스트 추출 실패 - None 반환")
+            logger.info("[텍스트 추출] 텍스트 없음 - None 반환")
             return None  # None을 반환하여 실패를 명확히 표시
         
-        print("텍스트 추출 성공")
+        logger.info("[텍스트 추출] 성공 (%d자)", len(extracted_text))
         return extracted_text
         
     except Exception as e:
-        print(f"이미지 텍스트 추출 오류: {str(e)}")
+        logger.error("[텍스트 추출] 오류: %s", e)
         return None
 
 def summarize_text_logic(text):
@@ -134,9 +130,8 @@ def summarize_image_logic(image_data):
         if not client:
             return {'error': 'OpenAI API 키가 설정되지 않았습니다. 이미지 분석을 사용할 수 없습니다.'}
         
-        # base64 데이터 부분만 추출
-        if ',' in image_data:
-            image_data = image_data.split(',')[1]
+        # 글자가 읽히는 범위에서 축소/재인코딩 (메타데이터 제거)
+        image_url = prepare_vision_image(image_data)['data_url']
         
         # OpenAI GPT Vision으로 텍스트 추출
         response = client.chat.completions.create(
@@ -152,7 +147,7 @@ def summarize_image_logic(image_data):
                         {
                             "type": "image_url",
                             "image_url": {
-                                "url": f"data:image/jpeg;base64,{image_data}"
+                                "url": image_url
                             }
                         }
                     ]
@@ -163,9 +158,7 @@ def summarize_image_logic(image_data):
         extracted_text = response.choices[0].message.content
         
         # 디버깅을 위한 로그 추가
-        print("=== GPT Vision 응답 ===")
-        print(extracted_text)
-        print("======================")
+        logger.debug("[이미지 요약] GPT Vision 응답: %s", Preview(extracted_text, 500))
         
         if not extracted_text.strip():
             return {'error': '이미지에서 텍스트를 추출할 수 없습니다.'}
@@ -229,17 +222,14 @@ def summarize_image_logic(image_data):
             'study_notes': study_notes.strip() if is_study_content else ""
         }
         
-        print(f"=== 파싱 결과 ===")
-        print(f"classification: {result['classification']}")
-        print(f"main_content: {result['main_content'][:100]}...")
-        print(f"is_study_content: {result['is_study_content']}")
-        print(f"study_notes length: {len(result['study_notes'])}")
-        print("==================")
+        logger.info("[이미지 요약] 분류: %s, 공부 내용: %s, 요약 노트 %d자",
+                    result['classification'], result['is_study_content'], len(result['study_notes']))
+        logger.debug("[이미지 요약] 주요 내용: %s", Preview(result['main_content'], 100))
         
         return result
         
     except Exception as e:
-        print(f"이미지 분석 오류: {str(e)}")
+        logger.error("[이미지 요약] 오류: %s", e)
         return {'error': f'이미지 분석 중 오류가 발생했습니다: {str(e)}'}
 
 def generate_image_logic(content):
@@ -356,7 +346,7 @@ def generate_image_logic(content):
         return {'image': data_url, 'type': 'html'}
         
     except Exception as e:
-        print(f"이미지 생성 오류: {str(e)}")
+        logger.error("이미지 생성 오류: %s", e)
         return {'error': f'이미지 생성 중 오류가 발생했습니다: {str(e)}'}
 
 def summarize_api():
@@ -402,7 +392,7 @@ def generate_image_api():
         })
         
     except Exception as e:
-        print(f"이미지 생성 오류: {str(e)}")
+        logger.error("이미지 생성 오류: %s", e)
         return jsonify({'error': f'이미지 생성 중 오류가 발생했습니다: {str(e)}'}), 500
 
 def analyze_content_api():
@@ -435,7 +425,7 @@ def analyze_content_api():
             return jsonify({'error': '올바른 콘텐츠 타입과 데이터가 필요합니다.'}), 400
             
     except Exception as e:
-        print(f"콘텐츠 분석 오류: {str(e)}")
+        logger.error("콘텐츠 분석 오류: %s", e)
         return jsonify({'error': str(e)}), 500
 
 def analyze_text_logic(text, analysis_type='general'):
@@ -525,7 +515,7 @@ def analyze_text_logic(text, analysis_type='general'):
             }
             
     except Exception as e:
-        print(f"텍스트 분석 오류: {str(e)}")
+        logger.error("텍스트 분석 오류: %s", e)
         return {
             "classification": "분석 오류",
             "main_content": "텍스트 분석 중 오류가 발생했습니다.",
@@ -537,7 +527,7 @@ def analyze_text_logic(text, analysis_type='general'):
 def analyze_image_logic(image_data, analysis_type='general'):
     """이미지 분석 로직"""
     try:
-        print("=== 이미지 분석 시작 ===")
+        logger.debug("[이미지 분석] 시작")
         
         # 바로 GPT Vision으로 전체 이미지 분석 진행
         vision_result = summarize_image_logic(image_data)
@@ -566,7 +556,7 @@ def analyze_image_logic(image_data, analysis_type='general'):
         }
             
     except Exception as e:
-        print(f"이미지 분석 오류: {str(e)}")
+        logger.error("이미지 분석 오류: %s", e)
         return {
             "classification": "분석 오류",
             "main_content": "이미지 분석 중 오류가 발생했습니다.",
@@ -678,7 +668,7 @@ URL: {url}
             }
             
     except Exception as e:
-        print(f"링크 분석 오류: {str(e)}")
+        logger.error("링크 분석 오류: %s", e)
         return {
             "title": "분석 오류",
             "description": "링크 분석 중 오류가 발생했습니다.",
@@ -8,21 +8,25 @@ import json
 import time
 import os
 import asyncio
+import multiprocessing
 
 import base64
 from io import BytesIO
 from PIL import Image
 
-from config import CORS_ORIGIN, FLASK_DEBUG, FLASK_HOST, FLASK_PORT
+from config import CORS_ORIGIN, FLASK_DEBUG, FLASK_HOST, FLASK_PORT, INTERVIEW_EVAL_MODE
 from gemini_client import get_gemini_client
 
 from config import config
-from interview import analyze_video_api
+from interview import analyze_video_api, resolve_video_path
 from TextCleanup import summarize_api
 from services.job_analyzer import JobAnalyzer
 from services.interview_service import InterviewService
 from services.report_generator import ReportGenerator
+from services.analysis_queue import AnalysisJobQueue
 from posture_analyzer import PostureAnalyzer
+from posture_recorder import PostureSessionRecorder
+from upload_store import ContentStore, UploadError
 from TextCleanup import summarize_api, generate_image_api, analyze_content_api
 from self_app import self_bp
 from network import networking_ai
@@ -30,6 +34,10 @@ from network import networking_ai
 
 app = Flask(__name__)
 
+# 분석 작업/비디오 워커 프로세스는 spawn으로 시작되어 이 파일을 __mp_main__으로 다시 import함
+# → 무거운 서비스(MediaPipe, 작업 큐, 업로드 저장소 등)는 최상위 서버 프로세스에서만 생성
+IS_SERVER_PROCESS = multiprocessing.parent_process() is None
+
 # 환경에 따른 설정 로드
 env = os.environ.get('FLASK_ENV', 'development')
 app.config.from_object(config[env])
@@ -38,8 +46,12 @@ app.config.from_object(config[env])
 os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
 os.makedirs(os.path.join(app.config['UPLOAD_FOLDER'], 'posture'), exist_ok=True)
 
-# 자세 분석기 인스턴스 생성
-posture_analyzer = PostureAnalyzer()
+if IS_SERVER_PROCESS:
+    # 자세 분석기 인스턴스 생성
+    posture_analyzer = PostureAnalyzer()
+    
+    # 자세 세션 기록기 (사용자별 타임라인 저장)
+    posture_recorder = PostureSessionRecorder(os.path.join(app.config['UPLOAD_FOLDER'], 'posture', 'sessions'))
 
 def save_base64_image(image_data, filename):
     """base64 이미지 데이터를 파일로 저장"""
@@ -60,9 +72,15 @@ def save_base64_image(image_data, filename):
         return None
 
 # 서비스 인스턴스 생성
-job_analyzer = JobAnalyzer()
-interview_service = InterviewService()
-report_generator = ReportGenerator()
+if IS_SERVER_PROCESS:
+    job_analyzer = JobAnalyzer()
+    interview_service = InterviewService()
+    report_generator = ReportGenerator()
+    analysis_queue = AnalysisJobQueue(
+        os.path.join(app.config['UPLOAD_FOLDER'], 'jobs'),
+        max_running=app.config['VIDEO_ANALYSIS_MAX_JOBS'],
+        finished_ttl=app.config['VIDEO_ANALYSIS_JOB_TTL']
+    )
 # CORS 설정에 supports_credentials=True 추가
 CORS(app, origins=[CORS_ORIGIN], supports_credentials=True)
 app.register_blueprint(self_bp)
@@ -75,6 +93,11 @@ UPLOAD_FOLDER = 'uploads'
 app.config['UPLOAD_FOLDER'] = UPLOAD_FOLDER
 os.makedirs(UPLOAD_FOLDER, exist_ok=True)
 
+# 업로드 파일 저장소 (SHA-256 내용 주소, 같은 파일은 한 번만 저장)
+app.config['CONTENT_STORE_FOLDER'] = os.path.join(UPLOAD_FOLDER, 'store')
+if IS_SERVER_PROCESS:
+    content_store = ContentStore(app.config['CONTENT_STORE_FOLDER'], max_upload_size=app.config['MAX_UPLOAD_SIZE'])
+
 # 모델은 파이토치 환경에서 """으로 사용합니다.
 # ----------------------------------------------------
 """
@@ -96,26 +119,87 @@ def index():
     """메인 페이지"""
     return render_template('index.html')
 
+def _upload_response(result, original_filename):
+    return {
+        'message': '파일이 성공적으로 업로드되었습니다.',
+        'filename': result['content_id'],
+        'original_filename': original_filename,
+        'size': result['size'],
+        'sha256': result['sha256'],
+        'deduplicated': result['deduplicated']
+    }
+
+def _upload_error(e):
+    return jsonify({'error': str(e), **e.details}), e.status_code
+
 @app.route('/api/upload', methods=['POST'])
 def upload_file():
-    """파일 업로드 API"""
-    if 'file' not in request.files:
-        return jsonify({'error': '파일이 선택되지 않았습니다.'}), 400
-    
-    file = request.files['file']
-    if file.filename == '':
-        return jsonify({'error': '파일이 선택되지 않았습니다.'}), 400
-    
-    if file:
-        filename = file.filename
-        file_path = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-        file.save(file_path)
-        
-        return jsonify({
-            'message': '파일이 성공적으로 업로드되었습니다.',
-            'filename': filename,
-            'size': os.path.getsize(file_path)
-        })
+    """
+    파일 업로드 API
+    - multipart 'file' 필드 또는 ?filename=...과 함께 보낸 요청 본문(application/octet-stream)을 스트리밍 저장
+    - 응답의 filename(내용 해시)을 /api/analyze에 그대로 사용
+    """
+    try:
+        if request.mimetype == 'application/octet-stream':
+            original_filename = request.args.get('filename', '')
+            result = content_store.save_stream(request.stream, original_filename)
+        else:
+            if 'file' not in request.files:
+                return jsonify({'error': '파일이 선택되지 않았습니다.'}), 400
+
+            file = request.files['file']
+            if file.filename == '':
+                return jsonify({'error': '파일이 선택되지 않았습니다.'}), 400
+            original_filename = file.filename
+            result = content_store.save_stream(file.stream, original_filename)
+
+        return jsonify(_upload_response(result, original_filename))
+    except UploadError as e:
+        return _upload_error(e)
+
+@app.route('/api/upload/chunked', methods=['POST'])
+def start_chunked_upload():
+    """분할 업로드 시작 - {filename, size} → upload_id"""
+    data = request.get_json(silent=True) or {}
+    try:
+        upload = content_store.start_upload(data.get('filename', ''), data.get('size', 0))
+    except (TypeError, ValueError):
+        return jsonify({'error': 'size가 올바르지 않습니다.'}), 400
+    except UploadError as e:
+        return _upload_error(e)
+    return jsonify({'success': True, 'upload_id': upload['upload_id'], 'received': 0, 'size': upload['size']}), 201
+
+@app.route('/api/upload/chunked/<upload_id>', methods=['GET'])
+def get_chunked_upload(upload_id):
+    """이어받을 위치(received) 조회 - 연결이 끊긴 뒤 재개할 때 사용"""
+    try:
+        upload = content_store.upload_status(upload_id)
+    except UploadError as e:
+        return _upload_error(e)
+    return jsonify({'success': True, 'upload_id': upload_id, 'received': upload['received'], 'size': upload['size']})
+
+@app.route('/api/upload/chunked/<upload_id>', methods=['PUT'])
+def put_upload_chunk(upload_id):
+    """청크 추가 - ?offset=<바이트 위치>, 본문은 청크 바이트 (청크당 MAX_CONTENT_LENGTH 이하)"""
+    try:
+        offset = int(request.args.get('offset', ''))
+    except ValueError:
+        return jsonify({'error': 'offset이 올바르지 않습니다.'}), 400
+    try:
+        upload = content_store.append_chunk(upload_id, offset, request.stream)
+    except UploadError as e:
+        return _upload_error(e)
+    return jsonify({'success': True, 'upload_id': upload_id, 'received': upload['received'], 'size': upload['size']})
+
+@app.route('/api/upload/chunked/<upload_id>/complete', methods=['POST'])
+def complete_chunked_upload(upload_id):
+    """모든 청크 수신 후 저장소로 이동"""
+    try:
+        meta = content_store.upload_status(upload_id)
+        result = content_store.complete_upload(upload_id)
+    except UploadError as e:
+        return _upload_error(e)
+    return jsonify(_upload_response(result, meta['filename']))
 
 # 대화 히스토리 조회 (임시)
 @app.route('/api/history', methods=['GET'])
@@ -161,11 +245,42 @@ def chat_message():
 
 @app.route('/api/analyze', methods=['POST'])
 def analyze_video_route():
-    """비디오 분석 API 라우트"""
-    # analyze_video_api 함수가 있다면 import해서 사용
-    # from interview import analyze_video_api
-    # return analyze_video_api()
-    return jsonify({'message': '비디오 분석 기능은 추후 구현 예정입니다.'})
+    """비디오 분석 API 라우트 - 업로드된 파일은 작업 큐에 등록 후 job_id 반환"""
+    data = request.get_json(silent=True) or {}
+    if not data.get('filename'):
+        return analyze_video_api()
+    
+    video_path = resolve_video_path(data['filename'])
+    if not video_path:
+        return jsonify({'error': '업로드된 비디오 파일을 찾을 수 없습니다.'}), 404
+    
+    try:
+        job = analysis_queue.submit(video_path, data['filename'])
+    except RuntimeError as e:
+        return jsonify({'error': str(e)}), 503
+    
+    return jsonify({
+        'success': True,
+        'job_id': job['job_id'],
+        'status': job['status'],
+        'status_url': f"/api/analyze/{job['job_id']}"
+    }), 202
+
+@app.route('/api/analyze/<job_id>', methods=['GET'])
+def analyze_job_status(job_id):
+    """비디오 분석 작업 상태/진행률/결과 조회 API"""
+    job = analysis_queue.status(job_id)
+    if job is None:
+        return jsonify({'error': '분석 작업을 찾을 수 없습니다.'}), 404
+    return jsonify(job)
+
+@app.route('/api/analyze/<job_id>', methods=['DELETE'])
+def cancel_analyze_job(job_id):
+    """비디오 분석 작업 취소 API"""
+    job = analysis_queue.cancel(job_id)
+    if job is None:
+        return jsonify({'error': '분석 작업을 찾을 수 없습니다.'}), 404
+    return jsonify(job)
 
 @app.route('/api/summarize', methods=['POST'])
 def summarize_route():
@@ -259,17 +374,91 @@ def submit_answer():
     
     try:
         data = request.get_json()
+        if data.get('mode', INTERVIEW_EVAL_MODE) == 'speculative':
+            # 규칙 기반 점수를 즉시 반환하고 Claude 평가는 백그라운드에서 진행
+            # → 클라이언트는 /api/evaluation/<evaluation_id>로 갱신된 결과를 조회
+            evaluation = interview_service.evaluate_answer_speculative(
+                data['question'],
+                data['answer'],
+                data['time_taken'],
+                data['max_time'],
+                data.get('session_id'),
+                data.get('question_index')
+            )
+            return jsonify({
+                "success": True,
+                "score": evaluation["score"],
+                "feedback": evaluation["feedback"],
+                "next_question": None,
+                "question_index": evaluation["question_index"],
+                "evaluation_id": evaluation["evaluation_id"],
+                "status": evaluation["status"]
+            })
+        
         evaluation = asyncio.run(interview_service.evaluate_answer(
             data['question'],
             data['answer'],
             data['time_taken'],
             data['max_time']
         ))
+        # 세션이 있으면 답변/점수/피드백을 서버에 누적 (리포트 생성 시 사용)
+        question_index = interview_service.record_answer(
+            data.get('session_id'),
+            data['question'],
+            data['answer'],
+            evaluation,
+            data.get('question_index')
+        )
         return jsonify({
             "success": True,
             "score": evaluation["score"],
             "feedback": evaluation["feedback"],
-            "next_question": evaluation.get("next_question")
+            "next_question": evaluation.get("next_question"),
+            "question_index": question_index
+        })
+    except Exception as e:
+        return jsonify({"error": str(e)}), 400
+
+@app.route('/api/evaluation/<evaluation_id>', methods=['GET'])
+def get_evaluation(evaluation_id):
+    """백그라운드 답변 평가 결과 조회 API (status: pending | done, refined: Claude 평가로 갱신됐는지)"""
+    evaluation = interview_service.get_evaluation(evaluation_id)
+    if evaluation is None:
+        return jsonify({"error": "평가 결과를 찾을 수 없습니다."}), 404
+    return jsonify({"success": True, "evaluation_id": evaluation_id, **evaluation})
+
+@app.route('/api/evaluate-answers', methods=['POST'])
+def evaluate_answers():
+    """답변 일괄 평가 API - 면접 종료 후 모든 답변을 한 번의 요청으로 동시에 평가 (요청 순서대로 반환)"""
+    try:
+        data = request.get_json()
+        session_id = data.get('session_id')
+        items = data.get('answers')
+        if items is None:
+            # 답변 목록이 없으면 세션에 저장된 답변을 평가
+            items = interview_service.session_answer_items(session_id)
+            if items is None:
+                return jsonify({"error": "세션을 찾을 수 없습니다."}), 404
+        
+        evaluations = asyncio.run(interview_service.evaluate_answers(items))
+        
+        results = []
+        for item, evaluation in zip(items, evaluations):
+            question_index = interview_service.record_answer(
+                session_id,
+                item['question'],
+                item['answer'],
+                evaluation,
+                item.get('question_index')
+            )
+            results.append({
+                "score": evaluation["score"],
+                "feedback": evaluation["feedback"],
+                "question_index": question_index
+            })
+        return jsonify({
+            "success": True,
+            "results": results
         })
     except Exception as e:
         return jsonify({"error": str(e)}), 400
@@ -280,16 +469,18 @@ def generate_report():
     try:
         data = request.get_json()
         print(f"PDF 생성 요청: session_id={data['session_id']}")
-        print(f"질문 수: {len(data['questions'])}, 답변 수: {len(data['answers'])}")
         
-        # 세션 데이터를 딕셔너리로 변환
-        session_data = {
-            "session_id": data['session_id'],
-            "questions": data['questions'],
-            "answers": data['answers'],
-            "scores": data['scores'],
-            "feedback": data['feedback']
-        }
+        # 서버에 누적된 세션 데이터 우선 사용, 없으면(만료 등) 요청 본문 사용
+        session_data = interview_service.get_report_data(data['session_id'])
+        if session_data is None:
+            session_data = {
+                "session_id": data['session_id'],
+                "questions": data['questions'],
+                "answers": data['answers'],
+                "scores": data['scores'],
+                "feedback": data['feedback']
+            }
+        print(f"질문 수: {len(session_data['questions'])}, 답변 수: {len(session_data['answers'])}")
         
         pdf_path = report_generator.create_pdf_report(session_data)
         
@@ -381,12 +572,71 @@ def posture_analyze():
         )
         
         if result['success']:
+            # user_id가 있으면 세션 타임라인에 기록
+            if data.get('user_id'):
+                result['session_id'] = posture_recorder.record(
+                    data['user_id'],
+                    result,
+                    data.get('session_id')
+                )
             return jsonify(result)
         else:
             return jsonify({'error': result['message']}), 400
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         return jsonify({'error': f'서버 오류: {str(e)}'}), 500
 
+@app.route('/api/posture/sessions', methods=['POST'])
+def posture_start_session():
+    """자세 세션 시작 API"""
+    try:
+        data = request.get_json() or {}
+        session_id = posture_recorder.start_session(
+            data.get('user_id'),
+            data.get('movement_threshold', 'medium')
+        )
+        return jsonify({'session_id': session_id})
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+@app.route('/api/posture/sessions/<user_id>', methods=['GET'])
+def posture_list_sessions(user_id):
+    """사용자 자세 세션 목록 API"""
+    try:
+        return jsonify({'sessions': posture_recorder.list_sessions(user_id)})
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+@app.route('/api/posture/sessions/<user_id>/<session_id>/summary', methods=['GET'])
+def posture_session_summary(user_id, session_id):
+    """자세 세션 집계 API (경고 시간 비율, 가장 나빴던 구간)"""
+    try:
+        summary = posture_recorder.summarize(
+            user_id,
+            session_id,
+            window_sec=request.args.get('window', 30, type=float),
+            top_k=request.args.get('top', 3, type=int)
+        )
+        if not summary['success']:
+            return jsonify({'error': summary['message']}), 404
+        return jsonify(summary)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+@app.route('/api/posture/sessions/<user_id>/<session_id>/timeline', methods=['GET'])
+def posture_session_timeline(user_id, session_id):
+    """자세 세션 타임라인 API (구간별 다운샘플링)"""
+    try:
+        points = posture_recorder.timeline(
+            user_id,
+            session_id,
+            bucket_sec=request.args.get('bucket', 10, type=float)
+        )
+        return jsonify({'timeline': points})
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
 @app.route('/api/posture/settings', methods=['GET'])
 def get_posture_settings():
     """설정 정보 조회 API"""
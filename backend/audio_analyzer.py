@@ -0,0 +1,292 @@
+import json
+import shutil
+import subprocess
+import numpy as np
+
+from config import VOSK_MODEL_PATH
+from log_util import get_logger
+
+logger = get_logger(__name__)
+
+# ffmpeg로 추출할 오디오 형식 (16kHz mono s16le - 음성 인식기 입력과 동일)
+SAMPLE_RATE = 16000
+CHUNK_SEC = 1.0
+
+# 분석 프레임 (30ms)
+FRAME_SIZE = int(SAMPLE_RATE * 0.03)
+FRAME_SEC = FRAME_SIZE / SAMPLE_RATE
+
+# 음성 구간 판단 - 노이즈 바닥보다 VAD_MARGIN_DB 이상 크고 VAD_MIN_DB 이상이면 발화
+VAD_MARGIN_DB = 10.0
+VAD_MIN_DB = -50.0
+NOISE_FLOOR_SMOOTHING = 0.1
+
+# 이 길이 이상 이어지는 무음만 '침묵'으로 집계 (문장 사이 짧은 호흡 제외)
+SILENCE_MIN_SEC = 0.7
+
+# 인식기가 없을 때 음절 수로 어절 수 추정 (한국어 평균 어절 길이)
+SYLLABLES_PER_WORD = 2.5
+ENVELOPE_SMOOTHING = 3  # 음절 피크 검출용 이동 평균 프레임 수
+
+# 인식기가 없을 때 '음/어' 같은 채움말 후보 - 짧은 무음 뒤에 오는 길고 평탄한 발화
+FILLER_MIN_SEC = 0.25
+FILLER_MAX_SEC = 1.5
+FILLER_PRECEDING_SILENCE_SEC = 0.3
+FILLER_MAX_ENERGY_CV = 0.25
+
+FILLER_WORDS = {'음', '어', '으', '그', '저', '아', '음음', '어어', '그러니까', '약간'}
+
+
+def iter_audio_chunks(video_path, chunk_sec=CHUNK_SEC):
+    """
+    ffmpeg로 영상의 오디오 트랙을 16kHz mono PCM으로 디코딩하며 chunk_sec 단위 int16 배열을 반환합니다.
+    전체 오디오를 메모리에 올리지 않습니다.
+    """
+    ffmpeg = shutil.which('ffmpeg')
+    if not ffmpeg:
+        raise RuntimeError('ffmpeg를 찾을 수 없습니다. 오디오 분석을 위해 ffmpeg를 설치해주세요.')
+
+    process = subprocess.Popen(
+        [ffmpeg, '-nostdin', '-loglevel', 'error', '-i', video_path,
+         '-vn', '-ac', '1', '-ar', str(SAMPLE_RATE), '-f', 's16le', '-'],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL
+    )
+    chunk_bytes = int(SAMPLE_RATE * chunk_sec) * 2
+    try:
+        while True:
+            data = process.stdout.read(chunk_bytes)
+            if not data:
+                break
+            yield np.frombuffer(data[:len(data) // 2 * 2], dtype=np.int16)
+    finally:
+        process.stdout.close()
+        process.kill()
+        process.wait()
+
+
+def _runs(mask):
+    """불리언 배열의 연속 구간 (값, 시작 인덱스, 길이)"""
+    change = np.flatnonzero(np.diff(mask.astype(np.int8))) + 1
+    starts = np.concatenate(([0], change))
+    lengths = np.diff(np.concatenate((starts, [len(mask)])))
+    return mask[starts], starts, lengths
+
+
+class OfflineRecognizer:
+    """Vosk 오프라인 음성 인식기 래퍼 (모델이 없으면 None)"""
+
+    def __init__(self, recognizer):
+        self.recognizer = recognizer
+        self.words = 0
+        self.fillers = 0
+
+    @classmethod
+    def create(cls):
+        if not VOSK_MODEL_PATH:
+            return None
+        try:
+            from vosk import Model, KaldiRecognizer
+            recognizer = KaldiRecognizer(Model(VOSK_MODEL_PATH), SAMPLE_RATE)
+            recognizer.SetWords(True)
+            return cls(recognizer)
+        except Exception:
+            logger.exception("음성 인식기 로드 실패, 에너지 기반 추정 사용")
+            return None
+
+    def _count(self, result_json):
+        text = json.loads(result_json).get('text', '')
+        for word in text.split():
+            self.words += 1
+            if word in FILLER_WORDS:
+                self.fillers += 1
+
+    def feed(self, samples):
+        if self.recognizer.AcceptWaveform(samples.tobytes()):
+            self._count(self.recognizer.Result())
+
+    def finish(self):
+        self._count(self.recognizer.FinalResult())
+
+
+class AudioAccumulator:
+    """
+    오디오 청크를 받아 음량/무음/음절/채움말 통계를 누적합니다.
+    청크 내부 계산은 NumPy로 벡터화하고, 청크 경계를 넘는 구간 상태만 O(1)로 유지합니다.
+    """
+
+    def __init__(self):
+        self._leftover = np.zeros(0, dtype=np.float32)
+        self.noise_floor_db = None
+
+        self.frames = 0
+        self.voiced_frames = 0
+        self.voiced_rms_sum = 0.0
+        self.silence_frames = 0
+        self.syllables = 0
+        self.filler_candidates = 0
+
+        # 청크 경계에서 이어지는 구간 상태
+        self._run_voiced = None
+        self._run_length = 0
+        self._run_rms_sum = 0.0
+        self._run_rms_sq_sum = 0.0
+        self._prev_silence_length = 0
+        # 음절 피크 판정이 끝나지 않은 포락선 꼬리 (전역 프레임 번호 _env_base부터)
+        self._env_rms = np.zeros(0, dtype=np.float32)
+        self._env_voiced = np.zeros(0, dtype=bool)
+        self._env_base = 0
+        self._next_peak = 1
+
+    def update(self, samples):
+        audio = np.concatenate((self._leftover, samples.astype(np.float32) / 32768.0))
+        n_frames = len(audio) // FRAME_SIZE
+        self._leftover = audio[n_frames * FRAME_SIZE:]
+        if n_frames == 0:
+            return
+
+        frames = audio[:n_frames * FRAME_SIZE].reshape(n_frames, FRAME_SIZE)
+        rms = np.sqrt(np.mean(frames * frames, axis=1))
+        db = 20 * np.log10(np.maximum(rms, 1e-6))
+
+        # 노이즈 바닥: 청크 하위 10% 에너지의 지수 이동 평균
+        chunk_floor = float(np.percentile(db, 10))
+        if self.noise_floor_db is None:
+            self.noise_floor_db = chunk_floor
+        else:
+            self.noise_floor_db += NOISE_FLOOR_SMOOTHING * (chunk_floor - self.noise_floor_db)
+        threshold = max(VAD_MIN_DB, self.noise_floor_db + VAD_MARGIN_DB)
+        voiced = db > threshold
+
+        self.frames += n_frames
+        self.voiced_frames += int(voiced.sum())
+        self.voiced_rms_sum += float(rms[voiced].sum())
+
+        self._count_syllables(rms, voiced)
+        self._update_runs(voiced, rms)
+
+    def _count_syllables(self, rms, voiced, final=False):
+        """
+        발화 구간 에너지 포락선의 지역 최대값 수 = 음절 수 추정
+        이동 평균과 피크 판정에 필요한 뒤쪽 프레임이 모두 도착한 위치까지만 판정하고 나머지는 다음 청크로 넘김
+        → 청크로 나눠 처리해도 전체를 한 번에 처리한 것(신호 앞뒤는 0으로 패딩)과 같은 피크를 센다
+        """
+        half = ENVELOPE_SMOOTHING // 2
+        envelope = np.concatenate((self._env_rms, rms))
+        envelope_voiced = np.concatenate((self._env_voiced, voiced))
+        base = self._env_base
+        total = base + len(envelope)
+
+        # 피크 i는 smooth[i-1..i+1], 즉 원본 i-1-half .. i+1+half 프레임이 필요 (마지막 프레임은 피크가 아님)
+        first = self._next_peak
+        last = total - 2 if final else total - 2 - half
+        if last >= first:
+            lo = first - 1 - half
+            hi = last + 2 + half
+            padded = np.zeros(hi - lo, dtype=np.float32)
+            src_lo, src_hi = max(lo, 0), min(hi, total)
+            padded[src_lo - lo:src_hi - lo] = envelope[src_lo - base:src_hi - base]
+            kernel = np.ones(ENVELOPE_SMOOTHING, dtype=np.float32) / ENVELOPE_SMOOTHING
+            smooth = np.convolve(padded, kernel, mode='valid')  # smooth[first-1 .. last+1]
+
+            peaks = (smooth[1:-1] > smooth[:-2]) & (smooth[1:-1] >= smooth[2:])
+            self.syllables += int((peaks & envelope_voiced[first - base:last + 1 - base]).sum())
+            self._next_peak = last + 1
+
+        keep_from = max(self._next_peak - 1 - half, base)
+        self._env_rms = envelope[keep_from - base:]
+        self._env_voiced = envelope_voiced[keep_from - base:]
+        self._env_base = keep_from
+
+    def _update_runs(self, voiced, rms):
+        """무음/발화 연속 구간을 이어 붙이며 긴 침묵과 채움말 후보를 집계"""
+        values, starts, lengths = _runs(voiced)
+        rms_sums = np.add.reduceat(rms, starts)
+        rms_sq_sums = np.add.reduceat(rms * rms, starts)
+
+        for value, length, rms_sum, rms_sq_sum in zip(values, lengths, rms_sums, rms_sq_sums):
+            if value == self._run_voiced:
+                self._run_length += int(length)
+                self._run_rms_sum += float(rms_sum)
+                self._run_rms_sq_sum += float(rms_sq_sum)
+                continue
+            self._close_run()
+            self._run_voiced = bool(value)
+            self._run_length = int(length)
+            self._run_rms_sum = float(rms_sum)
+            self._run_rms_sq_sum = float(rms_sq_sum)
+
+    def _close_run(self):
+        if self._run_voiced is None:
+            return
+        duration = self._run_length * FRAME_SEC
+        if not self._run_voiced:
+            if duration >= SILENCE_MIN_SEC:
+                self.silence_frames += self._run_length
+            self._prev_silence_length = self._run_length
+            return
+
+        # 평탄한 에너지로 길게 끄는 짧은 발화 → '음/어' 후보
+        preceded_by_pause = self._prev_silence_length * FRAME_SEC >= FILLER_PRECEDING_SILENCE_SEC
+        if preceded_by_pause and FILLER_MIN_SEC <= duration <= FILLER_MAX_SEC:
+            mean = self._run_rms_sum / self._run_length
+            variance = max(0.0, self._run_rms_sq_sum / self._run_length - mean * mean)
+            if mean > 0 and np.sqrt(variance) / mean < FILLER_MAX_ENERGY_CV:
+                self.filler_candidates += 1
+        self._prev_silence_length = 0
+
+    def finish(self):
+        # 신호 끝(뒤쪽 0 패딩)을 알았으니 남은 포락선의 피크를 마저 판정
+        self._count_syllables(np.zeros(0, dtype=np.float32), np.zeros(0, dtype=bool), final=True)
+        self._close_run()
+        self._run_voiced = None
+
+
+def _volume_score(mean_rms):
+    """발화 구간 평균 음량(dBFS)을 0~100 점수로 변환 (-50dB → 0, -10dB → 100)"""
+    db = 20 * np.log10(max(mean_rms, 1e-6))
+    return int(round(np.clip((db + 50) / 40 * 100, 0, 100)))
+
+
+def analyze_audio(video_path):
+    """
+    영상의 오디오 트랙에서 wpm/volume/filler/silence 지표를 스트리밍 계산합니다.
+    오디오가 없거나 ffmpeg가 없으면 None을 반환합니다.
+    """
+    accumulator = AudioAccumulator()
+    recognizer = OfflineRecognizer.create()
+
+    try:
+        for samples in iter_audio_chunks(video_path):
+            accumulator.update(samples)
+            if recognizer:
+                recognizer.feed(samples)
+    except RuntimeError as e:
+        logger.warning("오디오 분석 실패: %s", e)
+        return None
+
+    accumulator.finish()
+    if recognizer:
+        recognizer.finish()
+
+    if accumulator.frames == 0 or accumulator.voiced_frames == 0:
+        return None
+
+    total_minutes = accumulator.frames * FRAME_SEC / 60
+    if recognizer and recognizer.words:
+        words = recognizer.words
+        fillers = recognizer.fillers
+        method = 'vosk'
+    else:
+        words = accumulator.syllables / SYLLABLES_PER_WORD
+        fillers = accumulator.filler_candidates
+        method = 'energy'
+
+    return {
+        'wpm': int(round(words / total_minutes)) if total_minutes else None,
+        'volume': _volume_score(accumulator.voiced_rms_sum / accumulator.voiced_frames),
+        'filler': int(round(fillers / words * 100)) if words else 0,
+        'silence': int(round(accumulator.silence_frames / accumulator.frames * 100)),
+        'speech_ratio': round(accumulator.voiced_frames / accumulator.frames, 3),
+        'recognizer': method
+    }
@@ -0,0 +1,105 @@
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+
+_MISSING = object()
+
+
+def content_hash(data):
+    """바이트 내용의 SHA-256 해시 (캐시 키용)"""
+    return hashlib.sha256(data).hexdigest()
+
+
+class TTLCache:
+    """
+    스레드 안전한 LRU + TTL 메모리 캐시
+    - max_entries를 넘으면 가장 오래 사용하지 않은 항목부터 제거
+    - ttl(초)이 지난 항목은 조회 시 만료 처리 (ttl=None이면 만료 없음)
+    """
+
+    def __init__(self, max_entries=128, ttl=None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _expired(self, stored_at, now):
+        return self.ttl is not None and now - stored_at > self.ttl
+
+    def get(self, key, default=None):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._items.get(key, _MISSING)
+            if entry is _MISSING or self._expired(entry[0], now):
+                if entry is not _MISSING:
+                    del self._items[key]
+                self.misses += 1
+                return default
+            self._items.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key, value):
+        with self._lock:
+            self._items[key] = (time.monotonic(), value)
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_entries:
+                self._items.popitem(last=False)
+
+    def pop(self, key, default=None):
+        with self._lock:
+            entry = self._items.pop(key, _MISSING)
+        return default if entry is _MISSING else entry[1]
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+
+    def __len__(self):
+        return len(self._items)
+
+    def stats(self):
+        return {'entries': len(self._items), 'hits': self.hits, 'misses': self.misses}
+
+
+def hamming_distance(a, b):
+    return bin(a ^ b).count('1')
+
+
+class PerceptualHashCache(TTLCache):
+    """
+    지각 해시(정수) 키 캐시 - 정확히 같은 해시가 없으면 해밍 거리 max_distance 이내의 가장 가까운 항목 반환
+    (재압축/상태바 시간 변경 정도만 다른 스크린샷을 같은 이미지로 취급)
+    """
+
+    def __init__(self, max_entries=128, ttl=None, max_distance=0):
+        super().__init__(max_entries, ttl)
+        self.max_distance = max_distance
+
+    def lookup(self, image_hash, default=None):
+        value = self.get(image_hash, _MISSING)
+        if value is not _MISSING:
+            return value
+        if self.max_distance <= 0:
+            return default
+
+        now = time.monotonic()
+        with self._lock:
+            best_key, best_distance = None, self.max_distance + 1
+            for key, (stored_at, _) in list(self._items.items()):
+                if self._expired(stored_at, now):
+                    del self._items[key]
+                    continue
+                distance = hamming_distance(key, image_hash)
+                if distance < best_distance:
+                    best_key, best_distance = key, distance
+            if best_key is None:
+                return default
+            # get()에서 miss로 집계된 것을 근사 일치 hit로 정정
+            self.misses -= 1
+            self.hits += 1
+            self._items.move_to_end(best_key)
+            return self._items[best_key][1]
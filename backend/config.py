@@ -13,10 +13,57 @@ class Config:
     # 업로드 설정
     UPLOAD_FOLDER = os.environ.get('UPLOAD_FOLDER') or 'uploads'
     MAX_CONTENT_LENGTH = int(os.environ.get('MAX_CONTENT_LENGTH', '104857600'))  # 100MB
+    MAX_UPLOAD_SIZE = int(os.environ.get('MAX_UPLOAD_SIZE', '2147483648'))  # 분할 업로드 전체 크기 제한 (2GB)
     
     # 허용된 파일 확장자
     ALLOWED_EXTENSIONS = {'mp4', 'avi', 'mov', 'webm', 'mkv'}
     
+    # 비디오 분석 설정
+    VIDEO_SAMPLE_FPS = float(os.environ.get('VIDEO_SAMPLE_FPS', '2'))  # 초당 자세 분석 프레임 수
+    VIDEO_FACE_SAMPLE_FPS = float(os.environ.get('VIDEO_FACE_SAMPLE_FPS', '10'))  # 초당 얼굴 분석 프레임 수 (깜빡임 검출)
+    VOSK_MODEL_PATH = os.environ.get('VOSK_MODEL_PATH')  # 오프라인 음성 인식 모델 경로 (선택)
+    VIDEO_ANALYSIS_WORKERS = int(os.environ.get('VIDEO_ANALYSIS_WORKERS', str(max(1, (os.cpu_count() or 2) - 1))))
+    VIDEO_ANALYSIS_MAX_JOBS = int(os.environ.get('VIDEO_ANALYSIS_MAX_JOBS', '1'))  # 동시에 실행할 분석 작업 수
+    VIDEO_ANALYSIS_JOB_TTL = int(os.environ.get('VIDEO_ANALYSIS_JOB_TTL', '86400'))  # 끝난 분석 작업 결과 보관 시간 (초)
+    
+    # 문서(PDF) 텍스트 추출 설정
+    PDF_BACKEND = os.environ.get('PDF_BACKEND', 'auto')  # auto | pdfium | pdfminer | pdfplumber
+    PDF_EXTRACT_WORKERS = int(os.environ.get('PDF_EXTRACT_WORKERS', str(max(1, min(4, (os.cpu_count() or 2) - 1)))))
+    PDF_PARALLEL_MIN_PAGES = int(os.environ.get('PDF_PARALLEL_MIN_PAGES', '8'))  # 이 페이지 수 이상이면 병렬 추출
+    PDF_TEXT_CACHE_SIZE = int(os.environ.get('PDF_TEXT_CACHE_SIZE', '64'))  # 추출 텍스트 캐시 항목 수
+    PDF_TEXT_CACHE_TTL = int(os.environ.get('PDF_TEXT_CACHE_TTL', '3600'))  # 캐시 유지 시간 (초)
+    
+    # 질문 이미지 OCR 설정
+    OCR_WORKERS = int(os.environ.get('OCR_WORKERS', '6'))  # Vision/tesseract 전략 동시 실행 스레드 수
+    OCR_TIMEOUT = int(os.environ.get('OCR_TIMEOUT', '20'))  # tesseract 1회 실행 제한 시간 (초)
+    OCR_REGION_MIN_PIXELS = int(os.environ.get('OCR_REGION_MIN_PIXELS', '1500000'))  # 이 픽셀 수 이상이면 텍스트 영역만 OCR
+    QUESTION_IMAGE_CACHE_SIZE = int(os.environ.get('QUESTION_IMAGE_CACHE_SIZE', '256'))  # 질문 이미지 추출 결과 캐시 항목 수
+    QUESTION_IMAGE_CACHE_TTL = int(os.environ.get('QUESTION_IMAGE_CACHE_TTL', '3600'))  # 캐시 유지 시간 (초)
+    QUESTION_IMAGE_HASH_DISTANCE = int(os.environ.get('QUESTION_IMAGE_HASH_DISTANCE', '1'))  # 같은 이미지로 볼 해밍 거리 (256비트 중)
+    
+    # 자기소개서 질문 프롬프트 설정
+    QUESTION_CONTEXT_MAX_CHARS = int(os.environ.get('QUESTION_CONTEXT_MAX_CHARS', '4000'))  # 프롬프트에 넣는 질문/채용 정보 최대 글자 수
+    QUESTION_CONTEXT_WINDOW_LINES = int(os.environ.get('QUESTION_CONTEXT_WINDOW_LINES', '8'))  # 인재상/우대사항 제목 뒤 포함할 줄 수
+    RESUME_CONTEXT_MAX_CHARS = int(os.environ.get('RESUME_CONTEXT_MAX_CHARS', '3000'))  # 질문별 프롬프트에 넣는 자기소개서 최대 글자 수
+    RESUME_CHUNK_CHARS = int(os.environ.get('RESUME_CHUNK_CHARS', '400'))  # 자기소개서 검색 청크 크기 (글자 수)
+    RESUME_TOP_K = int(os.environ.get('RESUME_TOP_K', '6'))  # 질문별로 고르는 최대 청크 수
+    
+    # 면접 세션 저장 설정
+    INTERVIEW_SESSION_TTL = int(os.environ.get('INTERVIEW_SESSION_TTL', '7200'))  # 마지막 답변 후 세션 유지 시간 (초)
+    INTERVIEW_SESSION_MAX = int(os.environ.get('INTERVIEW_SESSION_MAX', '1000'))  # 메모리에 유지할 최대 세션 수 (넘으면 LRU 제거)
+    INTERVIEW_SESSION_DIR = os.environ.get('INTERVIEW_SESSION_DIR')  # 지정한 경우 세션을 이 폴더에 JSON으로 저장
+    INTERVIEW_ANSWER_MAX_CHARS = int(os.environ.get('INTERVIEW_ANSWER_MAX_CHARS', '5000'))  # 세션에 저장하는 답변 최대 글자 수
+    INTERVIEW_EVAL_CONCURRENCY = int(os.environ.get('INTERVIEW_EVAL_CONCURRENCY', '4'))  # 일괄 평가 시 동시 Claude 호출 수
+    INTERVIEW_EVAL_MODE = os.environ.get('INTERVIEW_EVAL_MODE', 'sync')  # sync (Claude 평가 대기) | speculative (규칙 기반 점수 즉시 반환 후 Claude로 갱신)
+    INTERVIEW_EVAL_RESULT_MAX = int(os.environ.get('INTERVIEW_EVAL_RESULT_MAX', '5000'))  # 보관할 백그라운드 평가 결과 수
+    INTERVIEW_EVAL_MAX_PENDING = int(os.environ.get('INTERVIEW_EVAL_MAX_PENDING', '64'))  # 대기/실행 중인 백그라운드 평가 최대 수 (넘으면 규칙 기반 결과로 확정)
+    
+    # 워커 프로세스 간 상태 공유 설정
+    STATE_BACKEND = os.environ.get('STATE_BACKEND', 'memory')  # memory (프로세스 내) | sqlite (여러 워커 프로세스가 공유)
+    STATE_DB_PATH = os.environ.get('STATE_DB_PATH') or os.path.join(UPLOAD_FOLDER, 'state.sqlite3')  # sqlite 저장소 파일
+    POSTURE_BASE_CACHE_SIZE = int(os.environ.get('POSTURE_BASE_CACHE_SIZE', '256'))  # 기준 자세 랜드마크 캐시 항목 수
+    POSTURE_BASE_CACHE_TTL = int(os.environ.get('POSTURE_BASE_CACHE_TTL', '3600'))  # 기준 자세 캐시 유지 시간 (초)
+    
     # 서버 설정
     HOST = os.environ.get('HOST') or '0.0.0.0'
     PORT = int(os.environ.get('PORT', '5000'))
@@ -30,7 +77,8 @@ class Config:
     
     # 로깅 설정
     LOG_LEVEL = os.environ.get('LOG_LEVEL') or 'INFO'
-    LOG_FILE = os.environ.get('LOG_FILE') or 'app.log'
+    LOG_FILE = os.environ.get('LOG_FILE')  # 지정한 경우에만 파일에도 기록
+    LOG_SAMPLE_EVERY = int(os.environ.get('LOG_SAMPLE_EVERY', '10'))  # 줄 단위 반복 DEBUG 로그는 N개 중 1개만 기록
     
     # API 키들
     OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
@@ -98,6 +146,41 @@ FLASK_PORT = Config.PORT
 OPENAI_API_KEY = Config.OPENAI_API_KEY
 OPENAI_API_KEY_SELF = Config.OPENAI_API_KEY_SELF
 ANTHROPIC_API_KEY = Config.ANTHROPIC_API_KEY
+VIDEO_SAMPLE_FPS = Config.VIDEO_SAMPLE_FPS
+VIDEO_FACE_SAMPLE_FPS = Config.VIDEO_FACE_SAMPLE_FPS
+VIDEO_ANALYSIS_WORKERS = Config.VIDEO_ANALYSIS_WORKERS
+VOSK_MODEL_PATH = Config.VOSK_MODEL_PATH
+PDF_BACKEND = Config.PDF_BACKEND
+PDF_EXTRACT_WORKERS = Config.PDF_EXTRACT_WORKERS
+PDF_PARALLEL_MIN_PAGES = Config.PDF_PARALLEL_MIN_PAGES
+PDF_TEXT_CACHE_SIZE = Config.PDF_TEXT_CACHE_SIZE
+PDF_TEXT_CACHE_TTL = Config.PDF_TEXT_CACHE_TTL
+OCR_WORKERS = Config.OCR_WORKERS
+OCR_TIMEOUT = Config.OCR_TIMEOUT
+OCR_REGION_MIN_PIXELS = Config.OCR_REGION_MIN_PIXELS
+QUESTION_IMAGE_CACHE_SIZE = Config.QUESTION_IMAGE_CACHE_SIZE
+QUESTION_IMAGE_CACHE_TTL = Config.QUESTION_IMAGE_CACHE_TTL
+QUESTION_IMAGE_HASH_DISTANCE = Config.QUESTION_IMAGE_HASH_DISTANCE
+LOG_LEVEL = Config.LOG_LEVEL
+LOG_FILE = Config.LOG_FILE
+LOG_SAMPLE_EVERY = Config.LOG_SAMPLE_EVERY
+QUESTION_CONTEXT_MAX_CHARS = Config.QUESTION_CONTEXT_MAX_CHARS
+QUESTION_CONTEXT_WINDOW_LINES = Config.QUESTION_CONTEXT_WINDOW_LINES
+RESUME_CONTEXT_MAX_CHARS = Config.RESUME_CONTEXT_MAX_CHARS
+RESUME_CHUNK_CHARS = Config.RESUME_CHUNK_CHARS
+RESUME_TOP_K = Config.RESUME_TOP_K
+INTERVIEW_SESSION_TTL = Config.INTERVIEW_SESSION_TTL
+INTERVIEW_SESSION_MAX = Config.INTERVIEW_SESSION_MAX
+INTERVIEW_SESSION_DIR = Config.INTERVIEW_SESSION_DIR
+INTERVIEW_ANSWER_MAX_CHARS = Config.INTERVIEW_ANSWER_MAX_CHARS
+INTERVIEW_EVAL_CONCURRENCY = Config.INTERVIEW_EVAL_CONCURRENCY
+INTERVIEW_EVAL_MODE = Config.INTERVIEW_EVAL_MODE
+INTERVIEW_EVAL_RESULT_MAX = Config.INTERVIEW_EVAL_RESULT_MAX
+INTERVIEW_EVAL_MAX_PENDING = Config.INTERVIEW_EVAL_MAX_PENDING
+STATE_BACKEND = Config.STATE_BACKEND
+STATE_DB_PATH = Config.STATE_DB_PATH
+POSTURE_BASE_CACHE_SIZE = Config.POSTURE_BASE_CACHE_SIZE
+POSTURE_BASE_CACHE_TTL = Config.POSTURE_BASE_CACHE_TTL
 
 # # Tesseract-OCR 경로 설정 (필요시 주석 해제)
 # TESSERACT_PATH = r'C:\Program Files\Tesseract-OCR\tesseract.exe'
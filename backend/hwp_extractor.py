@@ -0,0 +1,174 @@
+import re
+import zlib
+import struct
+import zipfile
+import xml.etree.ElementTree as ET
+
+# HWP 5.0 레코드 태그 (HWPTAG_BEGIN = 0x10)
+HWPTAG_PARA_TEXT = 0x10 + 51
+
+# FileHeader 속성 비트
+HWP_FLAG_COMPRESSED = 0x01
+HWP_FLAG_ENCRYPTED = 0x02
+HWP_FLAG_DISTRIBUTION = 0x04
+
+# 문단 텍스트의 제어 문자 (UTF-16 코드 단위)
+# - 문자 제어: 1칸 차지 (줄바꿈/문단 끝/특수 공백 등)
+# - 인라인/확장 제어: 제어 코드 포함 8칸 차지 (표, 그림, 각주, 탭 등)
+_CHAR_CONTROLS = {0, 10, 13, 24, 25, 26, 27, 28, 29, 30, 31}
+_CHAR_CONTROL_TEXT = {10: '\n', 24: '-', 30: ' ', 31: ' '}
+_TAB = 9
+_CONTROL_WIDTH = 8
+
+# 섹션 스트림을 한 번에 읽는 크기 (전체 문서를 메모리에 풀지 않음)
+READ_CHUNK_SIZE = 64 * 1024
+
+_SECTION_PATTERN = re.compile(r'^Contents/section(\d+)\.xml$')
+
+# HWPX <hp:t> 안의 인라인 요소
+_INLINE_TEXT = {'tab': '\t', 'lineBreak': '\n'}
+
+
+class HwpError(Exception):
+    """HWP 문서를 읽을 수 없는 경우 (암호화/배포용 문서, 손상된 파일 등)"""
+    pass
+
+
+def _decode_para_text(payload):
+    """PARA_TEXT 레코드 → 문자열 (제어 문자는 건너뛰거나 공백/줄바꿈으로 치환)"""
+    codes = struct.unpack(f'<{len(payload) // 2}H', payload[:len(payload) // 2 * 2])
+    chars = []
+    i = 0
+    while i < len(codes):
+        code = codes[i]
+        if code >= 32:
+            chars.append(chr(code))
+            i += 1
+        elif code in _CHAR_CONTROLS:
+            chars.append(_CHAR_CONTROL_TEXT.get(code, ''))
+            i += 1
+        else:
+            if code == _TAB:
+                chars.append('\t')
+            i += _CONTROL_WIDTH
+    # 서로게이트 쌍(확장 한자 등) 복원
+    return ''.join(chars).encode('utf-16', 'surrogatepass').decode('utf-16', 'replace')
+
+
+def iter_hwp_records(chunks):
+    """바이트 청크 이터레이터에서 (tag, payload) 레코드를 순서대로 반환"""
+    buffer = bytearray()
+    for chunk in chunks:
+        buffer += chunk
+        offset = 0
+        while len(buffer) - offset >= 4:
+            header, = struct.unpack_from('<I', buffer, offset)
+            tag = header & 0x3FF
+            size = (header >> 20) & 0xFFF
+            header_size = 4
+            if size == 0xFFF:
+                if len(buffer) - offset < 8:
+                    break
+                size, = struct.unpack_from('<I', buffer, offset + 4)
+                header_size = 8
+            if len(buffer) - offset < header_size + size:
+                break
+            start = offset + header_size
+            yield tag, bytes(buffer[start:start + size])
+            offset = start + size
+        del buffer[:offset]
+
+
+def _iter_section_chunks(stream, compressed):
+    """BodyText 섹션 스트림을 청크 단위로 읽으며 압축 해제 (raw deflate)"""
+    decompressor = zlib.decompressobj(-15) if compressed else None
+    while True:
+        data = stream.read(READ_CHUNK_SIZE)
+        if not data:
+            break
+        yield decompressor.decompress(data) if decompressor else data
+    if decompressor:
+        yield decompressor.flush()
+
+
+def iter_hwp_paragraphs(file):
+    """HWP 5.0 (OLE) 문서의 BodyText 섹션을 순서대로 읽으며 문단 텍스트를 반환"""
+    import olefile
+
+    if not olefile.isOleFile(file):
+        raise HwpError('HWP 5.0 형식의 파일이 아닙니다.')
+    ole = olefile.OleFileIO(file)
+    try:
+        header = ole.openstream('FileHeader').read(256)
+        if not header.startswith(b'HWP Document File'):
+            raise HwpError('HWP 파일 헤더가 올바르지 않습니다.')
+        flags, = struct.unpack_from('<I', header, 36)
+        if flags & HWP_FLAG_ENCRYPTED:
+            raise HwpError('암호가 설정된 HWP 파일은 읽을 수 없습니다.')
+        if flags & HWP_FLAG_DISTRIBUTION:
+            raise HwpError('배포용 HWP 문서는 읽을 수 없습니다.')
+
+        sections = sorted(
+            (entry for entry in ole.listdir() if len(entry) == 2 and entry[0] == 'BodyText'
+             and entry[1].startswith('Section') and entry[1][7:].isdigit()),
+            key=lambda entry: int(entry[1][7:])
+        )
+        for entry in sections:
+            stream = ole.openstream(entry)
+            for tag, payload in iter_hwp_records(_iter_section_chunks(stream, flags & HWP_FLAG_COMPRESSED)):
+                if tag == HWPTAG_PARA_TEXT:
+                    text = _decode_para_text(payload)
+                    if text.strip():
+                        yield text
+    finally:
+        ole.close()
+
+
+def _local_name(tag):
+    return tag.rsplit('}', 1)[-1]
+
+
+def iter_hwpx_paragraphs(file):
+    """HWPX (OWPML zip) 문서의 section XML을 iterparse로 읽으며 문단 텍스트를 반환"""
+    try:
+        archive = zipfile.ZipFile(file)
+    except zipfile.BadZipFile:
+        raise HwpError('HWPX 형식의 파일이 아닙니다.')
+
+    with archive:
+        sections = sorted(
+            (name for name in archive.namelist() if _SECTION_PATTERN.match(name)),
+            key=lambda name: int(_SECTION_PATTERN.match(name).group(1))
+        )
+        for name in sections:
+            with archive.open(name) as stream:
+                # 표 안의 문단은 바깥 문단보다 먼저 끝나므로 문단별 버퍼를 스택으로 관리
+                stack = []
+                for event, element in ET.iterparse(stream, events=('start', 'end')):
+                    tag = _local_name(element.tag)
+                    if event == 'start':
+                        if tag == 'p':
+                            stack.append([])
+                        continue
+
+                    if tag == 't' and stack:
+                        stack[-1].append(element.text or '')
+                        for child in element:
+                            stack[-1].append(_INLINE_TEXT.get(_local_name(child.tag), ''))
+                            stack[-1].append(child.tail or '')
+                    elif tag == 'p' and stack:
+                        text = ''.join(stack.pop())
+                        if text.strip():
+                            yield text
+                        element.clear()
+
+
+def extract_hwp_text(file, filename=''):
+    """HWP/HWPX 파일 객체 → 문단을 줄바꿈으로 연결한 텍스트"""
+    head = file.read(4)
+    file.seek(0)
+    if head.startswith(b'PK') or filename.lower().endswith('.hwpx'):
+        paragraphs = iter_hwpx_paragraphs(file)
+    else:
+        paragraphs = iter_hwp_paragraphs(file)
+    return '\n'.join(paragraphs)
@@ -0,0 +1,141 @@
+import io
+import base64
+import binascii
+
+import cv2
+import numpy as np
+from PIL import Image, ImageOps
+
+from log_util import get_logger
+
+logger = get_logger(__name__)
+
+# Vision API는 긴 변 2048 / 짧은 변 768 안으로 줄여서 처리하므로 그보다 큰 이미지는 전송량만 늘림
+VISION_MAX_LONG_SIDE = 2048
+VISION_MAX_SHORT_SIDE = 768
+
+# 축소 후에도 글자 높이가 이 값(px) 이상 남도록 제한 (그 이상 큰 글자는 줄여도 읽힘)
+TARGET_TEXT_HEIGHT = 16
+
+# 글자 높이 추정은 긴 변 1024px 이하로 줄인 사본에서 수행
+ESTIMATE_MAX_SIDE = 1024
+
+# 축소 후 글자가 작을수록 JPEG 품질을 높게 (글자 높이 기준 오름차순)
+JPEG_QUALITY_STEPS = ((12, 90), (20, 80))
+JPEG_DEFAULT_QUALITY = 70
+
+
+def decode_image(image_data):
+    """data URL / base64 문자열 / 바이트 / PIL Image → (PIL Image, 원본 바이트 수)"""
+    if isinstance(image_data, Image.Image):
+        return image_data, None
+    if isinstance(image_data, str):
+        if ',' in image_data:
+            image_data = image_data.split(',', 1)[1]
+        try:
+            image_data = base64.b64decode(image_data)
+        except (binascii.Error, ValueError):
+            raise ValueError('이미지 데이터(base64)를 해석할 수 없습니다.')
+    image = Image.open(io.BytesIO(image_data))
+    image.load()
+    return image, len(image_data)
+
+
+def estimate_text_height(image):
+    """
+    이미지의 대표 글자 높이(px, 원본 기준) 추정 - 이진화 후 글자 크기 연결 요소 높이의 중앙값
+    어두운 배경(다크 모드)은 반전해서 글자를 전경으로 만듦. 글자가 없으면 None
+    """
+    scale = min(1.0, ESTIMATE_MAX_SIDE / max(image.size))
+    gray = image.convert('L')
+    if scale < 1.0:
+        gray = gray.resize((max(1, int(image.width * scale)), max(1, int(image.height * scale))), Image.Resampling.BOX)
+    gray = np.asarray(gray)
+
+    _, binary = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY_INV + cv2.THRESH_OTSU)
+    if cv2.countNonZero(binary) > binary.size / 2:
+        binary = cv2.bitwise_not(binary)
+
+    _, _, stats, _ = cv2.connectedComponentsWithStats(binary, connectivity=8)
+    heights = stats[1:, cv2.CC_STAT_HEIGHT]
+    widths = stats[1:, cv2.CC_STAT_WIDTH]
+    # 점/선/큰 도형은 제외하고 글자 크기 요소만 사용
+    glyphs = (heights >= 3) & (heights <= gray.shape[0] // 8) & (widths <= heights * 4)
+    if not glyphs.any():
+        return None
+    return float(np.median(heights[glyphs])) / scale
+
+
+def _jpeg_quality(text_height):
+    if text_height is None:
+        return JPEG_DEFAULT_QUALITY
+    for max_height, quality in JPEG_QUALITY_STEPS:
+        if text_height < max_height:
+            return quality
+    return JPEG_DEFAULT_QUALITY
+
+
+def _encode(image, image_format, **options):
+    """메타데이터(EXIF/ICC/텍스트 청크)를 넘기지 않고 인코딩"""
+    buffer = io.BytesIO()
+    image.save(buffer, format=image_format, **options)
+    return buffer.getvalue()
+
+
+def prepare_vision_image(image_data, log_prefix='[이미지 준비]'):
+    """
+    Vision API 전송용 이미지 준비
+    - EXIF 방향 적용 후 메타데이터 없이 재인코딩 (PNG 원본은 PNG/JPEG 중 작은 쪽)
+    - Vision API 처리 해상도 제한과 글자 높이(TARGET_TEXT_HEIGHT 유지) 중 더 작은 크기로 축소
+    - 축소 후 글자 크기에 따라 JPEG 품질 선택
+    반환: data_url, base64, 크기, 원본/전송 바이트 수, 절감 바이트 수
+    """
+    image, original_bytes = decode_image(image_data)
+    source_format = image.format
+    image = ImageOps.exif_transpose(image)
+    if image.mode != 'RGB':
+        if image.mode in ('RGBA', 'LA') or (image.mode == 'P' and 'transparency' in image.info):
+            background = Image.new('RGB', image.size, (255, 255, 255))
+            background.paste(image, mask=image.convert('RGBA').getchannel('A'))
+            image = background
+        else:
+            image = image.convert('RGB')
+
+    width, height = image.size
+    scale = min(1.0, VISION_MAX_LONG_SIDE / max(width, height), VISION_MAX_SHORT_SIDE / min(width, height))
+    text_height = estimate_text_height(image)
+    if text_height:
+        # 글자가 TARGET_TEXT_HEIGHT보다 작아지지 않는 범위에서 추가 축소
+        scale = min(scale, TARGET_TEXT_HEIGHT / text_height)
+
+    if scale < 1.0:
+        image = image.resize((max(1, round(width * scale)), max(1, round(height * scale))), Image.Resampling.LANCZOS)
+
+    scaled_text_height = text_height * scale if text_height else None
+    quality = _jpeg_quality(scaled_text_height)
+    mime, payload = 'image/jpeg', _encode(image, 'JPEG', quality=quality, optimize=True)
+    if source_format == 'PNG':
+        # 단색 배경 스크린샷은 PNG가 더 작은 경우가 많으므로 둘 중 작은 쪽 사용
+        png = _encode(image, 'PNG')
+        if len(png) < len(payload):
+            mime, payload = 'image/png', png
+    encoded = base64.b64encode(payload).decode()
+
+    saved = (original_bytes - len(payload)) if original_bytes is not None else None
+    text_info = f"{text_height:.1f}px → {scaled_text_height:.1f}px" if text_height else '검출 안 됨'
+    size_info = f"{original_bytes}B → {len(payload)}B (절감 {saved}B)" if saved is not None else f"{len(payload)}B"
+    logger.debug("%s %dx%d → %dx%d, 글자 높이 %s, %s (JPEG 품질 %s), %s", log_prefix, width, height,
+                 image.width, image.height, text_info, mime, quality, size_info)
+
+    return {
+        'data_url': f'data:{mime};base64,{encoded}',
+        'base64': encoded,
+        'mime': mime,
+        'width': image.width,
+        'height': image.height,
+        'quality': quality,
+        'text_height': scaled_text_height,
+        'original_bytes': original_bytes,
+        'payload_bytes': len(payload),
+        'saved_bytes': saved
+    }
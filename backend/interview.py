@@ -1,11 +1,102 @@
+import os
 import random
-from flask import jsonify
+from flask import jsonify, request, current_app
 
-def analyze_video():
-    """비디오 분석 API"""
-    # 실제 AI 분석 로직은 여기에 구현
-    # 현재는 시뮬레이션 결과를 반환
+from concurrent.futures import ThreadPoolExecutor
+
+from video_analyzer import analyze_video_frames
+from audio_analyzer import analyze_audio
+from upload_store import ContentStore
+
+# 영상 프레임에서 직접 측정하는 결과 항목
+VIDEO_METRIC_KEYS = ('posture', 'headMove', 'gaze', 'smile', 'blinkPerMin', 'environment')
+
+# 오디오 트랙에서 직접 측정하는 결과 항목
+AUDIO_METRIC_KEYS = ('wpm', 'volume', 'filler', 'silence')
+
+# 영상에서 측정하지 못한 항목(얼굴/오디오 트랙 없음, expression/ending은 측정 방법 없음)에 쓰는 대체값
+# 모든 항목을 숫자로 유지하기 위한 값으로, 권장 범위 안의 중간값이라 코칭 팁을 만들지 않음
+# (말속도 140-180 WPM, 시선 70% 이상, 불필요어 8% 이하, 미소 60% 이상, 자세 75% 이상)
+FALLBACK_METRICS = {
+    'wpm': 150,
+    'volume': 75,
+    'gaze': 70,
+    'posture': 75,
+    'expression': 70,
+    'environment': 3.5,
+    'filler': 8,
+    'silence': 10,
+    'ending': 70,
+    'smile': 60,
+    'headMove': 75,
+    'blinkPerMin': 15
+}
+
+def analyze_video(video_path=None, progress_callback=None):
+    """
+    비디오 분석 API
+    - 영상이 있으면 측정한 항목은 측정값, 측정하지 못한 항목은 FALLBACK_METRICS (무작위 값 사용 안 함)
+    - 영상이 없으면 데모용 시뮬레이션 결과
+    """
+    measured = {}
+    if not video_path:
+        results = _simulate_results()
+    else:
+        # 오디오 분석(ffmpeg 디코딩 + NumPy)은 별도 스레드에서 프레임 분석과 동시에 진행
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            audio_future = executor.submit(analyze_audio, video_path)
+            # 시선/미소/깜빡임/머리 움직임/자세/환경은 실제 영상 프레임에서 스트리밍 측정
+            video_metrics = analyze_video_frames(video_path, progress_callback=progress_callback)
+            audio_metrics = audio_future.result() or {}
+        
+        for key in VIDEO_METRIC_KEYS:
+            if video_metrics[key] is not None:
+                measured[key] = video_metrics[key]
+        for key in AUDIO_METRIC_KEYS:
+            if audio_metrics.get(key) is not None:
+                measured[key] = audio_metrics[key]
+        
+        results = dict(FALLBACK_METRICS)
+        results.update(measured)
+        results['totalScore'] = _calculate_total_score(results)
+    
+    # 상관관계 적용 (측정한 값은 보정하지 않음)
+    if results['gaze'] < 60 and 'expression' not in measured:
+        results['expression'] = max(30, int(results['expression'] * 0.8))
+    
+    if results['filler'] > 12 and 'wpm' not in measured:
+        results['wpm'] = max(80, int(results['wpm'] * 0.9))
     
+    if results['environment'] < 3.0:
+        results['totalScore'] = max(1.5, round(results['totalScore'] * 0.9, 1))
+    
+    # 코칭 팁 생성
+    tips = generate_coaching_tips(results)
+    
+    return {
+        'results': results,
+        'tips': tips
+    }
+
+def _calculate_total_score(r):
+    """측정 지표를 0~100으로 정규화한 평균을 1.0~5.0 점수로 변환"""
+    components = [
+        max(0, 100 - abs(r['wpm'] - 160) * 1.5),  # 140-180 WPM 권장
+        r['volume'],
+        r['gaze'],
+        r['posture'],
+        r['expression'],
+        r['smile'],
+        r['headMove'],
+        max(0, 100 - r['filler'] * 4),
+        max(0, 100 - r['silence'] * 3),
+        (r['environment'] - 1.0) / 4.0 * 100
+    ]
+    average = sum(components) / len(components)
+    return round(min(5.0, max(1.0, 1.0 + average / 100 * 4.0)), 1)
+
+def _simulate_results():
+    """시뮬레이션 결과 생성"""
     # 성능 레벨 랜덤 설정
     performance_level = random.choice([1, 2, 3])
     
@@ -61,23 +152,7 @@ def analyze_video():
             'blinkPerMin': round(12 + random.random() * 8)
         }
     
-    # 상관관계 적용
-    if results['gaze'] < 60:
-        results['expression'] = max(30, int(results['expression'] * 0.8))
-    
-    if results['filler'] > 12:
-        results['wpm'] = max(80, int(results['wpm'] * 0.9))
-    
-    if results['environment'] < 3.0:
-        results['totalScore'] = max(1.5, round(results['totalScore'] * 0.9, 1))
-    
-    # 코칭 팁 생성
-    tips = generate_coaching_tips(results)
-    
-    return {
-        'results': results,
-        'tips': tips
-    }
+    return results
 
 def generate_coaching_tips(r):
     """코칭 팁 생성 함수"""
@@ -133,10 +208,30 @@ def generate_coaching_tips(r):
     
     return tips[:4] if tips else ['🎉 전반적으로 우수합니다! 동일 조건에서 3회 반복 촬영으로 안정성을 높여보세요.']
 
+def resolve_video_path(filename):
+    """업로드된 비디오 경로 반환 - 내용 주소 저장소 우선, 없으면 업로드 폴더 (경로 조작 방지)"""
+    if not filename:
+        return None
+    store_path = ContentStore.object_path(current_app.config['CONTENT_STORE_FOLDER'], filename) \
+        if current_app.config.get('CONTENT_STORE_FOLDER') else None
+    if store_path and os.path.isfile(store_path):
+        return store_path
+    video_path = os.path.join(current_app.config['UPLOAD_FOLDER'], os.path.basename(filename))
+    return video_path if os.path.isfile(video_path) else None
+
 def analyze_video_api():
     """비디오 분석 API"""
     try:
-        result = analyze_video()
+        data = request.get_json(silent=True) or {}
+        video_path = None
+        if data.get('filename'):
+            video_path = resolve_video_path(data['filename'])
+            if not video_path:
+                return jsonify({'error': '업로드된 비디오 파일을 찾을 수 없습니다.'}), 404
+        
+        result = analyze_video(video_path)
         return jsonify(result)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         return jsonify({'error': str(e)}), 500
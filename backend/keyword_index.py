@@ -0,0 +1,87 @@
+import re
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+
+class KeywordIndex:
+    """
+    자기소개서 키워드 다중 매처 - 키워드 목록을 한 번만 컴파일해 두고 모든 줄에 재사용
+    - pyahocorasick가 설치되어 있으면 Aho-Corasick 오토마톤으로 텍스트를 한 번만 훑어 모든 키워드를 매칭
+    - 없으면 키워드를 긴 것부터 이은 정규식 하나를 위치마다 전방 탐색으로 적용 (역시 텍스트를 한 번만 훑음)
+      한 위치에서는 가장 긴 키워드만 잡히므로 그 키워드의 접두사인 키워드도 함께 매칭으로 반환
+    - 키워드는 (등급, 목록 내 순서) 우선순위를 가짐 → classify()는 기존의 등급별/목록 순서 for 루프와 같은 키워드를 반환
+    tiers: {등급 이름: [키워드, ...]} (dict 순서가 등급 우선순위) 또는 키워드 목록 하나
+    """
+
+    def __init__(self, tiers):
+        if not isinstance(tiers, dict):
+            tiers = {None: list(tiers)}
+
+        # 키워드 id = 우선순위 (작을수록 먼저)
+        self.keywords = []
+        self.tiers = []
+        for tier, keywords in tiers.items():
+            for keyword in keywords:
+                self.keywords.append(keyword)
+                self.tiers.append(tier)
+
+        # 같은 키워드가 여러 등급에 있으면 먼저 나온 것(우선순위가 높은 것)만 사용
+        first_ids = {}
+        for keyword_id, keyword in enumerate(self.keywords):
+            if keyword:
+                first_ids.setdefault(keyword, keyword_id)
+
+        self._automaton = None
+        self._pattern = None
+        if ahocorasick is not None and first_ids:
+            self._automaton = ahocorasick.Automaton()
+            for keyword, keyword_id in first_ids.items():
+                self._automaton.add_word(keyword, keyword_id)
+            self._automaton.make_automaton()
+        elif first_ids:
+            by_length = sorted(first_ids, key=len, reverse=True)
+            self._pattern = re.compile('(?=(' + '|'.join(map(re.escape, by_length)) + '))')
+            # 매칭된 키워드 → 그 위치에서 함께 매칭되는 키워드 id (자기 자신 + 접두사 키워드)
+            self._ids_at = {
+                keyword: [keyword_id] + [first_ids[other] for other in by_length
+                                         if other != keyword and keyword.startswith(other)]
+                for keyword, keyword_id in first_ids.items()
+            }
+
+    @property
+    def backend(self):
+        return 'ahocorasick' if self._automaton is not None else 'regex'
+
+    def _matched_ids(self, text):
+        """텍스트에 나타난 키워드 id (텍스트 순서, 같은 키워드가 여러 번 나오면 여러 번)"""
+        if self._automaton is not None:
+            for _, keyword_id in self._automaton.iter(text):
+                yield keyword_id
+        elif self._pattern is not None:
+            for match in self._pattern.finditer(text):
+                yield from self._ids_at[match.group(1)]
+
+    def contains_any(self, text):
+        """키워드가 하나라도 있으면 True (첫 매칭에서 중단)"""
+        for _ in self._matched_ids(text):
+            return True
+        return False
+
+    def matched(self, text):
+        """텍스트에 나타난 키워드 목록 (우선순위 순)"""
+        return [self.keywords[keyword_id] for keyword_id in sorted(set(self._matched_ids(text)))]
+
+    def classify(self, text):
+        """우선순위가 가장 높은 매칭 키워드의 (키워드, 등급) - 없으면 None"""
+        best = None
+        for keyword_id in self._matched_ids(text):
+            if best is None or keyword_id < best:
+                best = keyword_id
+                if best == 0:
+                    break
+        if best is None:
+            return None
+        return self.keywords[best], self.tiers[best]
@@ -0,0 +1,90 @@
+import sys
+import queue
+import atexit
+import logging
+import threading
+import logging.handlers
+
+from config import LOG_LEVEL, LOG_FILE, LOG_SAMPLE_EVERY
+
+ROOT_LOGGER_NAME = 'backend'
+LOG_FORMAT = '%(asctime)s %(levelname)s [%(name)s] %(message)s'
+
+# 줄/항목마다 반복되는 로그에 extra=SAMPLED를 넘기면 호출 위치별로 LOG_SAMPLE_EVERY개 중 1개만 남김
+SAMPLED = {'sampled': True}
+
+_listener = None
+_configure_lock = threading.Lock()
+
+
+class SampleFilter(logging.Filter):
+    """extra=SAMPLED 레코드를 호출 위치(파일, 줄)별로 every개 중 1개만 통과 (첫 번째는 항상 통과)"""
+
+    def __init__(self, every):
+        super().__init__()
+        self.every = every
+        self._counts = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record):
+        if self.every <= 1 or not getattr(record, 'sampled', False):
+            return True
+        key = (record.pathname, record.lineno)
+        with self._lock:
+            count = self._counts.get(key, 0)
+            self._counts[key] = count + 1
+        return count % self.every == 0
+
+
+class Preview:
+    """긴 텍스트를 로그에 넣을 때 사용 - 실제로 출력될 때만 앞부분을 잘라 문자열로 만듦"""
+
+    __slots__ = ('text', 'limit')
+
+    def __init__(self, text, limit=100):
+        self.text = text
+        self.limit = limit
+
+    def __str__(self):
+        text = str(self.text)
+        if len(text) <= self.limit:
+            return text
+        return f'{text[:self.limit]}... ({len(text)}자)'
+
+
+def _configure():
+    """
+    'backend' 로거에 QueueHandler를 붙이고 실제 출력(stdout/파일)은 QueueListener 스레드가 담당
+    → 요청 스레드는 큐에 넣기만 하고 콘솔/파일 I/O를 기다리지 않음
+    """
+    global _listener
+    with _configure_lock:
+        if _listener is not None:
+            return
+
+        formatter = logging.Formatter(LOG_FORMAT)
+        handlers = [logging.StreamHandler(sys.stdout)]
+        if LOG_FILE:
+            handlers.append(logging.FileHandler(LOG_FILE, encoding='utf-8'))
+        for handler in handlers:
+            handler.setFormatter(formatter)
+
+        log_queue = queue.SimpleQueue()
+        queue_handler = logging.handlers.QueueHandler(log_queue)
+        queue_handler.addFilter(SampleFilter(LOG_SAMPLE_EVERY))
+
+        root = logging.getLogger(ROOT_LOGGER_NAME)
+        root.setLevel(LOG_LEVEL.upper())
+        root.addHandler(queue_handler)
+        root.propagate = False
+
+        _listener = logging.handlers.QueueListener(log_queue, *handlers)
+        _listener.start()
+        # 종료 시 큐에 남은 로그를 모두 출력
+        atexit.register(_listener.stop)
+
+
+def get_logger(name):
+    """모듈용 로거 ('backend.<name>') - 레벨은 LOG_LEVEL, 메시지는 logger.debug('%s', 값) 형태로 지연 포맷"""
+    _configure()
+    return logging.getLogger(f'{ROOT_LOGGER_NAME}.{name}')
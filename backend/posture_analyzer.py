@@ -5,6 +5,10 @@ from io import BytesIO
 from PIL import Image
 import mediapipe as mp
 
+from config import POSTURE_BASE_CACHE_SIZE, POSTURE_BASE_CACHE_TTL
+from cache_util import content_hash
+from state_backend import create_backend
+
 class PostureAnalyzer:
     def __init__(self):
         """자세 분석기 초기화"""
@@ -15,7 +19,12 @@ class PostureAnalyzer:
             enable_segmentation=False,
             min_detection_confidence=0.5
         )
-        self.base_landmarks = None
+        # 기준 자세 분석 결과 (기준 이미지 해시 → 랜드마크/점수) - STATE_BACKEND가 sqlite면 워커 프로세스 간 공유
+        self.base_landmarks = create_backend(
+            'posture_base_landmarks',
+            max_entries=POSTURE_BASE_CACHE_SIZE,
+            ttl=POSTURE_BASE_CACHE_TTL
+        )
         self.base_posture = None
         
     def analyze_image(self, image_data):
@@ -36,6 +45,18 @@ class PostureAnalyzer:
                     'message': '이미지를 처리할 수 없습니다.'
                 }
             
+            return self.analyze_frame(image)
+            
+        except Exception as e:
+            return {
+                'success': False,
+                'error': str(e),
+                'message': f'이미지 분석 중 오류 발생: {str(e)}'
+            }
+    
+    def analyze_frame(self, image):
+        """디코딩된 BGR 프레임(numpy 배열) 자세 분석 - 비디오 프레임 분석에서 직접 사용"""
+        try:
             # BGR을 RGB로 변환 (MediaPipe는 RGB 사용)
             image_rgb = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
             
@@ -167,8 +188,8 @@ class PostureAnalyzer:
     def compare_postures(self, base_image, current_image, movement_threshold='medium'):
         """기본 자세와 현재 자세 비교 - 움직임 민감도 기반"""
         try:
-            # 기본 자세 분석
-            base_result = self.analyze_image(base_image)
+            # 기본 자세 분석 (같은 기준 이미지는 매 프레임 다시 분석하지 않음)
+            base_result = self._analyze_base_image(base_image)
             if not base_result['success']:
                 return base_result
             
@@ -217,6 +238,21 @@ class PostureAnalyzer:
                 'message': f'자세 비교 중 오류 발생: {str(e)}'
             }
     
+    def _analyze_base_image(self, base_image):
+        """기준 자세 분석 - 성공한 결과만 기준 이미지 해시로 저장해 두고 재사용"""
+        key = content_hash(base_image.encode('utf-8'))
+        cached = self.base_landmarks.get(key)
+        if cached is not None:
+            return {'success': True, **cached}
+        
+        result = self.analyze_image(base_image)
+        if result['success']:
+            self.base_landmarks.set(key, {
+                'landmarks': result['landmarks'],
+                'posture_score': result['posture_score']
+            })
+        return result
+    
     def _get_thresholds_by_movement_level(self, movement_threshold):
         """움직임 민감도 레벨에 따른 임계값 반환 - 전반적으로 덜 민감하게 조정"""
         thresholds = {
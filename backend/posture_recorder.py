@@ -0,0 +1,284 @@
+import os
+import re
+import json
+import time
+import uuid
+import threading
+import numpy as np
+
+# 자세 상태 코드 (status 컬럼은 uint8로 저장)
+STATUS_CODES = {'normal': 0, 'warning': 1, 'alert': 2}
+STATUS_NAMES = {code: name for name, code in STATUS_CODES.items()}
+
+# MediaPipe Pose 랜드마크 개수 (x, y, z)
+NUM_LANDMARKS = 33
+
+# 컬럼 파일 정의: 파일명 -> dtype
+# 프레임 하나당 약 4 + 2 + 2 + 1 + 198 = 207바이트 (JSON 덤프 대비 1/20 수준)
+COLUMNS = {
+    't': ('t.u4', np.uint32),             # 세션 시작 기준 경과 시간 (ms)
+    'score': ('score.f2', np.float16),    # 현재 자세 점수 (0~1)
+    'diff': ('diff.f2', np.float16),      # 기본 자세 대비 차이 (0~1)
+    'status': ('status.u1', np.uint8),    # 자세 상태 코드
+    'landmarks': ('landmarks.f2', np.float16),  # (NUM_LANDMARKS, 3) 좌표
+}
+
+_ID_PATTERN = re.compile(r'^[A-Za-z0-9_-]{1,64}$')
+
+
+class PostureSessionRecorder:
+    """사용자별 자세 세션 타임라인을 컬럼 파일로 기록/집계"""
+
+    def __init__(self, base_dir, max_gap_ms=5000):
+        self.base_dir = base_dir
+        # 폴링이 끊긴 구간은 이 시간까지만 직전 상태로 간주
+        self.max_gap_ms = max_gap_ms
+        self._current_sessions = {}
+        self._locks = {}
+        self._lock = threading.Lock()
+        os.makedirs(self.base_dir, exist_ok=True)
+
+    def _validate_id(self, value, name):
+        if not value or not _ID_PATTERN.match(str(value)):
+            raise ValueError(f'{name} 형식이 올바르지 않습니다.')
+        return str(value)
+
+    def _session_dir(self, user_id, session_id):
+        return os.path.join(self.base_dir, user_id, session_id)
+
+    def _session_lock(self, key):
+        with self._lock:
+            if key not in self._locks:
+                self._locks[key] = threading.Lock()
+            return self._locks[key]
+
+    def _read_meta(self, user_id, session_id):
+        meta_path = os.path.join(self._session_dir(user_id, session_id), 'meta.json')
+        if not os.path.exists(meta_path):
+            return None
+        with open(meta_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def start_session(self, user_id, movement_threshold='medium'):
+        """새 세션 생성 후 session_id 반환"""
+        user_id = self._validate_id(user_id, 'user_id')
+        session_id = f"{time.strftime('%Y%m%d%H%M%S')}_{uuid.uuid4().hex[:8]}"
+        session_dir = self._session_dir(user_id, session_id)
+        os.makedirs(session_dir, exist_ok=True)
+
+        meta = {
+            'user_id': user_id,
+            'session_id': session_id,
+            'started_at': time.time(),
+            'movement_threshold': movement_threshold,
+            'num_landmarks': NUM_LANDMARKS
+        }
+        with open(os.path.join(session_dir, 'meta.json'), 'w', encoding='utf-8') as f:
+            json.dump(meta, f, ensure_ascii=False)
+
+        with self._lock:
+            self._current_sessions[user_id] = session_id
+        return session_id
+
+    def record(self, user_id, result, session_id=None, timestamp=None):
+        """compare_postures 결과 한 건을 세션 컬럼 파일에 append"""
+        user_id = self._validate_id(user_id, 'user_id')
+        if session_id:
+            session_id = self._validate_id(session_id, 'session_id')
+        else:
+            session_id = self._current_sessions.get(user_id)
+        if not session_id or self._read_meta(user_id, session_id) is None:
+            session_id = self.start_session(user_id, result.get('movement_threshold', 'medium'))
+
+        meta = self._read_meta(user_id, session_id)
+        now = time.time() if timestamp is None else timestamp
+        elapsed_ms = max(0, int((now - meta['started_at']) * 1000))
+
+        landmarks = np.zeros((NUM_LANDMARKS, 3), dtype=np.float16)
+        current_landmarks = result.get('current_landmarks')
+        if current_landmarks:
+            coords = np.asarray(current_landmarks, dtype=np.float32)[:NUM_LANDMARKS, :3]
+            landmarks[:len(coords)] = coords
+
+        values = {
+            'score': np.array([result.get('current_score', 0.0)], dtype=np.float16),
+            'diff': np.array([result.get('difference', 0.0)], dtype=np.float16),
+            'status': np.array([STATUS_CODES.get(result.get('status'), STATUS_CODES['alert'])], dtype=np.uint8),
+            'landmarks': landmarks,
+            # 시간 컬럼을 마지막에 기록 → 중간에 끊긴 프레임은 조회에서 제외됨
+            't': np.array([elapsed_ms], dtype=np.uint32),
+        }
+
+        session_dir = self._session_dir(user_id, session_id)
+        with self._session_lock(f'{user_id}/{session_id}'):
+            # 이전 기록이 중간에 끊겼으면 모든 컬럼을 온전한 프레임 수에 맞춘 뒤 append
+            self._truncate_columns(session_dir)
+            for column, array in values.items():
+                filename, _ = COLUMNS[column]
+                with open(os.path.join(session_dir, filename), 'ab') as f:
+                    f.write(array.tobytes())
+
+        return session_id
+
+    def _load_column(self, session_dir, column, count=None):
+        """컬럼 파일 하나만 memmap으로 로드 (다른 컬럼은 읽지 않음)"""
+        filename, dtype = COLUMNS[column]
+        path = os.path.join(session_dir, filename)
+        if not os.path.exists(path) or os.path.getsize(path) == 0:
+            return np.zeros(0, dtype=dtype)
+        data = np.memmap(path, dtype=dtype, mode='r')
+        if column == 'landmarks':
+            data = data[:(len(data) // (NUM_LANDMARKS * 3)) * NUM_LANDMARKS * 3].reshape(-1, NUM_LANDMARKS, 3)
+        return data if count is None else data[:count]
+
+    def _frame_count(self, session_dir):
+        """모든 컬럼에 온전히 기록된 프레임 수"""
+        counts = []
+        for column, (filename, _) in COLUMNS.items():
+            path = os.path.join(session_dir, filename)
+            size = os.path.getsize(path) if os.path.exists(path) else 0
+            counts.append(size // self._column_itemsize(column))
+        return min(counts)
+
+    def _column_itemsize(self, column):
+        dtype = COLUMNS[column][1]
+        return np.dtype(dtype).itemsize * (NUM_LANDMARKS * 3 if column == 'landmarks' else 1)
+
+    def _truncate_columns(self, session_dir):
+        """컬럼 파일 길이가 프레임 수 기준으로 어긋나 있으면 가장 짧은 컬럼에 맞춰 자름 (기록 중 중단/크래시 복구)"""
+        sizes = {}
+        for column, (filename, _) in COLUMNS.items():
+            path = os.path.join(session_dir, filename)
+            sizes[column] = os.path.getsize(path) if os.path.exists(path) else 0
+        count = min(size // self._column_itemsize(column) for column, size in sizes.items())
+        for column, (filename, _) in COLUMNS.items():
+            expected = count * self._column_itemsize(column)
+            if sizes[column] != expected:
+                with open(os.path.join(session_dir, filename), 'ab') as f:
+                    f.truncate(expected)
+
+    def _frame_durations(self, t):
+        """프레임별 지속 시간 (ms) - 다음 프레임까지의 간격, 최대 max_gap_ms"""
+        if len(t) == 0:
+            return np.zeros(0, dtype=np.float64)
+        gaps = np.diff(t.astype(np.int64))
+        last = np.median(gaps) if len(gaps) else 0
+        durations = np.append(gaps, last).astype(np.float64)
+        return np.clip(durations, 0, self.max_gap_ms)
+
+    def list_sessions(self, user_id):
+        """사용자의 세션 목록"""
+        user_id = self._validate_id(user_id, 'user_id')
+        user_dir = os.path.join(self.base_dir, user_id)
+        if not os.path.isdir(user_dir):
+            return []
+
+        sessions = []
+        for session_id in sorted(os.listdir(user_dir)):
+            meta = self._read_meta(user_id, session_id)
+            if meta is None:
+                continue
+            meta['frames'] = self._frame_count(self._session_dir(user_id, session_id))
+            sessions.append(meta)
+        return sessions
+
+    def summarize(self, user_id, session_id, window_sec=30, top_k=3):
+        """세션 집계 - 상태별 시간 비율과 가장 나빴던 구간 (랜드마크 컬럼은 읽지 않음)"""
+        user_id = self._validate_id(user_id, 'user_id')
+        session_id = self._validate_id(session_id, 'session_id')
+        meta = self._read_meta(user_id, session_id)
+        if meta is None:
+            return {'success': False, 'message': '세션을 찾을 수 없습니다.'}
+
+        session_dir = self._session_dir(user_id, session_id)
+        count = self._frame_count(session_dir)
+        t = np.asarray(self._load_column(session_dir, 't', count), dtype=np.int64)
+        status = np.asarray(self._load_column(session_dir, 'status', count))
+        diff = np.asarray(self._load_column(session_dir, 'diff', count), dtype=np.float32)
+        score = np.asarray(self._load_column(session_dir, 'score', count), dtype=np.float32)
+
+        durations = self._frame_durations(t)
+        total_ms = float(durations.sum())
+
+        status_ratio = {}
+        time_by_status = np.bincount(status, weights=durations, minlength=len(STATUS_CODES))
+        for code, name in STATUS_NAMES.items():
+            status_ratio[name] = round(float(time_by_status[code] / total_ms * 100), 1) if total_ms else 0.0
+
+        return {
+            'success': True,
+            'user_id': user_id,
+            'session_id': session_id,
+            'frames': int(count),
+            'duration_sec': round(total_ms / 1000, 1),
+            'status_percent': status_ratio,
+            'alert_percent': status_ratio['alert'],
+            'average_score': round(float(np.average(score, weights=durations)), 3) if total_ms else None,
+            'average_difference': round(float(np.average(diff, weights=durations)), 3) if total_ms else None,
+            'worst_intervals': self._worst_intervals(t, diff, status, durations, window_sec, top_k)
+        }
+
+    def _worst_intervals(self, t, diff, status, durations, window_sec, top_k):
+        """시간 가중 평균 차이가 가장 큰 window_sec 구간 top_k개 (겹치지 않게)"""
+        if len(t) == 0:
+            return []
+
+        window_ms = int(window_sec * 1000)
+        # 누적합으로 각 프레임에서 시작하는 구간의 가중 평균을 O(n)에 계산
+        weighted = np.concatenate(([0.0], np.cumsum(diff * durations)))
+        alert_time = np.concatenate(([0.0], np.cumsum((status == STATUS_CODES['alert']) * durations)))
+        total_time = np.concatenate(([0.0], np.cumsum(durations)))
+
+        ends = np.searchsorted(t, t + window_ms, side='left')
+        span = total_time[ends] - total_time[:len(t)]
+        valid = span > 0
+        mean_diff = np.zeros(len(t), dtype=np.float64)
+        mean_diff[valid] = (weighted[ends] - weighted[:len(t)])[valid] / span[valid]
+
+        intervals = []
+        taken_until = np.full(len(t), False)
+        for start in np.argsort(-mean_diff, kind='stable'):
+            if len(intervals) >= top_k or mean_diff[start] <= 0:
+                break
+            end = ends[start]
+            if taken_until[start:end].any():
+                continue
+            taken_until[start:end] = True
+            intervals.append({
+                'start_sec': round(float(t[start]) / 1000, 1),
+                'end_sec': round(float(t[end - 1] + durations[end - 1]) / 1000, 1),
+                'average_difference': round(float(mean_diff[start]), 3),
+                'alert_percent': round(float((alert_time[end] - alert_time[start]) / span[start] * 100), 1)
+            })
+
+        intervals.sort(key=lambda x: x['start_sec'])
+        return intervals
+
+    def timeline(self, user_id, session_id, bucket_sec=10):
+        """bucket_sec 단위로 다운샘플링한 타임라인 (차트용)"""
+        user_id = self._validate_id(user_id, 'user_id')
+        session_id = self._validate_id(session_id, 'session_id')
+        session_dir = self._session_dir(user_id, session_id)
+        count = self._frame_count(session_dir)
+        if count == 0:
+            return []
+
+        t = np.asarray(self._load_column(session_dir, 't', count), dtype=np.int64)
+        diff = np.asarray(self._load_column(session_dir, 'diff', count), dtype=np.float64)
+        status = np.asarray(self._load_column(session_dir, 'status', count))
+        durations = self._frame_durations(t)
+
+        bucket = t // max(1, int(bucket_sec * 1000))
+        n_buckets = int(bucket[-1]) + 1
+        time_sum = np.bincount(bucket, weights=durations, minlength=n_buckets)
+        diff_sum = np.bincount(bucket, weights=diff * durations, minlength=n_buckets)
+        alert_sum = np.bincount(bucket, weights=(status == STATUS_CODES['alert']) * durations, minlength=n_buckets)
+
+        points = []
+        for i in np.nonzero(time_sum)[0]:
+            points.append({
+                'start_sec': int(i * bucket_sec),
+                'average_difference': round(float(diff_sum[i] / time_sum[i]), 3),
+                'alert_percent': round(float(alert_sum[i] / time_sum[i] * 100), 1)
+            })
+        return points
@@ -0,0 +1,123 @@
+from config import QUESTION_CONTEXT_MAX_CHARS, QUESTION_CONTEXT_WINDOW_LINES
+from keyword_index import KeywordIndex
+from log_util import get_logger
+import text_patterns as patterns
+
+logger = get_logger(__name__)
+
+# 질문 후보 줄의 최대 길이 (이보다 긴 줄은 본문/설명으로 간주)
+QUESTION_LINE_MAX = 200
+# 인재상/우대사항 제목 줄의 최대 길이
+HEADING_LINE_MAX = 40
+# 문맥 창에 넣는 줄은 이 길이까지만 사용
+CONTEXT_LINE_MAX = 300
+
+# 질문 문장 표현 (기술/작성/설명 같은 일반 명사는 채용 공고 본문에도 흔해 제외)
+QUESTION_PHRASES = KeywordIndex([
+    '해주세요', '해 주세요', '주십시오', '하십시오', '하시오', '바랍니다',
+    '무엇', '어떻게', '?'
+])
+
+# 답변에 반영할 채용 정보 구역 제목 - 제목 뒤 QUESTION_CONTEXT_WINDOW_LINES줄을 함께 전달
+CONTEXT_HEADINGS = KeywordIndex([
+    '인재상', '우대사항', '우대 사항', '핵심가치', '핵심 가치', '핵심역량', '핵심 역량',
+    '자격요건', '자격 요건', '지원자격', '지원 자격', '기업문화', '조직문화', '비전'
+])
+
+
+def iter_lines(text):
+    """줄 목록을 만들지 않고 앞에서부터 한 줄씩 반환"""
+    start = 0
+    length = len(text)
+    while start < length:
+        end = text.find('\n', start)
+        if end == -1:
+            end = length
+        yield text[start:end]
+        start = end + 1
+
+
+def iter_question_segments(lines, window_lines=QUESTION_CONTEXT_WINDOW_LINES):
+    """
+    줄 스트림을 한 번 훑으며 (줄 번호, 종류, 텍스트)를 반환
+    - 'question': 번호/기호로 시작하거나 질문 표현이 있는 짧은 줄
+    - 'context': 인재상/우대사항 등 제목 줄과 그 뒤 window_lines줄
+    """
+    remaining_window = 0
+    for number, line in enumerate(lines):
+        line = line.strip()
+        if not line:
+            continue
+
+        if len(line) <= HEADING_LINE_MAX and CONTEXT_HEADINGS.contains_any(line):
+            remaining_window = window_lines
+            yield number, 'context', line
+        elif len(line) <= QUESTION_LINE_MAX and (patterns.QUESTION_PREFIX.match(line)
+                                                   or QUESTION_PHRASES.contains_any(line)):
+            yield number, 'question', line
+        elif remaining_window > 0:
+            remaining_window -= 1
+            yield number, 'context', line[:CONTEXT_LINE_MAX]
+
+
+def compact_question_text(text, max_chars=QUESTION_CONTEXT_MAX_CHARS):
+    """
+    질문 텍스트(크롤링한 채용 페이지/OCR/문서)를 LLM 프롬프트용으로 압축
+    - max_chars 이하면 그대로 반환
+    - 길면 번호/기호로 시작하는 질문 줄 → 질문 표현만 있는 줄 → 인재상/우대사항 문맥 줄 순으로
+      예산에 넣고(넘치는 줄은 건너뜀) 원래 순서대로 이어 붙임 (떨어져 있던 구간 사이에는 빈 줄)
+    - 질문 후보도 문맥도 없으면 앞부분 max_chars자
+    """
+    if len(text) <= max_chars:
+        return text
+
+    # 우선순위별 후보 (각각 max_chars까지만 모음): 0 번호/기호 질문, 1 질문 표현만 있는 줄, 2 문맥 줄
+    groups = ([], [], [])
+    collected = [0, 0, 0]
+    for number, kind, line in iter_question_segments(iter_lines(text)):
+        if kind == 'context':
+            rank = 2
+        else:
+            rank = 0 if patterns.QUESTION_PREFIX.match(line) else 1
+        # 한 줄만으로 예산을 넘는 줄은 어차피 넣을 수 없으므로 모으지 않음
+        if collected[rank] < max_chars and len(line) < max_chars:
+            groups[rank].append((number, line))
+            collected[rank] += len(line) + 1
+        if min(collected) >= max_chars:
+            break
+
+    numbered, phrased, contexts = groups
+    questions = numbered + phrased
+    if not questions and not contexts:
+        logger.info("[질문 압축] 질문 후보 없음, 앞부분 %d자 사용 (원본 %d자)", max_chars, len(text))
+        return text[:max_chars]
+
+    # 질문 후보를 먼저 예산에 넣고 남은 분량만 문맥에 사용 (들어가지 않는 긴 줄은 건너뛰고 다음 줄 시도)
+    selected = []
+    budget = max_chars
+    for number, line in questions:
+        if len(line) + 1 > budget:
+            continue
+        selected.append((number, line))
+        budget -= len(line) + 1
+    question_count = len(selected)
+    for number, line in contexts:
+        if len(line) + 1 > budget:
+            continue
+        selected.append((number, line))
+        budget -= len(line) + 1
+    context_count = len(selected) - question_count
+    selected.sort()
+
+    parts = []
+    previous = None
+    for number, line in selected:
+        if previous is not None and number != previous + 1:
+            parts.append('')
+        parts.append(line)
+        previous = number
+    compacted = '\n'.join(parts)
+
+    logger.info("[질문 압축] %d자 → %d자 (질문 후보 %d줄, 문맥 %d줄)",
+                len(text), len(compacted), question_count, context_count)
+    return compacted
@@ -0,0 +1,118 @@
+import re
+import math
+from collections import Counter
+
+from config import RESUME_CONTEXT_MAX_CHARS, RESUME_CHUNK_CHARS, RESUME_TOP_K
+from log_util import get_logger
+
+logger = get_logger(__name__)
+
+# 한글은 형태소 분석기 없이 음절 bigram, 영문/숫자는 단어 단위로 색인
+_TOKEN_PATTERN = re.compile(r'[가-힣]+|[a-zA-Z]+|\d+')
+_SENTENCE_END = re.compile(r'(?<=[.!?다요])\s+')
+
+# 질문 표현 자체는 검색어에서 제외 (모든 청크에 고르게 나오거나 의미가 없음)
+QUERY_STOPWORDS = {'대해', '대한', '설명', '기술', '서술', '작성', '주세', '세요', '십시', '시오', '주십', '하십', '해주', '말씀', '본인'}
+
+
+def tokenize(text):
+    tokens = []
+    for word in _TOKEN_PATTERN.findall(text.lower()):
+        if '가' <= word[0] <= '힣':
+            if len(word) == 1:
+                tokens.append(word)
+            else:
+                tokens.extend(word[i:i + 2] for i in range(len(word) - 1))
+        else:
+            tokens.append(word)
+    return tokens
+
+
+def chunk_text(text, chunk_chars=RESUME_CHUNK_CHARS):
+    """문단 단위로 나누고, 긴 문단은 문장 경계에서 chunk_chars 안팎으로 자름 (짧은 문단은 합침)"""
+    chunks = []
+    current = ''
+    for paragraph in re.split(r'\n\s*\n', text):
+        paragraph = paragraph.strip()
+        if not paragraph:
+            continue
+        pieces = [paragraph] if len(paragraph) <= chunk_chars else _SENTENCE_END.split(paragraph)
+        for piece in pieces:
+            if current and len(current) + len(piece) + 1 > chunk_chars:
+                chunks.append(current)
+                current = ''
+            current = f'{current}\n{piece}' if current else piece
+        # 문단 경계는 청크 경계로 유지하되 너무 짧으면 다음 문단과 합침
+        if len(current) >= chunk_chars // 2:
+            chunks.append(current)
+            current = ''
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+class BM25Index:
+    """청크 목록에 대한 Okapi BM25 검색 (CPU에서 즉시 색인, 외부 모델 없음)"""
+
+    def __init__(self, documents, k1=1.5, b=0.75):
+        self.k1 = k1
+        self.b = b
+        self.term_counts = [Counter(tokenize(document)) for document in documents]
+        self.lengths = [sum(counts.values()) for counts in self.term_counts]
+        self.average_length = (sum(self.lengths) / len(self.lengths)) if self.lengths else 0.0
+
+        document_frequency = Counter()
+        for counts in self.term_counts:
+            document_frequency.update(counts.keys())
+        total = len(documents)
+        self.idf = {term: math.log(1 + (total - frequency + 0.5) / (frequency + 0.5))
+                    for term, frequency in document_frequency.items()}
+
+    def scores(self, query):
+        terms = [term for term in set(tokenize(query)) if term in self.idf and term not in QUERY_STOPWORDS]
+        results = []
+        for counts, length in zip(self.term_counts, self.lengths):
+            norm = self.k1 * (1 - self.b + self.b * length / self.average_length) if self.average_length else self.k1
+            score = 0.0
+            for term in terms:
+                frequency = counts.get(term)
+                if frequency:
+                    score += self.idf[term] * frequency * (self.k1 + 1) / (frequency + norm)
+            results.append(score)
+        return results
+
+
+class ResumeIndex:
+    """
+    자기소개서/이력서 청크 검색 - 질문마다 관련도가 높은 청크만 골라 프롬프트에 넣기 위해 사용
+    전체 길이가 max_chars 이하이면 원문을 그대로 사용
+    """
+
+    def __init__(self, resume_text, chunk_chars=RESUME_CHUNK_CHARS):
+        self.text = resume_text
+        self.chunks = chunk_text(resume_text, chunk_chars)
+        self.index = BM25Index(self.chunks)
+
+    def select(self, query, max_chars=RESUME_CONTEXT_MAX_CHARS, top_k=RESUME_TOP_K):
+        """관련도 상위 top_k개 청크를 max_chars 안에서 골라 원래 순서대로 연결"""
+        if len(self.text) <= max_chars or not self.chunks:
+            return self.text
+
+        scores = self.index.scores(query)
+        ranked = sorted(range(len(self.chunks)), key=lambda i: (-scores[i], i))
+        selected = []
+        budget = max_chars
+        for i in ranked:
+            if len(selected) >= top_k:
+                break
+            if len(self.chunks[i]) + 2 > budget:
+                continue
+            selected.append(i)
+            budget -= len(self.chunks[i]) + 2
+        selected.sort()
+
+        result = '\n\n'.join(self.chunks[i] for i in selected)
+        logger.info("[자소서 검색] 청크 %d개 중 %d개 선택 (%d자 → %d자, 최고 점수 %.2f)",
+                    len(self.chunks), len(selected), len(self.text), len(result),
+                    scores[ranked[0]] if ranked else 0.0)
+        return result
@@ -1,95 +1,165 @@
-import re
+import time
+import logging
 from collections import Counter
-import pdfplumber
 from PIL import Image, ImageEnhance, ImageFilter
 import cv2
 import numpy as np
 import pytesseract
 
+from pdf_extractor import extract_pdf_text
+from hwp_extractor import extract_hwp_text
+from keyword_index import KeywordIndex
+import text_patterns as patterns
+from log_util import get_logger, Preview, SAMPLED
+
+# 자기소개서 관련 키워드 색인 (줄마다 키워드 목록을 반복하지 않고 한 번의 스캔으로 매칭)
+# 특수기호 뒤 텍스트가 질문 항목인지 판단할 때 사용
+QUESTION_MARKER_KEYWORDS = KeywordIndex([
+    '성장과정', '지원동기', '포부', '성격', '장단점', '자기소개',
+    '강점', '약점', '경험', '어려움', '극복', '협업', '팀워크',
+    '계획', '목표', '역량', '능력', '특기', '취미'
+])
+
+# HWP 정리 시 줄 우선순위 (등급 순서 → 등급 내 목록 순서로 먼저 매칭된 키워드 사용)
+PRIORITY_KEYWORDS = KeywordIndex({
+    'high': ['성장과정', '지원동기', '입사 후 포부', '포부'],
+    'medium': ['성격', '장단점', '자기소개', '강점', '약점'],
+    'low': ['경험', '계획', '목표', '어려움', '극복', '협업', '팀워크']
+})
+PRIORITY_LABELS = {'high': '고우선순위', 'medium': '중우선순위', 'low': '저우선순위'}
+
+# 유효한 질문 판단: 의미있는 단어 또는 질문 형태 표현
+VALID_QUESTION_KEYWORDS = KeywordIndex({
+    'meaningful': ['소개', '경험', '과정', '어려움', '극복', '강점', '지원', '동기', '포부', '계획', '목표'],
+    'question': ['해주세요', '말해주세요', '설명해주세요', '작성해주세요', '어떻게', '무엇', '왜', '언제']
+})
+
+# 키워드 기반 파싱의 기본 질문 (dict 순서가 우선순위)
+BASIC_QUESTIONS = {
+    '성장과정': '성장과정에 대해 설명해주세요',
+    '지원동기': '지원동기를 말씀해주세요',
+    '장단점': '성격의 장단점을 설명해주세요',
+    '포부': '입사 후 포부를 말씀해주세요',
+    '강점': '본인의 강점을 설명해주세요'
+}
+BASIC_QUESTION_KEYWORDS = KeywordIndex(list(BASIC_QUESTIONS))
+
+logger = get_logger(__name__)
+
 def detect_and_convert_symbols(text):
     """
     텍스트에서 특수기호를 동적으로 감지하고 질문 패턴인지 판단하여 변환 (■ 문자 특별 처리)
     """
-    print("[동적 특수기호 감지] 시작...")
+    logger.debug("[동적 특수기호 감지] 시작...")
     
-    # 1. ■ 문자 우선 처리 (자기소개서에서 흔히 사용됨)
-    square_pattern = r'■\s*([^■\n]{3,50})'
-    square_matches = re.findall(square_pattern, text)
+    # 1. ■ 문자 우선 처리 (자기소개서에서 흔히 사용됨) - 찾기와 변환을 한 번의 치환으로
+    question_number = 1
     
-    if square_matches:
-        print(f"[동적 특수기호 감지] ■ 패턴 {len(square_matches)}개 발견")
-        converted_text = text
-        question_number = 1
-        
-        def replace_square_with_number(match):
-            nonlocal question_number
-            content = match.group(1).strip()
-            result = f"\n{question_number}. {content}"
-            question_number += 1
-            print(f"[동적 특수기호 감지] ■ 변환: '■ {content[:20]}...' -> '{question_number-1}. {content[:20]}...'")
-            return result
-        
-        converted_text = re.sub(square_pattern, replace_square_with_number, converted_text)
+    def replace_square_with_number(match):
+        nonlocal question_number
+        content = match.group(1).strip()
+        result = f"\n{question_number}. {content}"
+        question_number += 1
+        logger.debug("[동적 특수기호 감지] ■ 변환: '■ %s' -> '%d. %s'", Preview(content, 20), question_number - 1,
+                     Preview(content, 20), extra=SAMPLED)
+        return result
+    
+    converted_text, square_count = patterns.SQUARE_ITEM.subn(replace_square_with_number, text)
+    
+    if square_count:
+        logger.info("[동적 특수기호 감지] ■ 패턴 %d개 발견", square_count)
         return converted_text
     
-    # 2. 한글, 영어, 숫자가 아닌 모든 문자 찾기 (■가 없을 경우)
-    special_chars = re.findall(r'[^가-힣a-zA-Z0-9\s\n.,?!()\[\]/-]', text)
+    # 2. 한글, 영어, 숫자가 아닌 모든 문자의 위치를 한 번의 스캔으로 수집 (■가 없을 경우)
+    positions = {}
+    for match in patterns.SPECIAL_CHAR.finditer(text):
+        positions.setdefault(match.group(), []).append(match.start())
     
-    if not special_chars:
-        print("[동적 특수기호 감지] 특수기호가 발견되지 않음")
+    if not positions:
+        logger.debug("[동적 특수기호 감지] 특수기호가 발견되지 않음")
         return text
     
     # 3. 특수기호 빈도 분석
-    char_counts = Counter(special_chars)
+    char_counts = Counter({char: len(found) for char, found in positions.items()})
     
-    print(f"[동적 특수기호 감지] 발견된 특수기호: {dict(char_counts)}")
+    logger.debug("[동적 특수기호 감지] 발견된 특수기호: %s", char_counts)
     
     # 4. 질문 구분자로 사용될 가능성이 높은 특수기호 찾기
-    potential_markers = []
+    # 기호 + 공백 + 텍스트 항목은 같은 기호를 포함할 수 없으므로 기호마다 finditer한 결과는
+    # 각 출현 위치에서 앵커 매칭한 결과와 같음 → 본문을 기호 수만큼 다시 훑지 않음
+    potential_markers = {}
     
-    for char, count in char_counts.items():
+    for char, found in positions.items():
         # 조건: 2회 이상 나타나고, 질문 키워드 근처에 있는 기호
-        if count >= 2 and is_question_marker(text, char):
-            potential_markers.append(char)
-            print(f"[동적 특수기호 감지] 질문 구분자 후보: '{char}' (출현 {count}회)")
+        if len(found) < 2:
+            continue
+        pattern = patterns.marker_pattern(char)
+        items = [item for item in (pattern.match(text, position) for position in found) if item]
+        if _marker_confidence(char, [item.group(1) for item in items]) >= 0.5:
+            potential_markers[char] = items
+            logger.info("[동적 특수기호 감지] 질문 구분자 후보: '%s' (출현 %d회)", char, len(found))
     
-    # 5. 발견된 특수기호들을 숫자로 변환
+    if not potential_markers:
+        return text
+    
+    # 5. 발견된 특수기호들을 숫자로 변환 - 번호는 기호 순서대로(첫 기호의 항목부터) 매김
+    numbered = []
+    question_number = 1
+    for marker, items in potential_markers.items():
+        for item in items:
+            numbered.append((item, question_number))
+            question_number += 1
+    numbered.sort(key=lambda entry: entry[0].start())
+    
+    if not _items_independent(text, numbered, potential_markers):
+        # 한 기호의 항목 안에 다른 기호가 있으면 앞 기호의 변환 결과에 따라 뒤 기호의 항목이 달라지므로 기호별로 차례로 치환
+        logger.debug("[동적 특수기호 감지] 기호 항목이 겹쳐 기호별 순차 변환")
+        return _convert_markers_sequentially(text, potential_markers)
+    
+    parts = []
+    last = 0
+    for item, number in numbered:
+        content = item.group(1).strip()
+        parts.append(text[last:item.start()])
+        parts.append(f"\n{number}. {content}")
+        last = item.end()
+        logger.debug("[동적 특수기호 감지] 변환: '%s %s' -> '%d. %s'", item.group()[0], Preview(content, 20),
+                     number, Preview(content, 20), extra=SAMPLED)
+    parts.append(text[last:])
+    return ''.join(parts)
+
+def _items_independent(text, numbered, markers):
+    """변환할 항목끼리 겹치지 않고, 항목 안에 (맨 앞 기호 외) 다른 구분자 기호가 없는지"""
+    previous_end = 0
+    for item, _ in numbered:
+        if item.start() < previous_end:
+            return False
+        previous_end = item.end()
+        if any(char in markers for char in text[item.start() + 1:item.end()]):
+            return False
+    return True
+
+def _convert_markers_sequentially(text, markers):
+    """기호마다 변환된 텍스트 전체를 다시 치환 (항목이 서로 겹칠 때만 사용)"""
     converted_text = text
     question_number = 1
     
-    for marker in potential_markers:
-        # 특수기호 + 공백 + 텍스트 패턴을 찾아서 변환
-        pattern = rf'{re.escape(marker)}\s*([^{re.escape(marker)}\n]{{3,50}})'
-        
+    for marker in markers:
         def replace_with_number(match):
             nonlocal question_number
             content = match.group(1).strip()
             result = f"\n{question_number}. {content}"
             question_number += 1
-            print(f"[동적 특수기호 감지] 변환: '{marker} {content[:20]}...' -> '{question_number-1}. {content[:20]}...'")
             return result
         
-        converted_text = re.sub(pattern, replace_with_number, converted_text)
+        converted_text = patterns.marker_pattern(marker).sub(replace_with_number, converted_text)
     
     return converted_text
 
-def is_question_marker(text, char):
-    """
-    특정 문자가 질문 구분자로 사용되고 있는지 판단
-    """
-    # 자기소개서 관련 키워드들
-    question_keywords = [
-        '성장과정', '지원동기', '포부', '성격', '장단점', '자기소개', 
-        '강점', '약점', '경험', '어려움', '극복', '협업', '팀워크',
-        '계획', '목표', '역량', '능력', '특기', '취미'
-    ]
-    
-    # 해당 특수기호 주변 텍스트들 찾기
-    pattern = rf'{re.escape(char)}\s*([^{re.escape(char)}\n]{{3,50}})'
-    matches = re.findall(pattern, text)
-    
+def _marker_confidence(char, matches):
+    """특수기호 뒤 항목 텍스트들 중 자기소개서 키워드/적절한 길이를 가진 비율 (0.5 이상이면 질문 구분자)"""
     if not matches:
-        return False
+        return 0.0
     
     # 키워드 매칭 점수 계산
     keyword_score = 0
@@ -99,10 +169,8 @@ def is_question_marker(text, char):
         match_text = match.strip().lower()
         
         # 자기소개서 키워드가 포함되어 있는지 체크
-        for keyword in question_keywords:
-            if keyword in match_text:
-                keyword_score += 1
-                break
+        if QUESTION_MARKER_KEYWORDS.contains_any(match_text):
+            keyword_score += 1
         
         # 길이가 적절한지 체크 (너무 짧거나 길지 않은)
         if 3 <= len(match_text) <= 30:
@@ -111,29 +179,37 @@ def is_question_marker(text, char):
     # 점수 기준: 전체 매치의 50% 이상이 의미있는 내용이면 질문 구분자로 판단
     confidence = keyword_score / total_matches
     
-    print(f"[특수기호 분석] '{char}': {total_matches}개 패턴, 신뢰도 {confidence:.2f}")
+    logger.debug("[특수기호 분석] '%s': %d개 패턴, 신뢰도 %.2f", char, total_matches, confidence)
     
-    return confidence >= 0.5
+    return confidence
+
+def is_question_marker(text, char):
+    """
+    특정 문자가 질문 구분자로 사용되고 있는지 판단
+    """
+    # 해당 특수기호 주변 텍스트들 찾기
+    matches = patterns.marker_pattern(char).findall(text)
+    return _marker_confidence(char, matches) >= 0.5
 
 def enhanced_symbol_detection(text):
     """
     더 정교한 특수기호 감지 (패턴 분석 포함)
     """
-    print("[정교한 특수기호 분석] 시작...")
+    logger.debug("[정교한 특수기호 분석] 시작...")
     
     # 1. 줄의 시작 부분에 나타나는 특수기호들 찾기
-    line_start_symbols = re.findall(r'^\s*([^가-힣a-zA-Z0-9\s.,?!()\[\]/-])', text, re.MULTILINE)
+    line_start_symbols = patterns.LINE_START_SYMBOL.findall(text)
     
     # 2. 단어 사이에 나타나는 반복 패턴 찾기
-    repeated_patterns = re.findall(r'([^가-힣a-zA-Z0-9\s.,?!()\[\]/-])\s*([가-힣]{2,10})', text)
+    repeated_patterns = patterns.SYMBOL_WORD.findall(text)
     
-    print(f"[정교한 특수기호 분석] 줄 시작 기호: {set(line_start_symbols)}")
-    print(f"[정교한 특수기호 분석] 반복 패턴: {len(repeated_patterns)}개")
+    logger.debug("[정교한 특수기호 분석] 줄 시작 기호: %s", set(line_start_symbols))
+    logger.debug("[정교한 특수기호 분석] 반복 패턴: %d개", len(repeated_patterns))
     
     # 3. 가장 유력한 구분자 찾기
     if line_start_symbols:
         most_common = Counter(line_start_symbols).most_common(1)[0]
-        print(f"[정교한 특수기호 분석] 가장 유력한 구분자: '{most_common[0]}' ({most_common[1]}회)")
+        logger.debug("[정교한 특수기호 분석] 가장 유력한 구분자: '%s' (%d회)", most_common[0], most_common[1])
         return most_common[0]
     
     return None
@@ -142,33 +218,24 @@ def clean_hwp_text(raw_text):
     """
     HWP에서 추출된 텍스트 정리 (동적 특수기호 감지 및 키워드 우선순위 처리 추가)
     """
-    print(f"[HWP 정리] 원본 텍스트: {raw_text[:300]}...")
+    logger.debug("[HWP 정리] 원본 텍스트: %s", Preview(raw_text, 300))
     
     # 1. 기본 정리
     text = raw_text.replace('\x00', '')  # null 문자 제거
-    text = re.sub(r'\s+', ' ', text)  # 연속 공백을 하나로
+    text = patterns.WHITESPACE_RUN.sub(' ', text)  # 연속 공백을 하나로
     
     # 2. 동적 특수기호 감지 및 변환
     text = detect_and_convert_symbols(text)
     
     # 3. 표 구분선 제거
-    text = re.sub(r'[─┌┬┐├┼┤└┴┘│┃━┏┳┓┣╋┫┗┻┛]+', '\n', text)  # 표 선 제거
-    text = re.sub(r'\n+', '\n', text)  # 연속 줄바꿈 정리
+    text = patterns.TABLE_LINES.sub('\n', text)  # 표 선 제거
+    text = patterns.NEWLINE_RUN.sub('\n', text)  # 연속 줄바꿈 정리
     
     # 4. 키워드 기반 우선순위 처리
     lines = text.split('\n')
     
-    # 자기소개서 관련 키워드 (우선순위별로 정렬)
-    priority_keywords = {
-        'high': ['성장과정', '지원동기', '입사 후 포부', '포부'],
-        'medium': ['성격', '장단점', '자기소개', '강점', '약점'],
-        'low': ['경험', '계획', '목표', '어려움', '극복', '협업', '팀워크']
-    }
-    
     # 키워드별로 줄을 분류
-    high_priority_lines = []
-    medium_priority_lines = []
-    low_priority_lines = []
+    priority_lines = {tier: [] for tier in PRIORITY_LABELS}
     numbered_lines = []  # 숫자로 시작하는 줄들
     other_lines = []
     
@@ -178,41 +245,19 @@ def clean_hwp_text(raw_text):
             continue
         
         # 숫자로 시작하는 줄 우선 처리
-        if re.match(r'^\d+\.', line):
+        if patterns.NUMBERED_LINE.match(line):
             numbered_lines.append(line)
-            print(f"[HWP 정리] 숫자 패턴 발견: {line[:50]}...")
+            logger.debug("[HWP 정리] 숫자 패턴 발견: %s", Preview(line, 50), extra=SAMPLED)
             continue
             
-        # 우선순위 분류
-        line_classified = False
-        
-        # 고우선순위 체크
-        for keyword in priority_keywords['high']:
-            if keyword in line:
-                high_priority_lines.append(line)
-                print(f"[HWP 정리] 고우선순위 발견: {line[:50]}... (키워드: {keyword})")
-                line_classified = True
-                break
-        
-        if not line_classified:
-            # 중우선순위 체크
-            for keyword in priority_keywords['medium']:
-                if keyword in line:
-                    medium_priority_lines.append(line)
-                    print(f"[HWP 정리] 중우선순위 발견: {line[:50]}... (키워드: {keyword})")
-                    line_classified = True
-                    break
-        
-        if not line_classified:
-            # 저우선순위 체크
-            for keyword in priority_keywords['low']:
-                if keyword in line:
-                    low_priority_lines.append(line)
-                    print(f"[HWP 정리] 저우선순위 발견: {line[:50]}... (키워드: {keyword})")
-                    line_classified = True
-                    break
-        
-        if not line_classified and len(line) > 10:
+        # 우선순위 분류 (고 → 중 → 저)
+        match = PRIORITY_KEYWORDS.classify(line)
+        if match:
+            keyword, tier = match
+            priority_lines[tier].append(line)
+            logger.debug("[HWP 정리] %s 발견: %s (키워드: %s)", PRIORITY_LABELS[tier], Preview(line, 50), keyword,
+                         extra=SAMPLED)
+        elif len(line) > 10:
             other_lines.append(line)
     
     # 5. 우선순위별로 재정렬 (숫자 패턴을 가장 먼저)
@@ -221,76 +266,135 @@ def clean_hwp_text(raw_text):
     # 숫자로 시작하는 줄들 먼저 (동적으로 변환된 것들)
     if numbered_lines:
         result_lines.extend(numbered_lines)
-        print(f"[HWP 정리] 숫자 패턴 줄 {len(numbered_lines)}개 추가")
+        logger.debug("[HWP 정리] 숫자 패턴 줄 %d개 추가", len(numbered_lines))
     
-    # 고우선순위
-    if high_priority_lines:
-        result_lines.extend(high_priority_lines)
-        print(f"[HWP 정리] 고우선순위 줄 {len(high_priority_lines)}개 추가")
-    
-    # 중우선순위
-    if medium_priority_lines:
-        result_lines.extend(medium_priority_lines)
-        print(f"[HWP 정리] 중우선순위 줄 {len(medium_priority_lines)}개 추가")
-    
-    # 저우선순위
-    if low_priority_lines:
-        result_lines.extend(low_priority_lines)
-        print(f"[HWP 정리] 저우선순위 줄 {len(low_priority_lines)}개 추가")
+    # 고 → 중 → 저우선순위
+    for tier, label in PRIORITY_LABELS.items():
+        if priority_lines[tier]:
+            result_lines.extend(priority_lines[tier])
+            logger.debug("[HWP 정리] %s 줄 %d개 추가", label, len(priority_lines[tier]))
     
     # 기타 (충분한 줄이 없으면 추가)
     if other_lines and len(result_lines) < 4:
         result_lines.extend(other_lines[:3])
-        print(f"[HWP 정리] 기타 줄 {len(other_lines[:3])}개 추가")
+        logger.debug("[HWP 정리] 기타 줄 %d개 추가", len(other_lines[:3]))
     
     result = '\n'.join(result_lines)
     
-    print(f"[HWP 정리] 최종 정리된 텍스트: {result[:300]}...")
-    print(f"[HWP 정리] 총 {len(result_lines)}개 줄 추출됨")
+    logger.debug("[HWP 정리] 최종 정리된 텍스트: %s", Preview(result, 300))
+    logger.info("[HWP 정리] 총 %d개 줄 추출됨", len(result_lines))
     
     return result
 
-def extract_text_from_file(file):
+def extract_text_from_file(file, clean_hwp=False):
     """
     다양한 파일 형식에서 텍스트를 추출합니다. (HWP 동적 특수기호 감지 추가)
+    clean_hwp=True이면 HWP 텍스트를 clean_hwp_text로 질문 위주로 정리합니다. (질문 파일용)
     """
-    filename = file.filename
+    filename = file.filename.lower()
     if filename.endswith('.pdf'):
         try:
-            with pdfplumber.open(file) as pdf:
-                text = ""
-                for page in pdf.pages:
-                    text += page.extract_text() or ''
-                return text
+            return extract_pdf_text(file.read())
         except Exception as e:
             return f"PDF 파일 처리 중 오류: {e}"
     
-    elif filename.endswith('.hwp'):
-        # HWP 파일 지원은 현재 제한적입니다
-        return "HWP 파일은 현재 지원하지 않습니다. PDF나 TXT 파일을 사용해주세요."
+    elif filename.endswith(('.hwp', '.hwpx')):
+        try:
+            raw_text = extract_hwp_text(file.stream, filename)
+        except Exception as e:
+            return f"HWP 파일 처리 중 오류: {e}"
+        return clean_hwp_text(raw_text) if clean_hwp else raw_text
     else:
         try:
             return file.read().decode('utf-8')
         except Exception as e:
             return f"일반 텍스트 파일 처리 중 오류: {e}"
 
-def preprocess_image_for_ocr(image):
+# OCR 전처리 이진화 기준: 검은(텍스트) 픽셀 비율이 이 범위면 적절한 것으로 판단
+TEXT_RATIO_RANGE = (0.05, 0.3)
+TEXT_RATIO_TARGET = 0.15
+
+# 노이즈 제거 기준: 면적이 (글자 높이 × NOISE_CHAR_FRACTION)² 미만인 검은 연결 요소 (최소 NOISE_MIN_AREA)
+# 글자 높이는 리사이즈 후 이미지에서 추정하므로 확대/축소 배율이 함께 반영됨
+NOISE_MIN_AREA = 2
+NOISE_CHAR_FRACTION = 0.15
+# 글자 높이를 추정할 수 없을 때 사용하는 값
+DEFAULT_CHAR_HEIGHT = 20
+
+
+def _dark_ratio(binary):
+    """이진 이미지의 검은 픽셀 비율 (배열 비교 없이 countNonZero 한 번)"""
+    return 1.0 - cv2.countNonZero(binary) / binary.size
+
+
+def estimate_char_height(stats, image_height):
+    """연결 요소 통계에서 글자 높이 추정 - 작은 요소(노이즈, 문장부호)와 큰 요소(선, 박스)를 제외한 높이의 중앙값"""
+    heights = stats[1:, cv2.CC_STAT_HEIGHT]
+    heights = heights[(heights >= 4) & (heights < image_height // 4)]
+    return int(np.median(heights)) if len(heights) else DEFAULT_CHAR_HEIGHT
+
+
+def noise_min_area(char_height):
+    return max(NOISE_MIN_AREA, int((char_height * NOISE_CHAR_FRACTION) ** 2))
+
+
+def _remove_small_components(binary, min_area=None):
+    """
+    글자와 떨어져 있는 작은 검은 연결 요소를 한 번에 흰색으로 칠함 (in-place)
+    - min_area를 주지 않으면 글자 높이에 비례해 결정
+    - 글자 옆(가로 글자 높이, 세로 글자 높이 절반 이내)의 작은 요소는 마침표/쉼표로 보고 남김
+    """
+    inverted = cv2.bitwise_not(binary)
+    _, labels, stats, centroids = cv2.connectedComponentsWithStatsWithAlgorithm(
+        inverted, 8, cv2.CV_32S, cv2.CCL_GRANA)
+    char_height = estimate_char_height(stats, binary.shape[0])
+    if min_area is None:
+        min_area = noise_min_area(char_height)
+
+    areas = stats[:, cv2.CC_STAT_AREA]
+    small = np.flatnonzero(areas[1:] < min_area) + 1  # 0번은 배경
+    if len(small) == 0:
+        return 0
+
+    # 글자(작지 않은 요소) 주변 영역에 중심이 들어가는 작은 요소는 제외
+    is_glyph = areas >= min_area
+    is_glyph[0] = False
+    glyphs = is_glyph[labels].astype(np.uint8)
+    near_glyph = cv2.dilate(glyphs, cv2.getStructuringElement(
+        cv2.MORPH_RECT, (2 * char_height + 1, char_height + 1)))
+    cx = np.clip(centroids[small, 0].round().astype(int), 0, binary.shape[1] - 1)
+    cy = np.clip(centroids[small, 1].round().astype(int), 0, binary.shape[0] - 1)
+    small = small[near_glyph[cy, cx] == 0]
+    if len(small) == 0:
+        return 0
+
+    # 레이블 → 제거 여부 표를 만들어 한 번에 칠함 (요소 크기/개수와 무관하게 이미지 크기만큼만 메모리 사용)
+    remove = np.zeros(len(areas), dtype=bool)
+    remove[small] = True
+    binary[remove[labels]] = 255
+    return len(small)
+
+
+def preprocess_image_for_ocr(image, timings=None):
     """
     OCR 정확도를 높이기 위한 고급 이미지 전처리
+    timings에 dict를 넘기면 단계별 소요 시간(ms)을 기록합니다.
     """
     try:
-        print("[이미지 전처리] 시작...")
-        
-        # PIL Image를 numpy array로 변환
-        img_array = np.array(image)
-        original_size = img_array.shape
-        print(f"[이미지 전처리] 원본 크기: {original_size}")
-        
-        # 그레이스케일로 변환
-        if len(img_array.shape) == 3:
-            gray = cv2.cvtColor(img_array, cv2.COLOR_RGB2GRAY)
-        else:
-            gray = img_array
+        logger.debug("[이미지 전처리] 시작...")
+        stage_times = timings if timings is not None else {}
+        started = last = time.perf_counter()
+
+        def mark(stage):
+            nonlocal last
+            now = time.perf_counter()
+            stage_times[stage] = round((now - last) * 1000, 2)
+            last = now
+
+        # PIL Image를 numpy array로 변환 (그레이스케일 변환은 PIL에서 바로 수행해 RGB 복사본을 만들지 않음)
+        gray = np.asarray(image if image.mode == 'L' else image.convert('L'))
+        logger.debug("[이미지 전처리] 원본 크기: %s", gray.shape)
+        mark('grayscale')
         
         # 1. 이미지 크기 조정 (너무 작으면 확대, 너무 크면 축소)
         height, width = gray.shape
@@ -298,69 +402,53 @@ def preprocess_image_for_ocr(image):
             # 작은 이미지는 2-3배 확대
             scale_factor = 3 if min(height, width) < 300 else 2
             gray = cv2.resize(gray, None, fx=scale_factor, fy=scale_factor, interpolation=cv2.INTER_CUBIC)
-            print(f"[이미지 전처리] {scale_factor}배 확대: {gray.shape}")
+            logger.debug("[이미지 전처리] %d배 확대: %s", scale_factor, gray.shape)
         elif height > 2000 or width > 2000:
             # 너무 큰 이미지는 축소
-            scale_factor = 0.5
-            gray = cv2.resize(gray, None, fx=scale_factor, fy=scale_factor, interpolation=cv2.INTER_AREA)
-            print(f"[이미지 전처리] 0.5배 축소: {gray.shape}")
-        
-        # 2. 가우시안 블러로 노이즈 제거
-        denoised = cv2.GaussianBlur(gray, (1, 1), 0)
-        
-        # 3. 대비 향상 (CLAHE)
-        clahe = cv2.createCLAHE(clipLimit=3.0, tileGridSize=(8,8))
-        enhanced = clahe.apply(denoised)
-        
-        # 4. 여러 임계값 방법 시도
-        # Otsu's thresholding
-        _, binary1 = cv2.threshold(enhanced, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
-        
-        # Adaptive thresholding
-        binary2 = cv2.adaptiveThreshold(enhanced, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, 
-                                       cv2.THRESH_BINARY, 11, 2)
+            gray = cv2.resize(gray, None, fx=0.5, fy=0.5, interpolation=cv2.INTER_AREA)
+            logger.debug("[이미지 전처리] 0.5배 축소: %s", gray.shape)
+        mark('resize')
         
-        # 가장 좋은 결과 선택 (텍스트 영역 비율로 판단)
-        text_ratio1 = np.sum(binary1 == 0) / binary1.size  # 검은색 픽셀 비율
-        text_ratio2 = np.sum(binary2 == 0) / binary2.size
+        # 2. 대비 향상 (CLAHE) - 결과 버퍼를 미리 할당해 재사용
+        enhanced = np.empty_like(gray)
+        cv2.createCLAHE(clipLimit=3.0, tileGridSize=(8, 8)).apply(gray, enhanced)
+        mark('clahe')
         
-        # 적절한 텍스트 비율 (5-30%)인 것 선택
-        if 0.05 <= text_ratio1 <= 0.3:
-            binary = binary1
-            method = "Otsu"
-        elif 0.05 <= text_ratio2 <= 0.3:
-            binary = binary2
-            method = "Adaptive"
-        else:
-            # 둘 다 적절하지 않으면 원본에 가까운 것 선택
-            if abs(text_ratio1 - 0.15) < abs(text_ratio2 - 0.15):
-                binary = binary1
-                method = "Otsu (fallback)"
+        # 3. 이진화 - Otsu 결과가 적절하면 적응형 이진화는 계산하지 않음
+        binary = np.empty_like(enhanced)
+        cv2.threshold(enhanced, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU, dst=binary)
+        ratio = _dark_ratio(binary)
+        method = "Otsu"
+        low, high = TEXT_RATIO_RANGE
+        if not low <= ratio <= high:
+            # Otsu 결과는 더 이상 필요 없으므로 enhanced 버퍼에 적응형 결과를 덮어씀
+            cv2.adaptiveThreshold(enhanced, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C,
+                                  cv2.THRESH_BINARY, 11, 2, dst=enhanced)
+            adaptive_ratio = _dark_ratio(enhanced)
+            if low <= adaptive_ratio <= high:
+                binary, ratio, method = enhanced, adaptive_ratio, "Adaptive"
+            elif abs(adaptive_ratio - TEXT_RATIO_TARGET) <= abs(ratio - TEXT_RATIO_TARGET):
+                binary, ratio, method = enhanced, adaptive_ratio, "Adaptive (fallback)"
             else:
-                binary = binary2
-                method = "Adaptive (fallback)"
-        
-        print(f"[이미지 전처리] 이진화 방법: {method}, 텍스트 비율: {np.sum(binary == 0) / binary.size:.3f}")
+                method = "Otsu (fallback)"
+        mark('threshold')
         
-        # 5. 모폴로지 연산으로 텍스트 정리
-        kernel = np.ones((1,1), np.uint8)
-        binary = cv2.morphologyEx(binary, cv2.MORPH_CLOSE, kernel)
+        logger.debug("[이미지 전처리] 이진화 방법: %s, 텍스트 비율: %.3f", method, ratio)
         
-        # 6. 작은 노이즈 제거
-        contours, _ = cv2.findContours(binary, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-        min_area = 10  # 최소 영역 크기
-        for contour in contours:
-            if cv2.contourArea(contour) < min_area:
-                cv2.drawContours(binary, [contour], -1, 255, -1)
+        # 4. 작은 노이즈 제거 (연결 요소 한 번에 필터링)
+        removed = _remove_small_components(binary)
+        mark('denoise')
         
         # numpy array를 PIL Image로 다시 변환
         processed_image = Image.fromarray(binary)
+        mark('to_image')
+        stage_times['total'] = round((time.perf_counter() - started) * 1000, 2)
         
-        print("[이미지 전처리] 완료")
+        logger.info("[이미지 전처리] 완료 (노이즈 %d개 제거, 단계별 ms: %s)", removed, stage_times)
         return processed_image
         
     except Exception as e:
-        print(f"[이미지 전처리] 오류: {e}")
+        logger.warning("[이미지 전처리] 오류: %s", e)
         return image  # 전처리 실패시 원본 반환
 
 def is_valid_question(text):
@@ -371,64 +459,49 @@ def is_valid_question(text):
         return False
     
     # 너무 많은 특수문자가 포함된 경우
-    special_char_ratio = len(re.findall(r'[^가-힣a-zA-Z0-9\s.,?!()\[\]/-]', text)) / len(text)
+    special_char_ratio = len(patterns.SPECIAL_CHAR.findall(text)) / len(text)
     if special_char_ratio > 0.3:  # 30% 이상이 특수문자면 무효
         return False
     
     # 연속된 특수문자가 많은 경우
-    if re.search(r'[^가-힣a-zA-Z0-9\s]{5,}', text):
+    if patterns.SPECIAL_RUN.search(text):
         return False
     
     # 한글이나 영어가 전혀 없는 경우
-    if not re.search(r'[가-힣a-zA-Z]', text):
+    if not patterns.LETTER.search(text):
         return False
     
-    # 의미있는 단어가 있는지 체크
-    meaningful_words = ['소개', '경험', '과정', '어려움', '극복', '강점', '지원', '동기', '포부', '계획', '목표']
-    if any(word in text for word in meaningful_words):
-        return True
-    
-    # 질문 형태인지 체크
-    question_patterns = ['해주세요', '말해주세요', '설명해주세요', '작성해주세요', '어떻게', '무엇', '왜', '언제']
-    if any(pattern in text for pattern in question_patterns):
+    # 의미있는 단어가 있거나 질문 형태인지 체크
+    if VALID_QUESTION_KEYWORDS.contains_any(text):
         return True
     
     # 기본적으로 한글 비율이 높으면 유효로 간주
-    korean_ratio = len(re.findall(r'[가-힣]', text)) / len(text)
+    korean_ratio = len(patterns.HANGUL.findall(text)) / len(text)
     return korean_ratio > 0.3
 
 def basic_question_parsing_with_keywords(text):
     """
     간소화된 키워드 기반 질문 추출 (Vision API 실패 시 대체용)
     """
-    print("[키워드 기반 파싱] 간소화된 버전 시작...")
-    print(f"[키워드 기반 파싱] 입력 텍스트: {text[:200]}...")
+    logger.debug("[키워드 기반 파싱] 간소화된 버전 시작...")
+    logger.debug("[키워드 기반 파싱] 입력 텍스트: %s", Preview(text, 200))
     
     # OCR 오류가 많은 텍스트인지 확인
     if len(text) > 50:
         valid_chars = len([c for c in text if c.isalnum() or c.isspace() or '\uac00' <= c <= '\ud7a3'])
         total_chars = len(text)
         if valid_chars / total_chars < 0.5:  # 절반 이상이 이상한 문자
-            print("[키워드 기반 파싱] OCR 오류가 많은 텍스트로 판단, 기본 질문 사용")
+            logger.info("[키워드 기반 파싱] OCR 오류가 많은 텍스트로 판단, 기본 질문 사용")
             return [
                 {'number': '1', 'content': '성장과정에 대해 설명해주세요'},
                 {'number': '2', 'content': '지원동기를 말씀해주세요'},
                 {'number': '3', 'content': '입사 후 포부를 설명해주세요'}
             ]
     
-    # 핵심 키워드만 유지 (하드코딩 최소화)
-    basic_keywords = {
-        '성장과정': '성장과정에 대해 설명해주세요',
-        '지원동기': '지원동기를 말씀해주세요', 
-        '장단점': '성격의 장단점을 설명해주세요',
-        '포부': '입사 후 포부를 말씀해주세요',
-        '강점': '본인의 강점을 설명해주세요'
-    }
-    
     questions = []
     
     # 1. 숫자 패턴 우선 검색 (1. 2. 3. 형태)
-    number_patterns = re.findall(r'(\d+)\.\s*([^0-9\n]{3,50})', text)
+    number_patterns = patterns.NUMBERED_ITEM.findall(text)
     for num, content in number_patterns:
         content = content.strip()
         if len(content) > 3:
@@ -436,29 +509,29 @@ def basic_question_parsing_with_keywords(text):
                 'number': str(len(questions) + 1),
                 'content': f"{content}에 대해 설명해주세요" if not content.endswith(('세요', '까요', '니까')) else content
             })
-            print(f"[키워드 기반 파싱] 숫자 패턴으로 질문 생성: {content}")
+            logger.debug("[키워드 기반 파싱] 숫자 패턴으로 질문 생성: %s", content, extra=SAMPLED)
     
     # 2. ■ 패턴 검색
     if len(questions) < 3:
-        square_patterns = re.findall(r'■\s*([^■\n]{3,50})', text)
+        square_patterns = patterns.SQUARE_ITEM.findall(text)
         for content in square_patterns:
             content = content.strip()
             questions.append({
                 'number': str(len(questions) + 1),
                 'content': f"{content}에 대해 설명해주세요" if not content.endswith(('세요', '까요', '니까')) else content
             })
-            print(f"[키워드 기반 파싱] ■ 패턴으로 질문 생성: {content}")
+            logger.debug("[키워드 기반 파싱] ■ 패턴으로 질문 생성: %s", content, extra=SAMPLED)
     
-    # 3. 기본 키워드 검색 (최소한만)
+    # 3. 기본 키워드 검색 (최소한만 - 우선순위가 가장 높은 키워드 하나)
     if len(questions) < 3:
-        for keyword, question in basic_keywords.items():
-            if keyword in text and len(questions) < 3:
-                questions.append({
-                    'number': str(len(questions) + 1),
-                    'content': question
-                })
-                print(f"[키워드 기반 파싱] '{keyword}' 키워드로 질문 생성")
-                break  # 하나씩만 추가
+        match = BASIC_QUESTION_KEYWORDS.classify(text)
+        if match:
+            keyword = match[0]
+            questions.append({
+                'number': str(len(questions) + 1),
+                'content': BASIC_QUESTIONS[keyword]
+            })
+            logger.debug("[키워드 기반 파싱] '%s' 키워드로 질문 생성", keyword)
     
     # 4. 기본값 (최소한의 질문 보장)
     if not questions:
@@ -467,10 +540,48 @@ def basic_question_parsing_with_keywords(text):
             {'number': '2', 'content': '지원동기를 말씀해주세요'},
             {'number': '3', 'content': '입사 후 포부를 설명해주세요'}
         ]
-        print("[키워드 기반 파싱] 기본 질문 사용")
+        logger.info("[키워드 기반 파싱] 기본 질문 사용")
     
-    print(f"[키워드 기반 파싱] 총 {len(questions)}개 질문 추출")
-    for q in questions:
-        print(f"  - 질문 {q['number']}: {q['content']}")
+    logger.info("[키워드 기반 파싱] 총 %d개 질문 추출", len(questions))
+    if logger.isEnabledFor(logging.DEBUG):
+        for q in questions:
+            logger.debug("  - 질문 %s: %s", q['number'], q['content'], extra=SAMPLED)
     
     return questions
+
+
+# ----------------------------------------------------
+# 전처리 벤치마크: python self_util.py <스크린샷 이미지 ...> [--repeat N]
+# 이미지별 전처리 단계 소요 시간(ms, 반복 중 최소값)을 출력합니다.
+# ----------------------------------------------------
+def _benchmark_preprocess(paths, repeat=5):
+    # 측정 중 전처리 로그 출력 제외
+    logging.disable(logging.INFO)
+
+    stages = ('grayscale', 'resize', 'clahe', 'threshold', 'denoise', 'to_image', 'total')
+    print(f"{'이미지':<30}" + ''.join(f'{stage:>11}' for stage in stages))
+    for path in paths:
+        image = Image.open(path)
+        image.load()
+        best = {}
+        for _ in range(repeat):
+            timings = {}
+            preprocess_image_for_ocr(image, timings=timings)
+            for stage, value in timings.items():
+                best[stage] = min(best.get(stage, value), value)
+        print(f"{path[-28:]:<30}" + ''.join(f'{best.get(stage, 0):>11.2f}' for stage in stages))
+
+
+if __name__ == '__main__':
+    import sys
+
+    args = sys.argv[1:]
+    repeat = 5
+    if '--repeat' in args:
+        index = args.index('--repeat')
+        repeat = int(args[index + 1])
+        del args[index:index + 2]
+    if not args:
+        print('사용법: python self_util.py <이미지 파일 ...> [--repeat N]')
+        sys.exit(1)
+    _benchmark_preprocess(args, repeat)
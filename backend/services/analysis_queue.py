@@ -0,0 +1,357 @@
+import os
+import json
+import time
+import uuid
+import queue
+import atexit
+import signal
+import threading
+import multiprocessing
+from collections import deque
+from typing import Dict, Optional
+
+from log_util import get_logger
+
+logger = get_logger(__name__)
+
+# 작업 상태
+QUEUED = 'queued'
+RUNNING = 'running'
+COMPLETED = 'completed'
+FAILED = 'failed'
+CANCELLED = 'cancelled'
+FINISHED_STATES = {COMPLETED, FAILED, CANCELLED}
+
+# 취소 요청 후 이 시간(초) 안에 종료하지 않으면 프로세스 강제 종료
+CANCEL_GRACE_SEC = 10
+
+# 진행률은 이 간격(%) 이상 변할 때만 전달/저장
+PROGRESS_STEP = 1.0
+
+# 끝난 작업은 이 시간(초)이 지나면 목록과 jobs_dir에서 제거
+FINISHED_JOB_TTL = 24 * 60 * 60
+
+
+class JobCancelled(Exception):
+    """작업 취소 요청으로 분석을 중단할 때 사용"""
+    pass
+
+
+def _start_process_group():
+    """
+    작업 프로세스를 새 프로세스 그룹의 리더로 만듦 (POSIX)
+    → 강제 종료 시 그룹 전체에 신호를 보내 analyze_video가 띄운 프로세스 풀 워커까지 함께 종료
+    """
+    if hasattr(os, 'setpgrp'):
+        os.setpgrp()
+
+
+def _kill_process_tree(process):
+    """작업 프로세스와 그 자식 프로세스(같은 프로세스 그룹) 강제 종료"""
+    if hasattr(os, 'killpg'):
+        try:
+            os.killpg(process.pid, signal.SIGKILL)
+            return
+        except (ProcessLookupError, PermissionError):
+            pass
+    process.kill()
+
+
+def _exit_on_sigterm(signum, frame):
+    """SIGTERM을 SystemExit로 바꿔 atexit에 등록된 정리 함수(shutdown)가 실행되도록 함"""
+    raise SystemExit(128 + signum)
+
+
+def _install_sigterm_handler():
+    """
+    SIGTERM 기본 동작(즉시 종료)은 atexit을 건너뛰므로, 다른 핸들러가 없을 때만 _exit_on_sigterm으로 교체
+    (gunicorn 등 서버가 이미 핸들러를 설치했다면 그 종료 절차를 그대로 따름)
+    """
+    if threading.current_thread() is not threading.main_thread():
+        return
+    if signal.getsignal(signal.SIGTERM) == signal.SIG_DFL:
+        signal.signal(signal.SIGTERM, _exit_on_sigterm)
+
+
+def _job_entry(runner, *args):
+    """작업 프로세스 진입점 - 프로세스 그룹을 만든 뒤 runner 실행"""
+    _start_process_group()
+    runner(*args)
+
+
+def _run_job(job_id: str, video_path: str, messages, cancel_event):
+    """워커 프로세스에서 비디오 분석 실행 - 결과/진행률은 메시지 큐로 전달"""
+    from interview import analyze_video
+
+    last_progress = [-PROGRESS_STEP]
+
+    def on_progress(fraction):
+        if cancel_event.is_set():
+            raise JobCancelled()
+        percent = round(fraction * 100, 1)
+        if percent - last_progress[0] >= PROGRESS_STEP:
+            last_progress[0] = percent
+            messages.put((job_id, 'progress', percent))
+
+    try:
+        result = analyze_video(video_path, progress_callback=on_progress)
+        messages.put((job_id, COMPLETED, result))
+    except JobCancelled:
+        messages.put((job_id, CANCELLED, None))
+    except Exception as e:
+        messages.put((job_id, FAILED, str(e)))
+
+
+class AnalysisJobQueue:
+    """
+    외부 서비스 없이 동작하는 로컬 비디오 분석 작업 큐
+    - 작업마다 별도 프로세스에서 분석 (동시 실행 수 제한)
+    - 진행률/결과는 jobs_dir에 JSON으로 저장되어 서버 재시작 후에도 조회 가능
+    - 끝난 작업은 finished_ttl(초)이 지나면 제거
+    - 작업 프로세스는 별도 프로세스 그룹이라 서버와 함께 종료되지 않으므로, 서버 종료 시(atexit/SIGTERM)
+      shutdown()으로 실행 중인 작업의 프로세스 그룹을 강제 종료
+      (SIGKILL로 서버가 죽으면 정리되지 않으므로 남은 analysis-* 프로세스는 운영자가 직접 종료해야 함)
+    runner는 작업 프로세스에서 실행할 함수 (기본 _run_job, spawn으로 전달되므로 모듈 최상위 함수여야 함)
+    """
+
+    def __init__(self, jobs_dir: str, max_running: int = 1, max_queued: int = 20,
+                 finished_ttl: float = FINISHED_JOB_TTL, runner=_run_job):
+        self.jobs_dir = jobs_dir
+        self.max_running = max_running
+        self.max_queued = max_queued
+        self.finished_ttl = finished_ttl
+        self.runner = runner
+        os.makedirs(self.jobs_dir, exist_ok=True)
+
+        self._context = multiprocessing.get_context('spawn')
+        self._messages = None
+        self._jobs: Dict[str, Dict] = {}
+        self._pending = deque()
+        self._running = {}
+        self._lock = threading.Lock()
+        self._dispatcher = None
+        self._closed = False
+
+        # spawn으로 시작된 자식 프로세스가 이 모듈을 다시 import해 큐를 만들더라도
+        # 부모가 실행 중인 작업을 '서버 재시작으로 중단'으로 덮어쓰지 않도록 최상위 프로세스에서만 로드
+        if multiprocessing.parent_process() is None:
+            self._load_jobs()
+            atexit.register(self.shutdown)
+            _install_sigterm_handler()
+
+    def _job_path(self, job_id: str) -> str:
+        return os.path.join(self.jobs_dir, f'{job_id}.json')
+
+    def _save(self, job: Dict):
+        """작업 상태를 임시 파일에 쓴 뒤 교체 (읽는 쪽이 깨진 JSON을 보지 않도록)"""
+        job['updated_at'] = time.time()
+        path = self._job_path(job['job_id'])
+        tmp_path = f'{path}.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(job, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+    def _load_jobs(self):
+        """저장된 작업 로드 - 이전 프로세스에서 끝나지 않은 작업은 중단 처리"""
+        for filename in os.listdir(self.jobs_dir):
+            if not filename.endswith('.json'):
+                continue
+            try:
+                with open(os.path.join(self.jobs_dir, filename), 'r', encoding='utf-8') as f:
+                    job = json.load(f)
+            except (OSError, ValueError) as e:
+                logger.warning("[분석 작업] 작업 파일 로드 실패 %s: %s", filename, e)
+                continue
+
+            if job.get('status') not in FINISHED_STATES:
+                job['status'] = FAILED
+                job['error'] = '서버 재시작으로 분석이 중단되었습니다.'
+                job['finished_at'] = time.time()
+                self._save(job)
+            self._jobs[job['job_id']] = job
+        self._evict_finished()
+
+    def _evict_finished(self):
+        """finished_ttl이 지난 끝난 작업을 메모리와 jobs_dir에서 제거"""
+        if self.finished_ttl is None:
+            return
+        cutoff = time.time() - self.finished_ttl
+        for job_id, job in list(self._jobs.items()):
+            if job['status'] in FINISHED_STATES and job.get('finished_at', job.get('updated_at', 0)) < cutoff:
+                del self._jobs[job_id]
+                try:
+                    os.remove(self._job_path(job_id))
+                except FileNotFoundError:
+                    pass
+
+    def _ensure_dispatcher(self):
+        if self._dispatcher and self._dispatcher.is_alive():
+            return
+        if self._messages is None:
+            self._messages = self._context.Queue()
+        self._dispatcher = threading.Thread(target=self._dispatch_loop, name='analysis-dispatcher', daemon=True)
+        self._dispatcher.start()
+
+    def submit(self, video_path: str, filename: Optional[str] = None) -> Dict:
+        """분석 작업 등록 후 작업 정보 반환"""
+        with self._lock:
+            if len(self._pending) >= self.max_queued:
+                raise RuntimeError('대기 중인 분석 작업이 너무 많습니다. 잠시 후 다시 시도해주세요.')
+
+            job = {
+                'job_id': uuid.uuid4().hex,
+                'status': QUEUED,
+                'progress': 0.0,
+                'filename': filename or os.path.basename(video_path),
+                'video_path': video_path,
+                'result': None,
+                'error': None,
+                'created_at': time.time()
+            }
+            self._jobs[job['job_id']] = job
+            self._pending.append(job['job_id'])
+            self._save(job)
+            self._ensure_dispatcher()
+            return self._public(job)
+
+    def status(self, job_id: str) -> Optional[Dict]:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return None
+            public = self._public(job)
+            if job['status'] == QUEUED:
+                public['queue_position'] = list(self._pending).index(job_id) + 1
+            return public
+
+    def cancel(self, job_id: str) -> Optional[Dict]:
+        """대기 중이면 즉시 취소, 실행 중이면 워커에 취소 요청"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return None
+
+            if job['status'] == QUEUED:
+                self._pending.remove(job_id)
+                job['status'] = CANCELLED
+                job['finished_at'] = time.time()
+                self._save(job)
+            elif job['status'] == RUNNING and job_id in self._running:
+                process, cancel_event, _ = self._running[job_id]
+                cancel_event.set()
+                self._running[job_id] = (process, cancel_event, time.time())
+                job['cancel_requested'] = True
+                self._save(job)
+            return self._public(job)
+
+    def shutdown(self, lock_timeout: float = 5.0):
+        """
+        실행 중인 작업의 프로세스 그룹(ffmpeg, 프로세스 풀 워커 포함)을 강제 종료하고 실패로 기록
+        서버 종료 시 atexit으로 호출되며, 여러 번 호출해도 안전함
+        """
+        # 종료 시점에 다른 스레드가 잠금을 쥔 채 멈춰 있어도 프로세스 정리는 진행
+        locked = self._lock.acquire(timeout=lock_timeout)
+        try:
+            self._closed = True
+            for job_id, (process, _, _) in list(self._running.items()):
+                if process.is_alive():
+                    _kill_process_tree(process)
+                process.join(timeout=lock_timeout)
+                del self._running[job_id]
+                job = self._jobs[job_id]
+                if job['status'] not in FINISHED_STATES:
+                    job['status'] = FAILED
+                    job['error'] = '서버 종료로 분석이 중단되었습니다.'
+                    job['finished_at'] = time.time()
+                    self._save(job)
+        finally:
+            if locked:
+                self._lock.release()
+
+    def _public(self, job: Dict) -> Dict:
+        """API 응답용 작업 정보 (서버 내부 경로 제외)"""
+        return {key: value for key, value in job.items() if key != 'video_path'}
+
+    def _start_pending(self):
+        while not self._closed and self._pending and len(self._running) < self.max_running:
+            job_id = self._pending.popleft()
+            job = self._jobs[job_id]
+            cancel_event = self._context.Event()
+            process = self._context.Process(
+                target=_job_entry,
+                args=(self.runner, job_id, job['video_path'], self._messages, cancel_event),
+                name=f'analysis-{job_id[:8]}'
+            )
+            process.start()
+            self._running[job_id] = (process, cancel_event, None)
+            job['status'] = RUNNING
+            job['started_at'] = time.time()
+            self._save(job)
+
+    def _handle_message(self, job_id: str, kind: str, payload):
+        job = self._jobs.get(job_id)
+        if job is None or job['status'] in FINISHED_STATES:
+            return
+        if kind == 'progress':
+            job['progress'] = payload
+        else:
+            job['status'] = kind
+            if kind == COMPLETED:
+                job['progress'] = 100.0
+                job['result'] = payload
+            elif kind == FAILED:
+                job['error'] = payload
+            job['finished_at'] = time.time()
+        self._save(job)
+
+    def _reap_processes(self):
+        """종료된 프로세스 정리, 취소 유예 시간이 지난 프로세스 강제 종료"""
+        for job_id, (process, cancel_event, cancel_time) in list(self._running.items()):
+            if process.is_alive():
+                if cancel_time and time.time() - cancel_time > CANCEL_GRACE_SEC:
+                    # terminate()만 하면 작업 프로세스가 띄운 프로세스 풀 워커가 고아로 남으므로 그룹 전체 종료
+                    _kill_process_tree(process)
+                continue
+
+            process.join()
+            del self._running[job_id]
+            job = self._jobs[job_id]
+            if job['status'] not in FINISHED_STATES:
+                # 종료 직전에 보낸 결과 메시지가 아직 큐에 남아 있을 수 있음
+                self._drain_messages(timeout=0.5)
+            if job['status'] not in FINISHED_STATES:
+                if cancel_event.is_set():
+                    job['status'] = CANCELLED
+                else:
+                    job['status'] = FAILED
+                    job['error'] = f'분석 프로세스가 비정상 종료되었습니다. (exit code {process.exitcode})'
+                job['finished_at'] = time.time()
+                self._save(job)
+
+    def _drain_messages(self, timeout=None):
+        """메시지 큐에 쌓인 진행률/결과 반영 (timeout 동안 첫 메시지 대기)"""
+        try:
+            message = self._messages.get(timeout=timeout) if timeout else self._messages.get_nowait()
+        except queue.Empty:
+            return
+        while True:
+            self._handle_message(*message)
+            try:
+                message = self._messages.get_nowait()
+            except queue.Empty:
+                return
+
+    def _dispatch_loop(self):
+        while True:
+            try:
+                message = self._messages.get(timeout=0.5)
+            except queue.Empty:
+                message = None
+
+            with self._lock:
+                if message is not None:
+                    self._handle_message(*message)
+                    self._drain_messages()
+                self._reap_processes()
+                self._start_pending()
+                self._evict_finished()
@@ -1,22 +1,52 @@
-import uuid
 import random
+import asyncio
 import re
 import os
-from typing import List, Dict
+import uuid
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Optional
 from anthropic import Anthropic
 from dotenv import load_dotenv
 
+from config import (INTERVIEW_SESSION_TTL, INTERVIEW_SESSION_MAX, INTERVIEW_SESSION_DIR, INTERVIEW_ANSWER_MAX_CHARS,
+                    INTERVIEW_EVAL_CONCURRENCY, INTERVIEW_EVAL_RESULT_MAX, INTERVIEW_EVAL_MAX_PENDING)
+from log_util import get_logger
+from session_store import SessionStore
+from state_backend import create_backend
+
+logger = get_logger(__name__)
+
+_EVALUATION_ID_PATTERN = re.compile(r'^[0-9a-f]{32}$')
+
 load_dotenv()
 
 class InterviewService:
     def __init__(self):
-        self.sessions = {}
+        # TTL/LRU로 크기가 제한된 세션 저장소 (답변/점수/피드백을 서버에서 누적)
+        self.sessions = SessionStore(
+            max_sessions=INTERVIEW_SESSION_MAX,
+            ttl=INTERVIEW_SESSION_TTL,
+            persist_dir=INTERVIEW_SESSION_DIR
+        )
+        # 선(先) 응답 모드: 백그라운드 Claude 평가 결과 (평가 id → 상태/점수/피드백) - 어느 워커에서든 조회 가능
+        self.evaluations = create_backend(
+            'interview_evaluations',
+            max_entries=INTERVIEW_EVAL_RESULT_MAX,
+            ttl=INTERVIEW_SESSION_TTL
+        )
+        self._refine_executor = ThreadPoolExecutor(
+            max_workers=max(1, INTERVIEW_EVAL_CONCURRENCY),
+            thread_name_prefix='interview-eval'
+        )
+        # 실행기 작업 큐는 크기 제한이 없으므로 대기/실행 중인 백그라운드 평가 수를 따로 제한
+        self._refine_slots = threading.BoundedSemaphore(max(1, INTERVIEW_EVAL_MAX_PENDING))
         try:
             self.client = Anthropic(api_key=os.getenv("ANTHROPIC_API_KEY"))
             self.use_ai = True
-            print("Claude API 연결 성공 (면접 서비스)")
+            logger.info("Claude API 연결 성공 (면접 서비스)")
         except Exception as e:
-            print(f"Claude API 연결 실패: {e}")
+            logger.warning("Claude API 연결 실패: %s", e)
             self.use_ai = False
         
         self.difficulty_time_limits = {
@@ -78,17 +108,31 @@ class InterviewService:
         return structured_questions
     
     def create_session(self, questions: List[Dict]) -> str:
-        session_id = str(uuid.uuid4())
-        self.sessions[session_id] = {
-            "questions": questions,
-            "current_question": 0,
-            "answers": [],
-            "scores": [],
-            "feedback": []
-        }
-        return session_id
+        return self.sessions.create(questions)
     
-    async def evaluate_answer(self, question: str, answer: str, time_taken: int, max_time: int) -> Dict:
+    def record_answer(self, session_id: str, question: str, answer: str, evaluation: Dict,
+                      question_index: Optional[int] = None) -> Optional[int]:
+        """평가 결과를 세션에 기록 - 기록한 질문 위치 (세션이 없거나 만료되면 None)"""
+        if not session_id:
+            return None
+        return self.sessions.record_answer(
+            session_id,
+            (answer or '')[:INTERVIEW_ANSWER_MAX_CHARS],
+            evaluation["score"],
+            evaluation["feedback"],
+            question_text=question,
+            index=question_index
+        )
+    
+    def get_report_data(self, session_id: str) -> Optional[Dict]:
+        """세션에 누적된 리포트용 데이터 (세션이 없거나 답변이 없으면 None)"""
+        session = self.sessions.get(session_id)
+        if session is None or not session.answered:
+            return None
+        return session.report_data()
+    
+    def _evaluate_with_claude(self, question: str, answer: str, time_taken: int, max_time: int) -> Optional[Dict]:
+        """Claude 평가 (동기 호출) - 실패하거나 응답을 해석할 수 없으면 None"""
         if self.use_ai:
             try:
                 response = self.client.messages.create(
@@ -136,11 +180,118 @@ class InterviewService:
                     pass
                     
             except Exception as e:
-                print(f"Claude 평가 실패: {e}")
+                logger.warning("Claude 평가 실패: %s", e)
+        
+        return None
+    
+    async def evaluate_answer(self, question: str, answer: str, time_taken: int, max_time: int) -> Dict:
+        # Claude 호출은 스레드에서 실행 (여러 답변을 동시에 평가할 때 이벤트 루프를 막지 않음)
+        evaluation = await asyncio.to_thread(self._evaluate_with_claude, question, answer, time_taken, max_time)
+        if evaluation is not None:
+            return evaluation
         
         # AI 실패시 스마트 평가 사용
         return self._get_smart_evaluation(question, answer, time_taken, max_time)
     
+    async def evaluate_answers(self, items: List[Dict], max_concurrency: int = INTERVIEW_EVAL_CONCURRENCY) -> List[Dict]:
+        """
+        여러 답변을 동시에 평가 (동시 Claude 호출은 max_concurrency개까지)
+        items: [{"question", "answer", "time_taken", "max_time"}, ...] - 결과는 같은 순서의 {"score", "feedback"} 목록
+        """
+        semaphore = asyncio.Semaphore(max(1, max_concurrency))
+        
+        async def evaluate(item):
+            async with semaphore:
+                return await self.evaluate_answer(
+                    item['question'],
+                    item['answer'],
+                    item['time_taken'],
+                    item['max_time']
+                )
+        
+        return await asyncio.gather(*(evaluate(item) for item in items))
+    
+    def evaluate_answer_speculative(self, question: str, answer: str, time_taken: int, max_time: int,
+                                    session_id: Optional[str] = None, question_index: Optional[int] = None) -> Dict:
+        """
+        규칙 기반 평가를 즉시 반환하고 Claude 평가는 백그라운드에서 실행
+        - 반환: {"score", "feedback", "status", "evaluation_id", "question_index"}
+          status는 'pending'(Claude 평가 진행 중) 또는 'done'(AI 미사용/밀린 평가가 INTERVIEW_EVAL_MAX_PENDING건 이상 - 규칙 기반 결과가 최종)
+        - Claude 평가가 끝나면 get_evaluation(evaluation_id)로 갱신된 결과를 조회할 수 있고 세션 기록도 갱신됨
+        """
+        evaluation = self._get_smart_evaluation(question, answer, time_taken, max_time)
+        question_index = self.record_answer(session_id, question, answer, evaluation, question_index)
+        
+        if not self.use_ai:
+            return {**evaluation, "status": "done", "evaluation_id": None, "question_index": question_index}
+        
+        if not self._refine_slots.acquire(blocking=False):
+            # 밀린 백그라운드 평가가 너무 많으면 규칙 기반 결과를 최종 결과로 반환
+            logger.warning("백그라운드 평가 대기 %d건 초과, 규칙 기반 결과로 확정", INTERVIEW_EVAL_MAX_PENDING)
+            return {**evaluation, "status": "done", "evaluation_id": None, "question_index": question_index}
+        
+        evaluation_id = uuid.uuid4().hex
+        try:
+            self.evaluations.set(evaluation_id, {**evaluation, "status": "pending", "refined": False})
+            self._refine_executor.submit(
+                self._refine_evaluation, evaluation_id, question, answer, time_taken, max_time,
+                session_id, question_index
+            )
+        except BaseException:
+            self._refine_slots.release()
+            raise
+        return {**evaluation, "status": "pending", "evaluation_id": evaluation_id, "question_index": question_index}
+    
+    def _refine_evaluation(self, evaluation_id: str, question: str, answer: str, time_taken: int, max_time: int,
+                           session_id: Optional[str], question_index: Optional[int]):
+        """백그라운드 Claude 평가 - 실패하면 규칙 기반 결과를 최종 결과로 확정"""
+        try:
+            evaluation = self._evaluate_with_claude(question, answer, time_taken, max_time)
+        except Exception:
+            logger.exception("백그라운드 평가 실패")
+            evaluation = None
+        finally:
+            self._refine_slots.release()
+        
+        if evaluation is None:
+            self.evaluations.update(evaluation_id, lambda record: ({**record, "status": "done"}, None))
+            return
+        
+        self.evaluations.set(evaluation_id, {**evaluation, "status": "done", "refined": True})
+        if session_id and question_index is not None:
+            self.sessions.record_answer(
+                session_id,
+                (answer or '')[:INTERVIEW_ANSWER_MAX_CHARS],
+                evaluation["score"],
+                evaluation["feedback"],
+                index=question_index,
+                only_if_unchanged=True
+            )
+    
+    def get_evaluation(self, evaluation_id: str) -> Optional[Dict]:
+        """백그라운드 평가 상태/결과 (없거나 만료되면 None)"""
+        if not _EVALUATION_ID_PATTERN.match(evaluation_id or ''):
+            return None
+        return self.evaluations.get(evaluation_id)
+    
+    def session_answer_items(self, session_id: str) -> Optional[List[Dict]]:
+        """세션에 저장된 답변을 evaluate_answers() 입력 형식으로 (답변 시간은 질문 제한 시간으로 간주)"""
+        session = self.sessions.get(session_id)
+        if session is None:
+            return None
+        items = []
+        for i in session.answered:
+            text, _, time_limit = session.questions[i]
+            time_limit = time_limit or 180
+            items.append({
+                "question": text,
+                "answer": session.answers[i],
+                "time_taken": time_limit,
+                "max_time": time_limit,
+                "question_index": i
+            })
+        return items
+    
     def _parse_evaluation(self, text: str, time_taken: int, max_time: int) -> tuple:
         score_match = re.search(r'점수:\s*(\d+)', text)
         feedback_match = re.search(r'피드백:\s*(.+)', text, re.DOTALL)
@@ -6,6 +6,8 @@ from typing import Dict, List
 from anthropic import Anthropic
 from dotenv import load_dotenv
 
+from text_patterns import numbered_items
+
 load_dotenv()
 
 class JobAnalyzer:
@@ -164,30 +166,11 @@ class JobAnalyzer:
         return all_questions[:40]
     
     def _parse_claude_questions(self, text: str) -> List[str]:
-        questions = []
-        lines = text.split('\n')
-        
-        for line in lines:
-            line = line.strip()
-            if re.match(r'^\d+\.', line):
-                question = re.sub(r'^\d+\.\s*', '', line)
-                if question and len(question) > 5:  # 너무 짧은 질문 제외
-                    questions.append(question)
-        
-        return questions
+        # 너무 짧은 질문 제외
+        return [question for question in numbered_items(text) if len(question) > 5]
     
     def _parse_questions(self, text: str) -> List[str]:
-        questions = []
-        lines = text.split('\n')
-        
-        for line in lines:
-            line = line.strip()
-            if re.match(r'^\d+\.', line):
-                question = re.sub(r'^\d+\.\s*', '', line)
-                if question:
-                    questions.append(question)
-        
-        return questions
+        return [question for question in numbered_items(text) if question]
     
     def _get_job_specific_questions(self, position: str, job_info: Dict) -> List[str]:
         """직무별 맞춤 질문 생성"""
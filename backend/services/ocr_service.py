@@ -0,0 +1,282 @@
+import io
+import threading
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+import cv2
+import numpy as np
+from PIL import Image
+
+from cache_util import PerceptualHashCache
+from image_prep import prepare_vision_image
+from config import (CLIENT_SELF as CLIENT, OCR_TIMEOUT, OCR_WORKERS, OCR_REGION_MIN_PIXELS,
+                    QUESTION_IMAGE_CACHE_SIZE, QUESTION_IMAGE_CACHE_TTL, QUESTION_IMAGE_HASH_DISTANCE)
+from self_util import preprocess_image_for_ocr, is_valid_question, estimate_char_height
+from question_context import QUESTION_PHRASES
+import text_patterns as patterns
+from services.tesseract_engine import TesseractPool
+from log_util import get_logger
+
+logger = get_logger(__name__)
+
+# OCR 결과 채택 기준: 최소 글자 수 + is_valid_question을 통과한 줄이 차지하는 글자 비율
+OCR_MIN_LENGTH = 20
+OCR_MIN_COVERAGE = 0.6
+# 한글 중 낱자모(ㅇ, ㅓ 등) 비율 상한 - 넘으면 글자가 깨진 결과로 봄
+OCR_MAX_JAMO_RATIO = 0.03
+
+VISION_PROMPT = """이 이미지에서 자기소개서 질문들을 정확히 추출해주세요. ..."""
+
+# 텍스트 영역 검출: 글자를 가로로 이어 붙여 줄/문단 블록을 만든 뒤 너무 작은 블록은 제외
+REGION_PADDING = 6
+REGION_MIN_HEIGHT = 10
+REGION_MIN_AREA = 400
+# 세로로 이 비율 이상 겹치는 블록은 같은 행으로 보고 왼쪽부터 읽음
+ROW_OVERLAP_RATIO = 0.5
+
+# 같은(또는 거의 같은) 질문 스크린샷으로 재시도할 때 Vision/OCR을 건너뛰기 위한 캐시
+HASH_SIZE = 16  # dHash 256비트
+_question_cache = PerceptualHashCache(max_entries=QUESTION_IMAGE_CACHE_SIZE, ttl=QUESTION_IMAGE_CACHE_TTL,
+                                      max_distance=QUESTION_IMAGE_HASH_DISTANCE)
+
+# traineddata(kor+eng)를 한 번만 로드한 엔진을 재사용
+_tesseract = TesseractPool(lang='kor+eng', size=OCR_WORKERS, timeout=OCR_TIMEOUT)
+# spawn으로 시작된 자식 프로세스(app.py를 다시 import하는 분석 워커)에서는 미리 로드하지 않음
+if multiprocessing.parent_process() is None:
+    threading.Thread(target=_tesseract.warm_up, name='ocr-warmup', daemon=True).start()
+
+
+# 전략 간 동시 실행용 스레드 풀 (tesseract는 별도 프로세스 또는 GIL을 놓는 C API, Vision은 네트워크 대기이므로 스레드로 충분)
+# 영역별 OCR은 전략 작업 안에서 기다리므로 교착을 피하도록 별도 풀 사용
+_executor = None
+_region_executor = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=OCR_WORKERS, thread_name_prefix='ocr')
+        return _executor
+
+
+def _get_region_executor():
+    global _region_executor
+    with _executor_lock:
+        if _region_executor is None:
+            _region_executor = ThreadPoolExecutor(max_workers=OCR_WORKERS, thread_name_prefix='ocr-region')
+        return _region_executor
+
+
+def image_dhash(image, hash_size=HASH_SIZE):
+    """차이 해시(dHash) - (hash_size+1)×hash_size 그레이스케일 축소 후 가로 인접 픽셀 밝기 비교"""
+    small = np.asarray(image.convert('L').resize((hash_size + 1, hash_size), Image.Resampling.BOX), dtype=np.int16)
+    bits = (small[:, 1:] > small[:, :-1]).ravel()
+    return int.from_bytes(np.packbits(bits).tobytes(), 'big')
+
+
+def _vision_extract(image):
+    """GPT-4o-mini Vision으로 질문 추출"""
+    prepared = prepare_vision_image(image, log_prefix='[Vision API]')
+
+    logger.info("[Vision API] 이미지 분석 요청...")
+    response = CLIENT.chat.completions.create(
+        model="gpt-4o-mini",
+        messages=[
+            {
+                "role": "user",
+                "content": [
+                    {"type": "text", "text": VISION_PROMPT},
+                    {"type": "image_url", "image_url": {"url": prepared['data_url']}}
+                ]
+            }
+        ],
+        max_tokens=500,
+        temperature=0.1
+    )
+    return response.choices[0].message.content.strip()
+
+
+def _tesseract_extract(image, psm):
+    return _tesseract.image_to_string(image, psm).strip()
+
+
+def detect_text_regions(binary):
+    """
+    이진화 이미지(흰 배경/검은 글자)에서 텍스트 블록 (x, y, w, h) 목록을 읽기 순서로 반환
+    글자 높이에 비례한 커널로 가로 방향 팽창 → 줄 단위로 묶고, 세로로 약간 팽창해 문단 블록을 만듦
+    """
+    inverted = cv2.bitwise_not(binary)
+    height, width = inverted.shape
+
+    # 글자 높이 추정: 작은 요소(노이즈)를 제외한 연결 요소 높이의 중앙값
+    _, _, stats, _ = cv2.connectedComponentsWithStats(inverted, connectivity=8)
+    char_height = estimate_char_height(stats, height)
+
+    kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (max(3, char_height * 2), max(3, char_height // 2)))
+    blocks = cv2.dilate(inverted, kernel)
+    contours, _ = cv2.findContours(blocks, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+
+    regions = []
+    for contour in contours:
+        x, y, w, h = cv2.boundingRect(contour)
+        if h < REGION_MIN_HEIGHT or w * h < REGION_MIN_AREA:
+            continue
+        x0, y0 = max(0, x - REGION_PADDING), max(0, y - REGION_PADDING)
+        x1, y1 = min(width, x + w + REGION_PADDING), min(height, y + h + REGION_PADDING)
+        regions.append((x0, y0, x1 - x0, y1 - y0))
+    return sort_reading_order(regions)
+
+
+def sort_reading_order(regions):
+    """위→아래로 행을 나누고, 같은 행(세로 겹침이 큰 블록)은 왼쪽→오른쪽 순서로 정렬"""
+    rows = []
+    for region in sorted(regions, key=lambda r: r[1]):
+        x, y, w, h = region
+        if rows:
+            row_top, row_bottom, members = rows[-1]
+            overlap = min(row_bottom, y + h) - max(row_top, y)
+            if overlap >= ROW_OVERLAP_RATIO * min(h, row_bottom - row_top):
+                members.append(region)
+                rows[-1] = (min(row_top, y), max(row_bottom, y + h), members)
+                continue
+        rows.append((y, y + h, [region]))
+    return [region for _, _, members in rows for region in sorted(members, key=lambda r: r[0])]
+
+
+def _tesseract_regions(image):
+    """텍스트 블록만 잘라 병렬로 OCR한 뒤 읽기 순서대로 이어 붙임 (큰 스크린샷의 여백/UI 영역 제외)"""
+    binary = np.asarray(image.convert('L') if image.mode != 'L' else image)
+    regions = detect_text_regions(binary)
+    logger.debug("[이미지 처리] 텍스트 영역 %d개 검출", len(regions))
+    if not regions:
+        return ''
+
+    executor = _get_region_executor()
+    futures = [executor.submit(_tesseract_extract, image.crop((x, y, x + w, y + h)), 6)
+               for x, y, w, h in regions]
+    texts = [future.result() for future in futures]
+    return '\n'.join(text for text in texts if text)
+
+
+def vision_result_ok(text):
+    """Vision 결과 채택 기준 (질문 번호나 '질문'이 포함된 충분한 길이의 응답)"""
+    return len(text) > 30 and ('1.' in text or '질문' in text)
+
+
+def ocr_coverage(text):
+    """유효한 질문 줄(is_valid_question)이 전체 글자에서 차지하는 비율"""
+    lines = [line.strip() for line in text.splitlines() if line.strip()]
+    total = sum(len(line) for line in lines)
+    if total == 0:
+        return 0.0
+    return sum(len(line) for line in lines if is_valid_question(line)) / total
+
+
+def jamo_ratio(text):
+    """한글(완성형 + 낱자모) 중 낱자모 비율"""
+    jamo = len(patterns.HANGUL_JAMO.findall(text))
+    total = jamo + len(patterns.HANGUL.findall(text))
+    return jamo / total if total else 0.0
+
+
+def has_question_marker(text):
+    """번호/기호로 시작하는 줄이나 질문 표현('해주세요', '바랍니다', '?' 등)이 있는지"""
+    if QUESTION_PHRASES.contains_any(text):
+        return True
+    return any(patterns.QUESTION_PREFIX.match(line.strip()) for line in text.splitlines())
+
+
+def ocr_result_ok(text):
+    """
+    tesseract 결과 채택 기준 - Vision보다 먼저 끝나도 이 기준을 통과해야 채택
+    최소 길이 + 낱자모가 거의 없음 + 질문 번호/표현 포함 + 유효한 질문 줄 비율
+    """
+    return (len(text) >= OCR_MIN_LENGTH
+            and jamo_ratio(text) <= OCR_MAX_JAMO_RATIO
+            and has_question_marker(text)
+            and ocr_coverage(text) >= OCR_MIN_COVERAGE)
+
+
+def extract_question_from_image(image_bytes, use_vision=True):
+    """
+    질문 이미지에서 텍스트 추출 - Vision과 tesseract(psm 4/6 × 전처리/원본)를 동시에 실행하고
+    품질 기준을 먼저 통과한 결과를 채택합니다. 나머지 작업은 취소합니다.
+    큰 이미지는 전처리 이미지 전체 OCR 대신 텍스트 영역별 OCR을 사용합니다.
+    지각 해시가 같거나 가까운 이미지의 이전 결과가 있으면 그대로 반환합니다. (전략 이름 'cache')
+    기준을 통과하지 못한 대체 결과는 캐시하지 않습니다.
+    (이미 실행 중인 OCR은 끝까지 실행되며 결과는 버려짐 - CLI 모드는 OCR_TIMEOUT으로 제한)
+    반환: (텍스트, 전략 이름)
+    """
+    image = Image.open(io.BytesIO(image_bytes))
+    image.load()
+
+    image_hash = image_dhash(image)
+    cached = _question_cache.lookup(image_hash)
+    if cached is not None:
+        logger.info("[이미지 처리] 캐시 사용 (%s 결과, %d자)", cached[1], len(cached[0]))
+        return cached[0], 'cache'
+
+    text, strategy, accepted = _extract_question_uncached(image, use_vision)
+    # 채택 기준을 통과한 결과만 캐시 (대체 결과를 캐시하면 재시도해도 같은 잘못된 결과가 반환됨)
+    if accepted:
+        _question_cache.set(image_hash, (text, strategy))
+    return text, strategy
+
+
+def _extract_question_uncached(image, use_vision):
+    """반환: (텍스트, 전략 이름, 채택 기준 통과 여부)"""
+    executor = _get_executor()
+
+    # 전처리는 한 번만 실행하고 전처리 이미지를 쓰는 전략들이 공유
+    # (가장 먼저 제출하므로 대기 중인 전략보다 먼저 워커를 받음)
+    processed = executor.submit(preprocess_image_for_ocr, image)
+
+    strategies = {}
+    if use_vision and CLIENT:
+        strategies[executor.submit(_vision_extract, image)] = ('vision', vision_result_ok)
+    if image.width * image.height >= OCR_REGION_MIN_PIXELS:
+        # 큰 이미지는 전처리 이미지 전체 대신 텍스트 영역만 OCR
+        strategies[executor.submit(lambda: _tesseract_regions(processed.result()))] = \
+            ('tesseract_processed_regions', ocr_result_ok)
+        tesseract_strategies = (('tesseract_raw_psm6', 6, image), ('tesseract_raw_psm4', 4, image))
+    else:
+        tesseract_strategies = (('tesseract_processed_psm4', 4, None), ('tesseract_raw_psm6', 6, image),
+                                ('tesseract_processed_psm6', 6, None), ('tesseract_raw_psm4', 4, image))
+    for name, psm, source in tesseract_strategies:
+        if source is None:
+            future = executor.submit(lambda psm=psm: _tesseract_extract(processed.result(), psm))
+        else:
+            future = executor.submit(_tesseract_extract, source, psm)
+        strategies[future] = (name, ocr_result_ok)
+
+    results = {}
+    pending = set(strategies)
+    try:
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                name, accept = strategies[future]
+                try:
+                    text = future.result()
+                except Exception as e:
+                    logger.warning("[이미지 처리] %s 실패: %s", name, e)
+                    continue
+                results[name] = text
+                logger.debug("[이미지 처리] %s 완료: %d자", name, len(text))
+                if accept(text):
+                    logger.info("[이미지 처리] %s 결과 채택", name)
+                    return text, name, True
+    finally:
+        for future in pending:
+            future.cancel()
+
+    # 기준을 통과한 결과가 없으면 가장 긴 OCR 결과, OCR이 모두 실패했으면 Vision 결과 사용
+    ocr_results = {name: text for name, text in results.items() if name != 'vision'}
+    if ocr_results:
+        name = max(ocr_results, key=lambda key: len(ocr_results[key]))
+        return ocr_results[name], name, False
+    if results.get('vision'):
+        return results['vision'], 'vision', False
+    return '', None, False
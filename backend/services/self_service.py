@@ -1,4 +1,3 @@
-import re
 import time
 import json
 from bs4 import BeautifulSoup
@@ -13,6 +12,12 @@ from selenium.common.exceptions import TimeoutException, WebDriverException
 
 from config import CLIENT_SELF as CLIENT, OPENAI_API_KEY_SELF as API_KEY
 from self_util import basic_question_parsing_with_keywords
+from text_patterns import numbered_items
+from question_context import compact_question_text
+from resume_index import ResumeIndex
+from log_util import get_logger, Preview
+
+logger = get_logger(__name__)
 
 def ai_smart_parse_questions(question_text):
     """
@@ -22,33 +27,30 @@ def ai_smart_parse_questions(question_text):
         return basic_question_parsing_with_keywords(question_text)
     
     try:
-        print(f"[AI 스마트 파싱] 분석 시작...")
-        print(f"[AI 스마트 파싱] 입력 텍스트 길이: {len(question_text)}")
-        print(f"[AI 스마트 파싱] 입력 텍스트 샘플: {question_text[:300]}...")
+        logger.debug("[AI 스마트 파싱] 분석 시작...")
+        logger.info("[AI 스마트 파싱] 입력 텍스트 길이: %d", len(question_text))
+        logger.debug("[AI 스마트 파싱] 입력 텍스트 샘플: %s", Preview(question_text, 300))
         
         # Vision API에서 이미 잘 구조화된 결과인지 확인
         if ('1.' in question_text and '2.' in question_text) or 'Vision API' in str(question_text):
-            print("[AI 스마트 파싱] Vision API 결과로 추정, 간단 파싱 사용")
+            logger.debug("[AI 스마트 파싱] Vision API 결과로 추정, 간단 파싱 사용")
             # Vision API 결과는 이미 잘 구조화되어 있으므로 간단하게 파싱
             questions = []
-            lines = question_text.strip().split('\n')
-            for line in lines:
-                line = line.strip()
-                if re.match(r'^\d+\.', line):
-                    content = re.sub(r'^\d+\.\s*', '', line).strip()
-                    if content:
-                        questions.append({
-                            'number': str(len(questions) + 1),
-                            'content': content
-                        })
+            for content in numbered_items(question_text):
+                content = content.strip()
+                if content:
+                    questions.append({
+                        'number': str(len(questions) + 1),
+                        'content': content
+                    })
             
             if questions:
-                print(f"[AI 스마트 파싱] Vision API 결과에서 {len(questions)}개 질문 추출")
+                logger.info("[AI 스마트 파싱] Vision API 결과에서 %d개 질문 추출", len(questions))
                 return questions
         
         # 텍스트가 너무 짧거나 의미없는 경우 체크
         if len(question_text.strip()) < 20:
-            print(f"[AI 스마트 파싱] 텍스트가 너무 짧음 ({len(question_text)}자), 기본 질문 사용")
+            logger.info("[AI 스마트 파싱] 텍스트가 너무 짧음 (%d자), 기본 질문 사용", len(question_text))
             return [
                 {'number': '1', 'content': '성장과정에 대해 설명해주세요'},
                 {'number': '2', 'content': '지원동기를 말씀해주세요'},
@@ -63,7 +65,7 @@ def ai_smart_parse_questions(question_text):
         ]
         
         if any(pattern in question_text for pattern in meaningless_patterns):
-            print("[AI 스마트 파싱] 의미없는 텍스트 감지, 기본 질문으로 대체")
+            logger.info("[AI 스마트 파싱] 의미없는 텍스트 감지, 기본 질문으로 대체")
             return [
                 {'number': '1', 'content': '성장과정에 대해 설명해주세요'},
                 {'number': '2', 'content': '지원동기를 말씀해주세요'},
@@ -114,11 +116,11 @@ def ai_smart_parse_questions(question_text):
         )
         
         result = response.choices[0].message.content.strip()
-        print(f"[AI 스마트 파싱] AI 응답 원문: '{result}'")
-        print(f"[AI 스마트 파싱] AI 응답 길이: {len(result)}")
+        logger.debug("[AI 스마트 파싱] AI 응답 원문: '%s'", Preview(result, 500))
+        logger.info("[AI 스마트 파싱] AI 응답 길이: %d", len(result))
         
         if not result:
-            print("[AI 스마트 파싱] 빈 응답 받음, 키워드 기반 파싱으로 대체")
+            logger.warning("[AI 스마트 파싱] 빈 응답 받음, 키워드 기반 파싱으로 대체")
             return basic_question_parsing_with_keywords(question_text)
         
         try:
@@ -126,7 +128,7 @@ def ai_smart_parse_questions(question_text):
             if result.startswith('```'):
                 lines = result.split('\n')
                 result = '\n'.join(lines[1:-1])  # 첫 줄과 마지막 줄 제거
-                print(f"[AI 스마트 파싱] 코드 블록 제거 후: '{result}'")
+                logger.debug("[AI 스마트 파싱] 코드 블록 제거 후: '%s'", Preview(result, 500))
             
             parsed_data = json.loads(result)
             question_list = parsed_data.get('questions', [])
@@ -140,20 +142,20 @@ def ai_smart_parse_questions(question_text):
                     })
             
             if questions and len(questions) > 0:
-                print(f"[AI 스마트 파싱] {len(questions)}개 질문 추출 성공")
+                logger.info("[AI 스마트 파싱] %d개 질문 추출 성공", len(questions))
                 for q in questions:
-                    print(f"  - 질문 {q['number']}: {q['content']}")
+                    logger.debug("  - 질문 %s: %s", q['number'], q['content'])
                 return questions
             else:
-                print("[AI 스마트 파싱] AI가 질문을 찾지 못함, 키워드 기반 파싱으로 대체")
+                logger.info("[AI 스마트 파싱] AI가 질문을 찾지 못함, 키워드 기반 파싱으로 대체")
                 return basic_question_parsing_with_keywords(question_text)
                 
         except json.JSONDecodeError as e:
-            print(f"[AI 스마트 파싱] JSON 파싱 오류: {e}")
+            logger.warning("[AI 스마트 파싱] JSON 파싱 오류: %s", e)
             return basic_question_parsing_with_keywords(question_text)
             
     except Exception as e:
-        print(f"[AI 스마트 파싱] 오류: {e}")
+        logger.error("[AI 스마트 파싱] 오류: %s", e)
         return basic_question_parsing_with_keywords(question_text)
 
 def generate_ai_answer(resume_text, question_text):
@@ -165,17 +167,24 @@ def generate_ai_answer(resume_text, question_text):
         return {"error": "오류: OpenAI API 키가 설정되지 않았습니다. .env 파일을 확인해주세요."}
 
     try:
+        # 긴 채용 페이지/문서는 질문 후보와 인재상/우대사항 문맥만 남겨 프롬프트 크기를 제한
+        question_text = compact_question_text(question_text)
+        
         # AI 스마트 파싱으로 실제 질문만 추출
         questions = ai_smart_parse_questions(question_text)
         
-        print(f"[모니터링] 파싱된 질문 개수: {len(questions)}")
-        for i, q in enumerate(questions):
-            print(f"[모니터링] 질문 {q['number']}: {q['content'][:50]}...")
+        logger.info("[모니터링] 파싱된 질문 개수: %d", len(questions))
+        for q in questions:
+            logger.debug("[모니터링] 질문 %s: %s", q['number'], Preview(q['content'], 50))
         
         answers = {}
         
+        # 자기소개서는 한 번만 색인하고 질문마다 관련 청크만 골라 프롬프트에 넣음 (짧으면 원문 그대로)
+        resume_index = ResumeIndex(resume_text)
+        
         for question in questions:
-            print(f"[모니터링] 질문 {question['number']} 답변 생성 중...")
+            logger.debug("[모니터링] 질문 %s 답변 생성 중...", question['number'])
+            resume_context = resume_index.select(question['content'])
             
             prompt = f"""
             당신은 자기소개서 컨설턴트입니다. 아래 제공된 자기소개서 내용을 깊이 분석하고, 특정 질문에 대한 답변 초안을 작성해주세요.
@@ -187,7 +196,7 @@ def generate_ai_answer(resume_text, question_text):
 
             [자기소개서 내용]:
             ---
-            {resume_text}
+            {resume_context}
             ---
 
             [답변할 질문]:
@@ -233,7 +242,7 @@ def generate_ai_answer(resume_text, question_text):
             
             # "죄송합니다" 같은 답변은 필터링
             if "죄송합니다" in answer_content and "이해할 수 없는" in answer_content:
-                print(f"[모니터링] 질문 {question['number']} 무의미한 답변으로 건너뜀")
+                logger.info("[모니터링] 질문 %s 무의미한 답변으로 건너뜀", question['number'])
                 continue
                 
             answers[question['number']] = {
@@ -241,7 +250,7 @@ def generate_ai_answer(resume_text, question_text):
                 'answer': answer_content
             }
             
-            print(f"[모니터링] 질문 {question['number']} 답변 완료: {answer_content[:50]}...")
+            logger.info("[모니터링] 질문 %s 답변 완료: %s", question['number'], Preview(answer_content, 50))
         
         return {
             "success": True,
@@ -251,7 +260,7 @@ def generate_ai_answer(resume_text, question_text):
         
     except Exception as e:
         error_msg = f"AI 모델 호출 중 오류가 발생했습니다: {e}"
-        print(f"[모니터링] 오류: {error_msg}")
+        logger.error("[모니터링] 오류: %s", error_msg)
         return {"error": error_msg}
 
 def crawl_website(url):
@@ -260,7 +269,7 @@ def crawl_website(url):
     """
     driver = None  # driver 변수 초기화
     try:
-        print(f"[웹 크롤링] URL 접근 시도 (Selenium): {url}")
+        logger.info("[웹 크롤링] URL 접근 시도 (Selenium): %s", url)
 
         # Selenium WebDriver 설정
         options = ChromeOptions()
@@ -281,10 +290,10 @@ def crawl_website(url):
             EC.presence_of_element_located((By.TAG_NAME, "body"))
         )
         
-        print("[웹 크롤링] 동적 콘텐츠 로드를 위해 5초 추가 대기...")
+        logger.debug("[웹 크롤링] 동적 콘텐츠 로드를 위해 5초 추가 대기...")
         time.sleep(5) # SPA 렌더링 대기
         
-        print("[웹 크롤링] 페이지 로드 완료, 콘텐츠 파싱 시작...")
+        logger.debug("[웹 크롤링] 페이지 로드 완료, 콘텐츠 파싱 시작...")
         
         # 렌더링된 페이지 소스 가져오기
         html = driver.page_source
@@ -307,38 +316,38 @@ def crawl_website(url):
         for selector in content_selectors:
             main_content = soup.select_one(selector)
             if main_content:
-                print(f"[웹 크롤링] 주요 콘텐츠 영역 발견: {selector}")
+                logger.debug("[웹 크롤링] 주요 콘텐츠 영역 발견: %s", selector)
                 break
         
         # 주요 콘텐츠 영역이 없으면 전체 body 사용
         if not main_content:
             main_content = soup.find('body') or soup
-            print("[웹 크롤링] 전체 body 영역 사용")
+            logger.debug("[웹 크롤링] 전체 body 영역 사용")
         
         # 텍스트 추출
         text = main_content.get_text()
-        print(f"[웹 크롤링] 추출된 텍스트 길이: {len(text)}")
+        logger.info("[웹 크롤링] 추출된 텍스트 길이: %d", len(text))
         
         # 텍스트 정리
         lines = (line.strip() for line in text.splitlines())
         lines = (line for line in lines if line and len(line) > 2)
         text = '\n'.join(lines)
         
-        print(f"[웹 크롤링] 최종 텍스트 샘플: {text[:200].encode('ascii', 'ignore').decode('ascii')}...")
+        logger.debug("[웹 크롤링] 최종 텍스트 샘플: %s", Preview(text, 200))
         # cp949로 인코딩 안되는 문자(이모지 등)를 제거하여 반환
         return text.encode('cp949', 'ignore').decode('cp949')
         
     except TimeoutException:
         error_msg = f"오류: 요청 시간 초과 - 웹사이트({url}) 응답이 너무 느립니다."
-        print(f"[웹 크롤링] {error_msg}")
+        logger.error("[웹 크롤링] %s", error_msg)
         return error_msg
     except WebDriverException as e:
         error_msg = f"오류: WebDriver 오류 - 브라우저를 제어하는 중 문제가 발생했습니다. ({e})"
-        print(f"[웹 크롤링] {error_msg}")
+        logger.error("[웹 크롤링] %s", error_msg)
         return error_msg
     except Exception as e:
         error_msg = f"오류: 웹사이트 크롤링 실패 - {e}"
-        print(f"[웹 크롤링] {error_msg}")
+        logger.error("[웹 크롤링] %s", error_msg)
         return error_msg
     finally:
         if driver:
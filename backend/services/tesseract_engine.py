@@ -0,0 +1,132 @@
+import io
+import os
+import re
+import queue
+import threading
+import subprocess
+
+import pytesseract
+
+from log_util import get_logger
+
+try:
+    import tesserocr
+except ImportError:
+    tesserocr = None
+
+logger = get_logger(__name__)
+
+# `tesseract --list-langs` 출력의 traineddata 폴더 ('List of available languages in "/usr/share/.../tessdata/" (3):')
+_TESSDATA_LINE = re.compile(r'"([^"]+)"')
+
+
+def find_tessdata_path():
+    """
+    traineddata 폴더 - TESSDATA_PREFIX 환경 변수 → 설치된 tesseract CLI가 쓰는 폴더 순
+    (tesserocr 휠에 포함된 라이브러리의 기본 경로는 시스템 패키지의 traineddata 위치와 다를 수 있음)
+    """
+    prefix = os.environ.get('TESSDATA_PREFIX')
+    if prefix:
+        return prefix
+    try:
+        result = subprocess.run([pytesseract.pytesseract.tesseract_cmd, '--list-langs'],
+                                capture_output=True, timeout=10)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    output = (result.stdout + result.stderr).decode('utf-8', 'replace')
+    match = _TESSDATA_LINE.search(output.splitlines()[0] if output else '')
+    return match.group(1) if match else None
+
+
+class TesseractPool:
+    """
+    tesseract OCR 엔진 풀
+    - tesserocr(requirements.txt 기본 의존성)로 traineddata를 한 번만 로드한 엔진을 최대 size개 유지하며 재사용
+    - tesserocr를 import할 수 없는 환경에서만 tesseract CLI를 stdin/stdout 파이프로 호출
+      (임시 파일은 쓰지 않지만 호출마다 traineddata를 다시 읽음 - 시작 시 경고 로그)
+    """
+
+    def __init__(self, lang='kor+eng', size=4, timeout=None):
+        self.lang = lang
+        self.size = size
+        self.timeout = timeout
+        self._engines = queue.LifoQueue()
+        self._created = 0
+        self._lock = threading.Lock()
+        self._tessdata_path = None
+        self._tessdata_checked = False
+        if tesserocr is None:
+            logger.warning("[OCR 엔진] tesserocr를 불러올 수 없어 tesseract CLI 사용 (호출마다 traineddata 로드)")
+
+    @property
+    def backend(self):
+        return 'tesserocr' if tesserocr is not None else 'cli'
+
+    def _create_engine(self):
+        with self._lock:
+            if not self._tessdata_checked:
+                self._tessdata_path = find_tessdata_path()
+                self._tessdata_checked = True
+        if self._tessdata_path:
+            return tesserocr.PyTessBaseAPI(path=self._tessdata_path, lang=self.lang, oem=tesserocr.OEM.DEFAULT)
+        return tesserocr.PyTessBaseAPI(lang=self.lang, oem=tesserocr.OEM.DEFAULT)
+
+    def _acquire(self):
+        """유휴 엔진 반환 - 없으면 size개까지 새로 만들고, 그 이상이면 반납될 때까지 대기"""
+        try:
+            return self._engines.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            create = self._created < self.size
+            if create:
+                self._created += 1
+        if create:
+            try:
+                return self._create_engine()
+            except Exception:
+                with self._lock:
+                    self._created -= 1
+                raise
+        return self._engines.get()
+
+    def warm_up(self, count=1):
+        """요청 전에 엔진을 미리 로드 (traineddata 로딩 시간을 첫 요청에서 제외)"""
+        if tesserocr is None:
+            return
+        for _ in range(count):
+            with self._lock:
+                if self._created >= self.size:
+                    return
+                self._created += 1
+            try:
+                self._engines.put(self._create_engine())
+            except Exception as e:
+                with self._lock:
+                    self._created -= 1
+                logger.warning("[OCR 엔진] 로드 실패: %s", e)
+                return
+
+    def image_to_string(self, image, psm=3):
+        if tesserocr is None:
+            return self._cli_image_to_string(image, psm)
+
+        engine = self._acquire()
+        try:
+            engine.SetPageSegMode(psm)
+            engine.SetImage(image)
+            return engine.GetUTF8Text()
+        finally:
+            engine.Clear()
+            self._engines.put(engine)
+
+    def _cli_image_to_string(self, image, psm):
+        """이미지를 메모리에서 PNG로 인코딩해 tesseract stdin으로 전달"""
+        buffer = io.BytesIO()
+        image.save(buffer, format='PNG', compress_level=1)
+        command = [pytesseract.pytesseract.tesseract_cmd, 'stdin', 'stdout',
+                   '-l', self.lang, '--oem', '3', '--psm', str(psm)]
+        result = subprocess.run(command, input=buffer.getvalue(), capture_output=True, timeout=self.timeout)
+        if result.returncode != 0:
+            raise RuntimeError(result.stderr.decode('utf-8', 'replace').strip() or 'tesseract 실행 실패')
+        return result.stdout.decode('utf-8', 'replace')
@@ -0,0 +1,156 @@
+import re
+import time
+import uuid
+from array import array
+
+from state_backend import create_backend
+
+# 아직 답변하지 않은 질문의 점수 자리
+NO_SCORE = -1
+
+_SESSION_ID_PATTERN = re.compile(r'^[0-9a-f-]{36}$')
+
+
+class InterviewSession:
+    """
+    면접 세션 한 건 - 질문 수만큼 자리를 미리 만들고 질문 순서대로 답변/점수/피드백을 채움
+    질문은 (텍스트, 난이도, 제한 시간) 튜플, 점수는 array('h')로 보관해 세션당 메모리를 줄임
+    """
+
+    __slots__ = ('session_id', 'questions', 'answers', 'scores', 'feedback', 'created_at', 'updated_at')
+
+    def __init__(self, session_id, questions, answers=None, scores=None, feedback=None,
+                 created_at=None, updated_at=None):
+        count = len(questions)
+        self.session_id = session_id
+        self.questions = tuple(tuple(question) for question in questions)
+        self.answers = list(answers) if answers is not None else [None] * count
+        self.scores = array('h', scores if scores is not None else [NO_SCORE] * count)
+        self.feedback = list(feedback) if feedback is not None else [None] * count
+        self.created_at = created_at or time.time()
+        self.updated_at = updated_at or self.created_at
+
+    @classmethod
+    def from_questions(cls, session_id, questions):
+        """select_questions() 결과(dict 목록)로 새 세션 생성"""
+        return cls(session_id, [(q.get('text', ''), q.get('difficulty'), q.get('timeLimit')) for q in questions])
+
+    def question_index(self, question_text=None, index=None):
+        """
+        답변할 질문 위치 - index가 있으면 그대로, 없으면 같은 텍스트의 미답변 질문 → 같은 텍스트의 답변한 질문(재평가)
+        → 첫 미답변 질문 순
+        """
+        if index is not None:
+            return index if 0 <= index < len(self.questions) else None
+        if question_text:
+            matches = [i for i, question in enumerate(self.questions) if question[0] == question_text]
+            for i in matches:
+                if self.answers[i] is None:
+                    return i
+            if matches:
+                return matches[0]
+        for i, answer in enumerate(self.answers):
+            if answer is None:
+                return i
+        return None
+
+    def record_answer(self, index, answer, score, feedback):
+        self.answers[index] = answer
+        self.scores[index] = int(score)
+        self.feedback[index] = feedback
+        self.updated_at = time.time()
+
+    @property
+    def answered(self):
+        return [i for i, answer in enumerate(self.answers) if answer is not None]
+
+    def report_data(self):
+        """리포트 생성용 데이터 (답변한 질문만, 질문 순서대로)"""
+        answered = self.answered
+        return {
+            'session_id': self.session_id,
+            'questions': [self.questions[i][0] for i in answered],
+            'answers': [self.answers[i] for i in answered],
+            'scores': [self.scores[i] for i in answered],
+            'feedback': [self.feedback[i] or '' for i in answered]
+        }
+
+    def to_dict(self):
+        return {
+            'session_id': self.session_id,
+            'questions': [list(question) for question in self.questions],
+            'answers': self.answers,
+            'scores': self.scores.tolist(),
+            'feedback': self.feedback,
+            'created_at': self.created_at,
+            'updated_at': self.updated_at
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data['session_id'], data['questions'], data['answers'], data['scores'],
+                   data['feedback'], data['created_at'], data['updated_at'])
+
+
+class SessionStore:
+    """
+    면접 세션 저장소 - 실제 저장은 state_backend (STATE_BACKEND 설정으로 프로세스 내/SQLite 공유 선택)
+    - 마지막 변경 후 ttl(초)이 지난 세션은 만료
+    - 최대 max_sessions개만 유지하고 넘으면 오래된 세션부터 제거
+    - persist_dir를 지정하면 (프로세스 내 저장소에서) 세션을 JSON 파일로도 저장
+    """
+
+    def __init__(self, max_sessions=1000, ttl=None, persist_dir=None, backend=None):
+        self.backend = backend or create_backend(
+            'interview_sessions',
+            max_entries=max_sessions,
+            ttl=ttl,
+            encode=InterviewSession.to_dict,
+            decode=InterviewSession.from_dict,
+            persist_dir=persist_dir
+        )
+
+    def create(self, questions):
+        """새 세션을 만들고 세션 id 반환"""
+        session = InterviewSession.from_questions(str(uuid.uuid4()), questions)
+        self.backend.set(session.session_id, session)
+        return session.session_id
+
+    def get(self, session_id):
+        if not _SESSION_ID_PATTERN.match(session_id or ''):
+            return None
+        return self.backend.get(session_id)
+
+    def record_answer(self, session_id, answer, score, feedback, question_text=None, index=None, only_if_unchanged=False):
+        """
+        답변/점수/피드백을 세션에 기록하고 기록한 질문 위치 반환
+        세션이 없거나 만료됐거나 기록할 자리가 없으면 None
+        only_if_unchanged=True면 그 자리의 답변이 answer와 같을 때만 점수/피드백을 갱신 (늦게 끝난 재평가가 새 답변을 덮지 않도록)
+        """
+        if not _SESSION_ID_PATTERN.match(session_id or ''):
+            return None
+
+        def apply(session):
+            position = session.question_index(question_text, index)
+            if position is None:
+                return None, None
+            if only_if_unchanged and session.answers[position] != answer:
+                return None, None
+            session.record_answer(position, answer, score, feedback)
+            return session, position
+
+        return self.backend.update(session_id, apply)
+
+    def delete(self, session_id):
+        if _SESSION_ID_PATTERN.match(session_id or ''):
+            self.backend.delete(session_id)
+
+    def purge_expired(self):
+        """만료된 세션을 정리하고 정리한 개수 반환"""
+        return self.backend.purge_expired()
+
+    def __len__(self):
+        return len(self.backend)
+
+    def stats(self):
+        return self.backend.stats()
@@ -0,0 +1,289 @@
+import os
+import json
+import time
+import sqlite3
+import tempfile
+import threading
+from collections import OrderedDict
+
+from config import STATE_BACKEND, STATE_DB_PATH
+
+_MISSING = object()
+
+
+def _json_encode(value):
+    return json.dumps(value, ensure_ascii=False, separators=(',', ':'))
+
+
+class MemoryBackend:
+    """
+    프로세스 내 키-값 저장소 (스레드 안전)
+    - 마지막 쓰기 후 ttl(초)이 지난 항목은 만료
+    - max_entries를 넘으면 가장 오래 사용하지 않은 항목부터 제거 (LRU)
+    - persist_dir를 지정하면 항목을 <키>.json으로 저장 → 메모리에서 밀려나거나 재시작해도 TTL 안에서는 다시 읽어옴
+    - 값은 객체 그대로 보관 (파일 저장 시에만 encode/decode 사용)
+    """
+
+    def __init__(self, name, max_entries=1000, ttl=None, encode=None, decode=None, persist_dir=None):
+        self.name = name
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.encode = encode or (lambda value: value)
+        self.decode = decode or (lambda data: data)
+        self.persist_dir = persist_dir
+        self._items = OrderedDict()
+        self._lock = threading.RLock()
+        if persist_dir:
+            os.makedirs(persist_dir, exist_ok=True)
+            self.purge_expired()
+
+    def _expired(self, updated_at, now):
+        return self.ttl is not None and now - updated_at > self.ttl
+
+    def _path(self, key):
+        return os.path.join(self.persist_dir, f'{key}.json')
+
+    def _save(self, key, value, updated_at):
+        if not self.persist_dir:
+            return
+        fd, tmp_path = tempfile.mkstemp(dir=self.persist_dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                f.write(_json_encode({'updated_at': updated_at, 'value': self.encode(value)}))
+            os.replace(tmp_path, self._path(key))
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def _load(self, key):
+        if not self.persist_dir:
+            return None
+        try:
+            with open(self._path(key), 'r', encoding='utf-8') as f:
+                stored = json.load(f)
+            return stored['updated_at'], self.decode(stored['value'])
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def _remove_file(self, key):
+        if self.persist_dir:
+            try:
+                os.remove(self._path(key))
+            except FileNotFoundError:
+                pass
+
+    def _remember(self, key, updated_at, value):
+        self._items[key] = (updated_at, value)
+        self._items.move_to_end(key)
+        while len(self._items) > self.max_entries:
+            self._items.popitem(last=False)
+
+    def _get_locked(self, key):
+        entry = self._items.get(key)
+        if entry is None:
+            entry = self._load(key)
+            if entry is None:
+                return _MISSING
+        if self._expired(entry[0], time.time()):
+            self._items.pop(key, None)
+            self._remove_file(key)
+            return _MISSING
+        self._remember(key, *entry)
+        return entry[1]
+
+    def _set_locked(self, key, value):
+        updated_at = time.time()
+        self._remember(key, updated_at, value)
+        self._save(key, value, updated_at)
+
+    def get(self, key, default=None):
+        with self._lock:
+            value = self._get_locked(key)
+        return default if value is _MISSING else value
+
+    def set(self, key, value):
+        with self._lock:
+            self._set_locked(key, value)
+
+    def update(self, key, func):
+        """
+        저장된 값에 func(value)를 원자적으로 적용 - func가 반환한 (새 값, 결과)에서 새 값을 저장하고 결과를 반환
+        항목이 없으면 func를 호출하지 않고 None 반환, 새 값이 None이면 저장하지 않음
+        """
+        with self._lock:
+            value = self._get_locked(key)
+            if value is _MISSING:
+                return None
+            value, result = func(value)
+            if value is not None:
+                self._set_locked(key, value)
+            return result
+
+    def delete(self, key):
+        with self._lock:
+            self._items.pop(key, None)
+            self._remove_file(key)
+
+    def purge_expired(self):
+        """만료된 항목을 정리하고 정리한 개수 반환"""
+        if self.ttl is None:
+            return 0
+        now = time.time()
+        removed = 0
+        with self._lock:
+            for key, (updated_at, _) in list(self._items.items()):
+                if self._expired(updated_at, now):
+                    del self._items[key]
+                    self._remove_file(key)
+                    removed += 1
+            if self.persist_dir:
+                for name in os.listdir(self.persist_dir):
+                    path = os.path.join(self.persist_dir, name)
+                    try:
+                        if name.endswith('.json') and self._expired(os.path.getmtime(path), now):
+                            os.remove(path)
+                            removed += 1
+                    except FileNotFoundError:
+                        pass
+        return removed
+
+    def __len__(self):
+        return len(self._items)
+
+    def stats(self):
+        return {'backend': 'memory', 'name': self.name, 'entries': len(self._items),
+                'max_entries': self.max_entries, 'ttl': self.ttl}
+
+
+class SQLiteBackend:
+    """
+    여러 워커 프로세스가 공유하는 SQLite(WAL) 키-값 저장소 - MemoryBackend와 같은 API
+    - 외부 서버 없이 같은 DB 파일을 여는 모든 프로세스가 같은 상태를 봄 (sticky 라우팅 불필요)
+    - 값은 encode()한 뒤 JSON 문자열로 저장
+    - update()는 BEGIN IMMEDIATE 트랜잭션으로 프로세스 간에도 원자적
+    - max_entries를 넘으면 마지막 쓰기가 가장 오래된 항목부터 제거 (조회 때마다 쓰지 않도록 쓰기 시각 기준 LRU)
+    - ttl이 지난 행은 쓰기(set/update) 때마다 삭제
+    """
+
+    def __init__(self, name, db_path, max_entries=1000, ttl=None, encode=None, decode=None):
+        self.name = name
+        self.table = f'state_{name}'
+        self.db_path = db_path
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.encode = encode or (lambda value: value)
+        self.decode = decode or (lambda data: data)
+        self._local = threading.local()
+
+        directory = os.path.dirname(os.path.abspath(db_path))
+        os.makedirs(directory, exist_ok=True)
+        with self._transaction() as conn:
+            conn.execute(f'CREATE TABLE IF NOT EXISTS {self.table} ('
+                         'key TEXT PRIMARY KEY, value TEXT NOT NULL, updated_at REAL NOT NULL)')
+            conn.execute(f'CREATE INDEX IF NOT EXISTS {self.table}_updated ON {self.table} (updated_at)')
+
+    def _connection(self):
+        """스레드별 연결 (sqlite3 연결은 스레드 간 공유하지 않음)"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    class _Transaction:
+        def __init__(self, conn):
+            self.conn = conn
+
+        def __enter__(self):
+            self.conn.execute('BEGIN IMMEDIATE')
+            return self.conn
+
+        def __exit__(self, exc_type, exc, tb):
+            self.conn.execute('ROLLBACK' if exc_type else 'COMMIT')
+            return False
+
+    def _transaction(self):
+        return self._Transaction(self._connection())
+
+    def _expired(self, updated_at, now):
+        return self.ttl is not None and now - updated_at > self.ttl
+
+    def _get_row(self, conn, key):
+        row = conn.execute(f'SELECT value, updated_at FROM {self.table} WHERE key = ?', (key,)).fetchone()
+        if row is None:
+            return _MISSING
+        if self._expired(row[1], time.time()):
+            return _MISSING
+        return self.decode(json.loads(row[0]))
+
+    def _delete_expired(self, conn, now):
+        if self.ttl is None:
+            return 0
+        return conn.execute(f'DELETE FROM {self.table} WHERE updated_at < ?', (now - self.ttl,)).rowcount
+
+    def _put_row(self, conn, key, value):
+        now = time.time()
+        # 만료된 행은 쓰기 때마다 정리 (updated_at 인덱스 범위 삭제) → 개수 제한은 살아 있는 항목 기준
+        self._delete_expired(conn, now)
+        conn.execute(f'INSERT OR REPLACE INTO {self.table} (key, value, updated_at) VALUES (?, ?, ?)',
+                     (key, _json_encode(self.encode(value)), now))
+        count = conn.execute(f'SELECT COUNT(*) FROM {self.table}').fetchone()[0]
+        if count > self.max_entries:
+            conn.execute(f'DELETE FROM {self.table} WHERE key IN '
+                         f'(SELECT key FROM {self.table} ORDER BY updated_at LIMIT ?)',
+                         (count - self.max_entries,))
+
+    def get(self, key, default=None):
+        value = self._get_row(self._connection(), key)
+        return default if value is _MISSING else value
+
+    def set(self, key, value):
+        with self._transaction() as conn:
+            self._put_row(conn, key, value)
+
+    def update(self, key, func):
+        """MemoryBackend.update()와 같음 (읽기-수정-쓰기를 한 트랜잭션에서 실행)"""
+        with self._transaction() as conn:
+            value = self._get_row(conn, key)
+            if value is _MISSING:
+                return None
+            value, result = func(value)
+            if value is not None:
+                self._put_row(conn, key, value)
+            return result
+
+    def delete(self, key):
+        with self._transaction() as conn:
+            conn.execute(f'DELETE FROM {self.table} WHERE key = ?', (key,))
+
+    def purge_expired(self):
+        if self.ttl is None:
+            return 0
+        with self._transaction() as conn:
+            return self._delete_expired(conn, time.time())
+
+    def __len__(self):
+        return self._connection().execute(f'SELECT COUNT(*) FROM {self.table}').fetchone()[0]
+
+    def stats(self):
+        return {'backend': 'sqlite', 'name': self.name, 'entries': len(self),
+                'max_entries': self.max_entries, 'ttl': self.ttl, 'db_path': self.db_path}
+
+
+def create_backend(name, max_entries=1000, ttl=None, encode=None, decode=None, persist_dir=None):
+    """
+    STATE_BACKEND 설정에 맞는 저장소 생성
+    - 'memory' (기본): 프로세스 내 저장 (persist_dir 지정 시 JSON 파일로도 저장)
+    - 'sqlite': STATE_DB_PATH의 SQLite(WAL) 파일을 모든 워커 프로세스가 공유
+    name은 저장소 구분용 (SQLite 테이블 이름) - 영문/숫자/밑줄만 사용
+    """
+    if not name.replace('_', '').isalnum():
+        raise ValueError(f'저장소 이름이 올바르지 않습니다: {name}')
+    if STATE_BACKEND == 'sqlite':
+        return SQLiteBackend(name, STATE_DB_PATH, max_entries, ttl, encode, decode)
+    if STATE_BACKEND != 'memory':
+        raise ValueError(f'지원하지 않는 STATE_BACKEND: {STATE_BACKEND}')
+    return MemoryBackend(name, max_entries, ttl, encode, decode, persist_dir)
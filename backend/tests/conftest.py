@@ -0,0 +1,10 @@
+import os
+import sys
+
+# 백엔드 모듈은 backend/ 기준 최상위 import (app.py와 같은 방식)
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+# config.py는 import 시 ProductionConfig를 만들며 SECRET_KEY를 요구함
+os.environ.setdefault('SECRET_KEY', 'test-secret-key')
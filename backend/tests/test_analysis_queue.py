@@ -0,0 +1,148 @@
+import os
+import json
+import time
+import multiprocessing
+
+import pytest
+
+from services import analysis_queue
+from services.analysis_queue import AnalysisJobQueue, COMPLETED, CANCELLED, FAILED, RUNNING
+
+
+# 작업 프로세스에서 실행되는 테스트용 runner (spawn으로 전달되므로 모듈 최상위 함수)
+def _quick_runner(job_id, video_path, messages, cancel_event):
+    messages.put((job_id, 'progress', 50.0))
+    messages.put((job_id, COMPLETED, {'video': video_path}))
+
+
+def _failing_runner(job_id, video_path, messages, cancel_event):
+    raise SystemExit(3)
+
+
+def _sleep(seconds):
+    time.sleep(seconds)
+
+
+def _stuck_runner(job_id, video_path, messages, cancel_event):
+    """취소 요청을 무시하고 자식 프로세스를 띄운 채 멈춘 작업 (강제 종료 경로 확인용)"""
+    child = multiprocessing.get_context('spawn').Process(target=_sleep, args=(60,))
+    child.start()
+    messages.put((job_id, 'progress', float(child.pid)))
+    time.sleep(60)
+
+
+def _open_queue_in_child(jobs_dir):
+    AnalysisJobQueue(jobs_dir)
+
+
+def _wait_for(predicate, timeout=30):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.05)
+    return False
+
+
+def _process_gone(pid):
+    try:
+        with open(f'/proc/{pid}/stat') as f:
+            return f.read().split(')')[-1].split()[0] in ('Z', 'X')
+    except FileNotFoundError:
+        return True
+
+
+def test_job_runs_to_completion(tmp_path):
+    jobs = AnalysisJobQueue(str(tmp_path), runner=_quick_runner)
+    job_id = jobs.submit('/videos/a.mp4')['job_id']
+
+    assert _wait_for(lambda: jobs.status(job_id)['status'] == COMPLETED)
+    status = jobs.status(job_id)
+    assert status['progress'] == 100.0
+    assert status['result'] == {'video': '/videos/a.mp4'}
+    assert 'video_path' not in status
+    with open(os.path.join(str(tmp_path), f'{job_id}.json'), encoding='utf-8') as f:
+        assert json.load(f)['status'] == COMPLETED
+
+
+def test_crashed_job_is_marked_failed(tmp_path):
+    jobs = AnalysisJobQueue(str(tmp_path), runner=_failing_runner)
+    job_id = jobs.submit('/videos/a.mp4')['job_id']
+
+    assert _wait_for(lambda: jobs.status(job_id)['status'] == FAILED)
+    assert 'exit code 3' in jobs.status(job_id)['error']
+
+
+def test_queued_job_can_be_cancelled(tmp_path):
+    jobs = AnalysisJobQueue(str(tmp_path), max_running=0, runner=_quick_runner)
+    job_id = jobs.submit('/videos/a.mp4')['job_id']
+    assert jobs.status(job_id)['queue_position'] == 1
+
+    assert jobs.cancel(job_id)['status'] == CANCELLED
+
+
+def test_unfinished_jobs_fail_on_restart_but_not_in_child_processes(tmp_path):
+    jobs_dir = str(tmp_path)
+    job = {'job_id': 'a' * 32, 'status': RUNNING, 'progress': 10.0, 'created_at': time.time()}
+    with open(os.path.join(jobs_dir, f"{job['job_id']}.json"), 'w', encoding='utf-8') as f:
+        json.dump(job, f)
+
+    # spawn 자식이 app.py를 다시 import해 큐를 만들어도 실행 중인 작업을 건드리지 않아야 함
+    child = multiprocessing.get_context('spawn').Process(target=_open_queue_in_child, args=(jobs_dir,))
+    child.start()
+    child.join(30)
+    assert child.exitcode == 0
+    with open(os.path.join(jobs_dir, f"{job['job_id']}.json"), encoding='utf-8') as f:
+        assert json.load(f)['status'] == RUNNING
+
+    # 서버 프로세스가 재시작하면 중단된 작업으로 처리
+    assert AnalysisJobQueue(jobs_dir).status(job['job_id'])['status'] == FAILED
+
+
+def test_finished_jobs_are_evicted_after_ttl(tmp_path):
+    jobs = AnalysisJobQueue(str(tmp_path), max_running=0, finished_ttl=0.1)
+    job_id = jobs.submit('/videos/a.mp4')['job_id']
+    jobs.cancel(job_id)
+    time.sleep(0.2)
+
+    with jobs._lock:
+        jobs._evict_finished()
+    assert jobs.status(job_id) is None
+    assert not os.path.exists(os.path.join(str(tmp_path), f'{job_id}.json'))
+
+
+@pytest.mark.skipif(not hasattr(os, 'killpg'), reason='프로세스 그룹 종료는 POSIX 전용')
+def test_force_kill_takes_down_nested_workers(tmp_path, monkeypatch):
+    monkeypatch.setattr(analysis_queue, 'CANCEL_GRACE_SEC', 0.5)
+    jobs = AnalysisJobQueue(str(tmp_path), runner=_stuck_runner)
+    job_id = jobs.submit('/videos/a.mp4')['job_id']
+
+    assert _wait_for(lambda: jobs.status(job_id)['progress'] > 0)
+    child_pid = int(jobs.status(job_id)['progress'])
+    jobs.cancel(job_id)
+
+    assert _wait_for(lambda: jobs.status(job_id)['status'] == CANCELLED)
+    assert _wait_for(lambda: _process_gone(child_pid), timeout=10)
+
+
+@pytest.mark.skipif(not hasattr(os, 'killpg'), reason='프로세스 그룹 종료는 POSIX 전용')
+def test_shutdown_kills_running_jobs_and_their_workers(tmp_path):
+    jobs = AnalysisJobQueue(str(tmp_path), runner=_stuck_runner)
+    job_id = jobs.submit('/videos/a.mp4')['job_id']
+
+    assert _wait_for(lambda: jobs.status(job_id)['progress'] > 0)
+    child_pid = int(jobs.status(job_id)['progress'])
+    job_pid = jobs._running[job_id][0].pid
+    jobs.shutdown()
+    jobs.shutdown()
+
+    status = jobs.status(job_id)
+    assert status['status'] == FAILED
+    assert '서버 종료' in status['error']
+    assert _process_gone(job_pid)
+    assert _wait_for(lambda: _process_gone(child_pid), timeout=10)
+
+    # 종료 후에는 대기 중인 작업을 새로 시작하지 않음
+    queued_id = jobs.submit('/videos/b.mp4')['job_id']
+    time.sleep(1)
+    assert jobs.status(queued_id)['status'] == 'queued'
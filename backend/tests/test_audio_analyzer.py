@@ -0,0 +1,53 @@
+import numpy as np
+import pytest
+
+from audio_analyzer import SAMPLE_RATE, AudioAccumulator
+
+
+def _speech_like_signal(seconds=30, seed=0):
+    """음절 리듬(3~6Hz)으로 진폭이 변하는 발화 구간과 짧은 무음이 섞인 합성 신호 (int16)"""
+    rng = np.random.default_rng(seed)
+    t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+    rate = 4.5 + 1.5 * np.sin(2 * np.pi * t / 7)
+    envelope = np.clip(np.sin(2 * np.pi * np.cumsum(rate) / SAMPLE_RATE), 0, None)
+    speaking = (np.sin(2 * np.pi * t / 5) > -0.6).astype(np.float64)
+    signal = 0.5 * envelope * speaking * np.sin(2 * np.pi * 220 * t) + 0.001 * rng.standard_normal(len(t))
+    return (signal * 32767).astype(np.int16)
+
+
+def _count(samples, chunk_size):
+    accumulator = AudioAccumulator()
+    for start in range(0, len(samples), chunk_size):
+        accumulator.update(samples[start:start + chunk_size])
+    accumulator.finish()
+    return accumulator
+
+
+# 노이즈 바닥은 청크마다 갱신되므로 실제 청크 크기(1초) 안팎에서 비교 (발화 판정이 같아야 음절 수 비교가 의미 있음)
+@pytest.mark.parametrize('chunk_size', [SAMPLE_RATE, 7001, 2 * SAMPLE_RATE + 123])
+def test_chunked_syllable_count_matches_one_shot(chunk_size):
+    samples = _speech_like_signal()
+    one_shot = _count(samples, len(samples))
+    chunked = _count(samples, chunk_size)
+
+    assert one_shot.syllables > 0
+    assert chunked.voiced_frames == one_shot.voiced_frames
+    assert chunked.syllables == one_shot.syllables
+
+
+def test_one_shot_matches_whole_envelope_peaks():
+    samples = _speech_like_signal(seconds=10)
+    accumulator = _count(samples, len(samples))
+
+    # 전체 포락선에 mode='same' 이동 평균을 한 번 적용한 기준값
+    frame = int(SAMPLE_RATE * 0.03)
+    audio = samples.astype(np.float32) / 32768.0
+    frames = audio[:len(audio) // frame * frame].reshape(-1, frame)
+    rms = np.sqrt(np.mean(frames * frames, axis=1))
+    smooth = np.convolve(rms, np.ones(3, dtype=np.float32) / 3, mode='same')
+    peaks = np.zeros(len(smooth), dtype=bool)
+    peaks[1:-1] = (smooth[1:-1] > smooth[:-2]) & (smooth[1:-1] >= smooth[2:])
+    db = 20 * np.log10(np.maximum(rms, 1e-6))
+    voiced = db > max(-50.0, float(np.percentile(db, 10)) + 10.0)
+
+    assert accumulator.syllables == int((peaks & voiced).sum())
@@ -0,0 +1,63 @@
+import numbers
+
+import interview
+from interview import FALLBACK_METRICS, _calculate_total_score, analyze_video, generate_coaching_tips
+
+RESULT_KEYS = set(FALLBACK_METRICS) | {'totalScore'}
+
+
+def _video_metrics(**overrides):
+    metrics = {'posture': 80, 'headMove': 70, 'gaze': None, 'smile': None, 'blinkPerMin': None,
+               'environment': 4.0, 'frames_analyzed': 10, 'frames_detected': 10, 'face_frames': 0,
+               'duration_sec': 5.0}
+    metrics.update(overrides)
+    return metrics
+
+
+def _patch(monkeypatch, video, audio):
+    monkeypatch.setattr(interview, 'analyze_video_frames', lambda path, progress_callback=None: video)
+    monkeypatch.setattr(interview, 'analyze_audio', lambda path: audio)
+    # 영상이 있으면 무작위 시뮬레이션 값을 쓰지 않음
+    monkeypatch.setattr(interview, '_simulate_results', lambda: (_ for _ in ()).throw(AssertionError('simulated')))
+
+
+def test_unmeasured_metrics_use_documented_fallback(monkeypatch):
+    _patch(monkeypatch, _video_metrics(), None)
+
+    result = analyze_video('video.mp4')
+    results = result['results']
+
+    assert set(result) == {'results', 'tips'}
+    assert set(results) == RESULT_KEYS
+    assert all(isinstance(value, numbers.Number) for value in results.values())
+    assert (results['posture'], results['headMove'], results['environment']) == (80, 70, 4.0)
+    for key in ('gaze', 'smile', 'blinkPerMin', 'wpm', 'volume', 'filler', 'silence', 'expression', 'ending'):
+        assert results[key] == FALLBACK_METRICS[key]
+    assert results['totalScore'] == _calculate_total_score(results)
+    assert result['tips']
+
+
+def test_measured_values_are_not_adjusted(monkeypatch):
+    audio = {'wpm': 170, 'volume': 60, 'filler': 20, 'silence': 5}
+    _patch(monkeypatch, _video_metrics(gaze=40, smile=30, blinkPerMin=12), audio)
+
+    results = analyze_video('video.mp4')['results']
+
+    assert results['wpm'] == 170
+    assert results['filler'] == 20
+    assert results['gaze'] == 40
+
+
+def test_fallback_values_produce_no_metric_tips():
+    results = dict(FALLBACK_METRICS)
+    results['totalScore'] = _calculate_total_score(results)
+
+    # 측정하지 못한 항목이 코칭 팁(말속도/시선/불필요어/미소/자세)을 만들지 않음 → 총평 + 기본 팁만
+    tips = generate_coaching_tips(results)
+    assert not any(marker in tip for tip in tips for marker in ('🗣️', '⏱️', '👀', '🧩', '😊', '🙂', '💺'))
+
+
+def test_without_video_returns_simulation():
+    results = analyze_video()['results']
+    assert set(results) == RESULT_KEYS
+    assert all(isinstance(value, numbers.Number) for value in results.values())
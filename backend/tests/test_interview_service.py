@@ -0,0 +1,145 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from services.interview_service import InterviewService
+
+QUESTIONS = [{'text': f'질문 {i}', 'difficulty': '중급', 'timeLimit': 180} for i in range(3)]
+
+
+@pytest.fixture
+def service():
+    service = InterviewService()
+    service.use_ai = True
+    yield service
+    service._refine_executor.shutdown(wait=True)
+
+
+def _items(count):
+    return [{'question': f'질문 {i}', 'answer': f'답변 {i}', 'time_taken': 60, 'max_time': 180}
+            for i in range(count)]
+
+
+def test_evaluate_answers_keeps_order_and_limits_concurrency(service, monkeypatch):
+    lock = threading.Lock()
+    active = peak = 0
+
+    def fake_claude(question, answer, time_taken, max_time):
+        nonlocal active, peak
+        with lock:
+            active += 1
+            peak = max(peak, active)
+        # 뒤 항목일수록 빨리 끝나도록 해 완료 순서와 결과 순서를 다르게 만듦
+        time.sleep(0.02 * (10 - int(answer.split()[-1])))
+        with lock:
+            active -= 1
+        return {'score': int(answer.split()[-1]), 'feedback': answer}
+
+    monkeypatch.setattr(service, '_evaluate_with_claude', fake_claude)
+
+    results = asyncio.run(service.evaluate_answers(_items(9), max_concurrency=3))
+
+    assert [result['score'] for result in results] == list(range(9))
+    assert peak == 3
+
+
+def test_evaluate_answers_falls_back_to_rule_based(service, monkeypatch):
+    monkeypatch.setattr(service, '_evaluate_with_claude', lambda *args: None)
+
+    results = asyncio.run(service.evaluate_answers(_items(2), max_concurrency=2))
+
+    assert len(results) == 2
+    for result in results:
+        assert 0 <= result['score'] <= 100
+        assert result['feedback']
+
+
+def _wait_for(predicate, timeout=5):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+def test_speculative_returns_rule_score_then_refines(service, monkeypatch):
+    release = threading.Event()
+
+    def fake_claude(question, answer, time_taken, max_time):
+        release.wait(5)
+        return {'score': 97, 'feedback': 'Claude 피드백'}
+
+    monkeypatch.setattr(service, '_evaluate_with_claude', fake_claude)
+    session_id = service.create_session(QUESTIONS)
+
+    result = service.evaluate_answer_speculative('질문 1', '답변입니다', 60, 180, session_id=session_id)
+
+    assert result['status'] == 'pending'
+    assert result['question_index'] == 1
+    assert service.get_evaluation(result['evaluation_id'])['status'] == 'pending'
+    assert service.get_report_data(session_id)['scores'] == [result['score']]
+
+    release.set()
+    assert _wait_for(lambda: service.get_evaluation(result['evaluation_id'])['status'] == 'done')
+    evaluation = service.get_evaluation(result['evaluation_id'])
+    assert (evaluation['score'], evaluation['refined']) == (97, True)
+    assert service.get_report_data(session_id)['scores'] == [97]
+
+
+def test_late_refinement_does_not_overwrite_new_answer(service, monkeypatch):
+    release = threading.Event()
+
+    def fake_claude(question, answer, time_taken, max_time):
+        if answer == '첫 답변':
+            release.wait(5)
+            return {'score': 10, 'feedback': '늦은 평가'}
+        return None
+
+    monkeypatch.setattr(service, '_evaluate_with_claude', fake_claude)
+    session_id = service.create_session(QUESTIONS)
+    first = service.evaluate_answer_speculative('질문 0', '첫 답변', 60, 180, session_id=session_id)
+    second = service.evaluate_answer_speculative('질문 0', '다시 한 답변', 60, 180, session_id=session_id,
+                                                 question_index=first['question_index'])
+
+    release.set()
+    assert _wait_for(lambda: service.get_evaluation(first['evaluation_id'])['status'] == 'done')
+    report = service.get_report_data(session_id)
+    assert report['answers'] == ['다시 한 답변']
+    assert report['scores'] == [second['score']]
+
+
+def test_speculative_without_ai_is_final(service):
+    service.use_ai = False
+
+    result = service.evaluate_answer_speculative('질문 0', '답변입니다', 60, 180)
+
+    assert result['status'] == 'done'
+    assert result['evaluation_id'] is None
+
+
+def test_pending_refinements_are_capped(service, monkeypatch):
+    release = threading.Event()
+    calls = []
+
+    def fake_claude(question, answer, time_taken, max_time):
+        calls.append(answer)
+        release.wait(5)
+        return {'score': 90, 'feedback': 'Claude 피드백'}
+
+    monkeypatch.setattr(service, '_evaluate_with_claude', fake_claude)
+    monkeypatch.setattr(service, '_refine_slots', threading.BoundedSemaphore(2))
+
+    results = [service.evaluate_answer_speculative('질문', f'답변 {i}', 60, 180) for i in range(3)]
+
+    assert [result['status'] for result in results] == ['pending', 'pending', 'done']
+    assert results[2]['evaluation_id'] is None
+
+    release.set()
+    assert _wait_for(lambda: all(service.get_evaluation(result['evaluation_id'])['status'] == 'done'
+                                 for result in results[:2]))
+    # 끝난 평가의 자리는 반납됨
+    assert _wait_for(lambda: service.evaluate_answer_speculative('질문', '답변 3', 60, 180)['status'] == 'pending')
+    assert '답변 2' not in calls
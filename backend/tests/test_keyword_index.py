@@ -0,0 +1,66 @@
+import random
+
+import pytest
+
+import keyword_index
+from keyword_index import KeywordIndex
+
+TIERS = {
+    'high': ['성장과정', '지원동기', '입사 후 포부', '포부'],
+    'medium': ['성격', '장단점', '자기소개', '강점', '약점'],
+    'low': ['경험', '계획', '목표', '협업', '팀워크', '협업 경험', '?', '(a+b)'],
+}
+
+
+def _reference(tiers, text):
+    """우선순위 순서로 부분 문자열 검색 (변경 전 대체 구현)"""
+    keywords = [(keyword, tier) for tier, words in tiers.items() for keyword in words]
+    matched = [keyword for keyword, _ in keywords if keyword in text]
+    ordered = list(dict.fromkeys(matched))
+    best = next(((keyword, tier) for keyword, tier in keywords if keyword in text), None)
+    return ordered, best
+
+
+@pytest.fixture(params=['regex', 'ahocorasick'])
+def make_index(request, monkeypatch):
+    if request.param == 'regex':
+        monkeypatch.setattr(keyword_index, 'ahocorasick', None)
+    elif keyword_index.ahocorasick is None:
+        pytest.skip('pyahocorasick 미설치')
+
+    def make(tiers):
+        index = KeywordIndex(tiers)
+        assert index.backend == request.param
+        return index
+    return make
+
+
+def _random_texts(count=2000, seed=41):
+    rng = random.Random(seed)
+    pieces = ['성장', '과정', '성장과정', '입사 후 ', '포부', '협업', ' 경험', '장단', '점', '자기', '소개',
+              '강점', '?', '(a+b)', 'a+b', ' ', '\n', '목표', '계획을', '팀워크']
+    return [''.join(rng.choice(pieces) for _ in range(rng.randint(0, 12))) for _ in range(count)]
+
+
+def test_matches_reference_on_random_texts(make_index):
+    index = make_index(TIERS)
+    for text in _random_texts():
+        expected_matched, expected_best = _reference(TIERS, text)
+        assert index.matched(text) == expected_matched, text
+        assert index.classify(text) == expected_best, text
+        assert index.contains_any(text) == bool(expected_matched), text
+
+
+def test_prefix_keywords_at_same_position(make_index):
+    index = make_index(TIERS)
+
+    assert index.matched('협업 경험을 말해주세요') == ['경험', '협업', '협업 경험']
+    assert index.classify('입사 후 포부') == ('입사 후 포부', 'high')
+
+
+def test_duplicate_and_empty_keywords(make_index):
+    index = make_index({'a': ['경험', ''], 'b': ['경험', '계획']})
+
+    assert index.classify('계획과 경험') == ('경험', 'a')
+    assert index.matched('') == []
+    assert not KeywordIndex([]).contains_any('아무 텍스트')
@@ -0,0 +1,85 @@
+import io
+
+import pytest
+from PIL import Image
+
+from cache_util import PerceptualHashCache
+from services import ocr_service
+from services.ocr_service import ocr_result_ok, jamo_ratio
+
+
+@pytest.mark.parametrize('text', [
+    '1. 지원 동기와 입사 후 포부를 작성해 주세요. (500자 이내)\n2. 본인의 강점을 구체적인 경험과 함께 서술하시오.',
+    '문항 1 팀 프로젝트에서 갈등을 극복한 경험을 말씀해 주십시오',
+    '■ 성장과정 및 학창 시절 경험을 소개해주세요',
+])
+def test_accepts_question_text(text):
+    assert ocr_result_ok(text)
+
+
+@pytest.mark.parametrize('text', [
+    # 낱자모가 섞인 깨진 인식 결과
+    'ㅇ료ㅓ 가나다라 마바사 아자차 카타파하 이런 글',
+    '1. 지원 ㅎ동ㄱ기와 입ㅅ사 후 포ㅂ부를 작성해 주세요',
+    # 한글 비율은 높지만 질문 번호/표현이 없는 결과
+    '가나다라 마바사 아자차 카타파하 이런 글이 있다',
+    # 너무 짧은 결과
+    '1. 지원동기?',
+])
+def test_rejects_garbled_or_unmarked_text(text):
+    assert not ocr_result_ok(text)
+
+
+def test_jamo_ratio():
+    assert jamo_ratio('지원 동기') == 0.0
+    assert jamo_ratio('ㅇ료ㅓ') == pytest.approx(2 / 3)
+    assert jamo_ratio('abc') == 0.0
+
+
+def _png_bytes():
+    image = Image.new('RGB', (120, 60), 'white')
+    buffer = io.BytesIO()
+    image.save(buffer, format='PNG')
+    return buffer.getvalue()
+
+
+@pytest.fixture
+def fake_ocr(monkeypatch):
+    """tesseract/전처리를 고정 결과로 대체하고 빈 캐시 사용 (Vision은 꺼 둠)"""
+    outputs = {'text': ''}
+    calls = []
+
+    def extract(image, psm):
+        calls.append(psm)
+        return outputs['text']
+
+    monkeypatch.setattr(ocr_service, '_tesseract_extract', extract)
+    monkeypatch.setattr(ocr_service, 'preprocess_image_for_ocr', lambda image: image)
+    monkeypatch.setattr(ocr_service, '_question_cache', PerceptualHashCache(max_entries=8))
+    return outputs, calls
+
+
+def test_rejected_fallback_is_not_cached(fake_ocr):
+    outputs, calls = fake_ocr
+    outputs['text'] = 'ㅇ료ㅓ 가나다라 마바사 아자차 카타파하 이런 글'
+
+    text, strategy = ocr_service.extract_question_from_image(_png_bytes(), use_vision=False)
+    assert text == outputs['text']
+    assert strategy != 'cache'
+
+    outputs['text'] = '1. 지원 동기와 입사 후 포부를 작성해 주세요. (500자 이내)'
+    text, strategy = ocr_service.extract_question_from_image(_png_bytes(), use_vision=False)
+    assert text == outputs['text']
+    assert strategy != 'cache'
+
+
+def test_accepted_result_is_cached(fake_ocr):
+    outputs, calls = fake_ocr
+    outputs['text'] = '1. 지원 동기와 입사 후 포부를 작성해 주세요. (500자 이내)'
+
+    ocr_service.extract_question_from_image(_png_bytes(), use_vision=False)
+    call_count = len(calls)
+    text, strategy = ocr_service.extract_question_from_image(_png_bytes(), use_vision=False)
+
+    assert (text, strategy) == (outputs['text'], 'cache')
+    assert len(calls) == call_count
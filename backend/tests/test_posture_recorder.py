@@ -0,0 +1,45 @@
+import os
+
+import numpy as np
+
+from posture_recorder import COLUMNS, PostureSessionRecorder
+
+
+def _result(diff, status='normal'):
+    return {'current_score': 0.9, 'difference': diff, 'status': status, 'current_landmarks': [[0.1, 0.2, 0.3]] * 33}
+
+
+def test_record_and_summarize(tmp_path):
+    recorder = PostureSessionRecorder(str(tmp_path))
+    session_id = recorder.start_session('user1')
+    started = recorder._read_meta('user1', session_id)['started_at']
+    for i, status in enumerate(['normal', 'normal', 'alert', 'alert']):
+        recorder.record('user1', _result(0.1 * i, status), session_id, timestamp=started + i)
+
+    summary = recorder.summarize('user1', session_id)
+    assert summary['frames'] == 4
+    assert summary['status_percent']['alert'] == 50.0
+
+
+def test_partial_write_is_truncated_before_next_record(tmp_path):
+    recorder = PostureSessionRecorder(str(tmp_path))
+    session_id = recorder.start_session('user1')
+    started = recorder._read_meta('user1', session_id)['started_at']
+    for i in range(3):
+        recorder.record('user1', _result(0.1), session_id, timestamp=started + i)
+
+    # 크래시 흉내: score/diff 컬럼에만 한 프레임이 더 쓰이고, landmarks 컬럼에는 일부 바이트만 기록됨
+    session_dir = recorder._session_dir('user1', session_id)
+    for column in ('score', 'diff'):
+        with open(os.path.join(session_dir, COLUMNS[column][0]), 'ab') as f:
+            f.write(np.array([0.9], dtype=np.float16).tobytes())
+    with open(os.path.join(session_dir, COLUMNS['landmarks'][0]), 'ab') as f:
+        f.write(b'\x00' * 7)
+
+    recorder.record('user1', _result(0.5, 'alert'), session_id, timestamp=started + 3)
+
+    sizes = {column: os.path.getsize(os.path.join(session_dir, filename)) // recorder._column_itemsize(column)
+             for column, (filename, _) in COLUMNS.items()}
+    assert set(sizes.values()) == {4}
+    diff = np.asarray(recorder._load_column(session_dir, 'diff'), dtype=np.float32)
+    assert np.allclose(diff, [0.1, 0.1, 0.1, 0.5], atol=1e-3)
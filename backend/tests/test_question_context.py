@@ -0,0 +1,66 @@
+from question_context import QUESTION_PHRASES, compact_question_text, iter_question_segments
+
+
+def _posting_with_questions_last(question_lines, filler_lines=300):
+    """회사 소개/업무 설명이 길게 이어지고 자기소개서 문항이 맨 끝에 있는 채용 공고"""
+    lines = ['[채용 공고] 2026년 하반기 신입사원 모집']
+    for i in range(filler_lines):
+        lines.append(f'당사는 {i}번째 사업 분야에서 핵심 기술을 개발하고 고객에게 제품 사용법을 설명하는 업무를 수행합니다.')
+        lines.append(f'지원서 작성 시 참고 사항 {i}: 모든 서류는 온라인으로 제출합니다.')
+    lines.append('')
+    lines.append('자기소개서 문항')
+    lines.extend(question_lines)
+    return '\n'.join(lines)
+
+
+QUESTIONS = [
+    '1. 지원 동기와 입사 후 포부를 작성해 주세요. (500자)',
+    '2. 본인의 강점을 구체적인 경험과 함께 기술하시오. (700자)',
+    '3. 팀 프로젝트에서 갈등을 어떻게 해결했는지 말씀해 주십시오.',
+]
+
+
+def test_generic_nouns_are_not_question_phrases():
+    assert not QUESTION_PHRASES.contains_any('당사는 핵심 기술을 개발하고 제품 사용법을 설명합니다.')
+    assert QUESTION_PHRASES.contains_any('지원 동기를 작성해 주세요')
+
+
+def test_long_posting_keeps_questions_at_the_end():
+    text = _posting_with_questions_last(QUESTIONS)
+    assert len(text) > 4000
+
+    compacted = compact_question_text(text, max_chars=1000)
+
+    assert len(compacted) <= 1000
+    for question in QUESTIONS:
+        assert question in compacted
+    assert '핵심 기술을 개발' not in compacted
+
+
+def test_numbered_questions_rank_before_phrase_only_lines():
+    phrase_lines = [f'궁금한 점은 {i}번 담당자에게 문의 바랍니다.' for i in range(200)]
+    text = '\n'.join(phrase_lines + [''] + QUESTIONS)
+
+    compacted = compact_question_text(text, max_chars=600)
+
+    for question in QUESTIONS:
+        assert question in compacted
+
+
+def test_overflowing_line_is_skipped_not_terminal():
+    long_question = '1. ' + '회사의 비전과 본인의 목표를 연결하여 서술하시오. ' * 6
+    text = '\n'.join([long_question, '2. 지원 동기를 작성해 주세요.', '3. 본인의 강점은 무엇입니까?'] + ['본문'] * 2000)
+
+    compacted = compact_question_text(text, max_chars=120)
+
+    assert long_question not in compacted
+    assert '2. 지원 동기를 작성해 주세요.' in compacted
+    assert '3. 본인의 강점은 무엇입니까?' in compacted
+
+
+def test_context_heading_window_is_kept():
+    lines = ['인재상', '도전하는 사람', '협력하는 사람'] + ['본문 내용입니다.'] * 500 + QUESTIONS
+    segments = list(iter_question_segments(lines, window_lines=2))
+
+    assert [kind for _, kind, _ in segments[:3]] == ['context', 'context', 'context']
+    assert [line for _, kind, line in segments if kind == 'question'] == QUESTIONS
@@ -0,0 +1,158 @@
+import glob
+import os
+import random
+import re
+from collections import Counter
+
+import cv2
+import numpy as np
+import pytest
+from PIL import Image
+
+import self_util
+import text_patterns as patterns
+from self_util import _remove_small_components, noise_min_area
+
+SCREENSHOT = os.path.join(os.path.dirname(__file__), '..', '..', 'docs', 'assets', '질문4-스크린샷1.png')
+
+
+def _small_components(binary, max_area=10):
+    """면적 2 이상 max_area 미만인 검은 연결 요소의 (x, y, w, h, area) 집합"""
+    _, _, stats, _ = cv2.connectedComponentsWithStats(cv2.bitwise_not(binary), connectivity=8)
+    return {tuple(row) for row in stats[1:].tolist() if 2 <= row[cv2.CC_STAT_AREA] < max_area}
+
+
+def test_noise_threshold_scales_with_char_height():
+    assert noise_min_area(9) == 2
+    assert noise_min_area(20) == 9
+    assert noise_min_area(60) == 81
+
+
+def test_keeps_period_next_to_glyph_and_removes_isolated_speck():
+    binary = np.full((40, 120), 255, np.uint8)
+    binary[10:19, 10:13] = 0   # "1" (글자 높이 9px)
+    binary[17:19, 15:17] = 0   # "." 바로 옆
+    binary[10:19, 20:26] = 0   # 다음 글자
+    binary[30:32, 100:102] = 0  # 글자와 떨어진 점
+
+    removed = _remove_small_components(binary, min_area=10)
+
+    assert removed == 1
+    assert (binary[17:19, 15:17] == 0).all()
+    assert (binary[30:32, 100:102] == 255).all()
+
+
+
+def test_removes_many_specks_and_sparse_component_only_on_their_own_pixels():
+    binary = np.full((400, 400), 255, np.uint8)
+    binary[10:19, 10:16] = 0    # 글자
+    binary[100:400:20, 100:400:20] = 0  # 떨어진 점 225개
+    binary[40:46, 200:206][np.eye(6, dtype=bool)] = 0  # bounding box 대부분이 빈 대각선 요소
+    binary[40:48, 300:308][np.eye(8, dtype=bool)[::-1]] = 0
+    glyph = binary[10:19, 10:16].copy()
+
+    removed = _remove_small_components(binary, min_area=10)
+
+    assert removed == 15 * 15 + 2
+    assert (binary[10:19, 10:16] == glyph).all()
+    assert (binary[20:] == 255).all()
+
+
+@pytest.mark.parametrize('scale', [1.0, 0.6, 0.45])
+def test_screenshot_punctuation_survives_downscaling(scale):
+    image = Image.open(SCREENSHOT).convert('L')
+    image = image.resize((int(image.width * scale), int(image.height * scale)), Image.Resampling.LANCZOS)
+    enhanced = cv2.createCLAHE(clipLimit=3.0, tileGridSize=(8, 8)).apply(np.asarray(image))
+    _, binary = cv2.threshold(enhanced, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+    punctuation = _small_components(binary)
+
+    _remove_small_components(binary)
+
+    assert punctuation
+    assert punctuation <= _small_components(binary)
+
+
+# ----------------------------------------------------
+# detect_and_convert_symbols: ■ 처리를 findall + sub에서 subn 한 번으로 바꾼 뒤에도 결과가 같은지 비교
+# ----------------------------------------------------
+ASSETS = os.path.join(os.path.dirname(__file__), '..', '..', 'docs', 'assets')
+
+
+def _reference_detect_and_convert_symbols(text):
+    """변경 전 구현 (로그 출력만 제외)"""
+    square_matches = patterns.SQUARE_ITEM.findall(text)
+
+    if square_matches:
+        converted_text = text
+        question_number = 1
+
+        def replace_square_with_number(match):
+            nonlocal question_number
+            content = match.group(1).strip()
+            result = f"\n{question_number}. {content}"
+            question_number += 1
+            return result
+
+        converted_text = patterns.SQUARE_ITEM.sub(replace_square_with_number, converted_text)
+        return converted_text
+
+    special_chars = patterns.SPECIAL_CHAR.findall(text)
+    if not special_chars:
+        return text
+
+    char_counts = Counter(special_chars)
+    potential_markers = [char for char, count in char_counts.items()
+                         if count >= 2 and self_util.is_question_marker(text, char)]
+
+    converted_text = text
+    question_number = 1
+    for marker in potential_markers:
+        pattern = patterns.marker_pattern(marker)
+
+        def replace_with_number(match):
+            nonlocal question_number
+            content = match.group(1).strip()
+            result = f"\n{question_number}. {content}"
+            question_number += 1
+            return result
+
+        converted_text = pattern.sub(replace_with_number, converted_text)
+
+    return converted_text
+
+
+def _sample_texts():
+    """예시 텍스트 원본 + 번호를 ■/◆/※ 기호로 바꾼 변형"""
+    texts = {}
+    for path in sorted(glob.glob(os.path.join(ASSETS, '*.txt'))):
+        with open(path, encoding='utf-8') as f:
+            text = f.read()
+        name = os.path.basename(path)
+        texts[name] = text
+        for marker in ('■', '◆', '※'):
+            texts[f'{name} ({marker})'] = re.sub(r'(?m)^\s*\d+\.\s*', f'{marker} ', text)
+    return texts
+
+
+def _random_texts(pieces, count, seed):
+    rng = random.Random(seed)
+    return [''.join(rng.choice(pieces) for _ in range(rng.randint(0, 40))) for _ in range(count)]
+
+
+# ■ 항목 위주 / ■ 없이 여러 구분자 기호(◆, ※, -, ·, :)가 섞이거나 서로의 항목 안에 들어가는 텍스트
+SQUARE_PIECES = ['■', '■ ', '◆ ', '※', '\n', ' ', '1. ', '지원동기', '성장과정을 작성해주세요', '경험', '장단점',
+                 '입사 후 포부', 'abc', '■■', '  ', '.', '?', '(500자)', '본인의 강점을 설명해주세요']
+MARKER_PIECES = ['◆ ', '◆', '※ ', '- ', '·', ': ', '\n', '\n\n', ' ', '   ', '지원동기', '성장과정', '경험',
+                 '강점과 약점', '입사 후 포부를 작성해주세요', '협업 경험', 'abc', '(500자 이내)', '◆◆', '※※',
+                 '가나다라마바사아자차카타파하가나다라마바사아자차카타파하']
+
+
+@pytest.mark.parametrize('name, text', sorted(_sample_texts().items()))
+def test_detect_and_convert_symbols_matches_reference_on_samples(name, text):
+    assert self_util.detect_and_convert_symbols(text) == _reference_detect_and_convert_symbols(text)
+
+
+@pytest.mark.parametrize('pieces, seed', [(SQUARE_PIECES, 43), (MARKER_PIECES, 44)])
+def test_detect_and_convert_symbols_matches_reference_on_random_texts(pieces, seed):
+    for text in _random_texts(pieces, 3000, seed):
+        assert self_util.detect_and_convert_symbols(text) == _reference_detect_and_convert_symbols(text), text
@@ -0,0 +1,111 @@
+import pytest
+
+import state_backend
+from session_store import SessionStore
+from state_backend import MemoryBackend, SQLiteBackend
+
+
+class FakeClock:
+    def __init__(self, now=1_000_000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(state_backend.time, 'time', fake)
+    return fake
+
+
+@pytest.fixture(params=['memory', 'sqlite'])
+def make_backend(request, tmp_path):
+    def make(max_entries=1000, ttl=None):
+        if request.param == 'sqlite':
+            return SQLiteBackend('test', str(tmp_path / 'state.db'), max_entries, ttl)
+        return MemoryBackend('test', max_entries, ttl)
+    return make
+
+
+def test_entries_expire_after_ttl(make_backend, clock):
+    backend = make_backend(ttl=60)
+    backend.set('a', {'n': 1})
+
+    clock.now += 59
+    assert backend.get('a') == {'n': 1}
+    clock.now += 2
+    assert backend.get('a') is None
+    assert backend.update('a', lambda value: (value, 'updated')) is None
+
+
+def test_oldest_entries_evicted_over_max_entries(make_backend, clock):
+    backend = make_backend(max_entries=3)
+    for key in 'abcd':
+        backend.set(key, key)
+        clock.now += 1
+
+    assert backend.get('a') is None
+    assert [backend.get(key) for key in 'bcd'] == ['b', 'c', 'd']
+    assert len(backend) == 3
+
+
+def test_update_is_applied_and_refreshes_ttl(make_backend, clock):
+    backend = make_backend(ttl=60)
+    backend.set('a', {'n': 1})
+
+    clock.now += 50
+    assert backend.update('a', lambda value: ({'n': value['n'] + 1}, 'ok')) == 'ok'
+    clock.now += 50
+    assert backend.get('a') == {'n': 2}
+
+
+def test_purge_expired_counts_removed(make_backend, clock):
+    backend = make_backend(ttl=60)
+    backend.set('old', 1)
+    clock.now += 30
+    backend.set('new', 2)
+    clock.now += 31
+
+    assert backend.purge_expired() == 1
+    assert backend.get('old') is None
+    assert backend.get('new') == 2
+
+
+def test_sqlite_write_purges_expired_rows(tmp_path, clock):
+    backend = SQLiteBackend('test', str(tmp_path / 'state.db'), max_entries=1000, ttl=60)
+    for i in range(10):
+        backend.set(f'old{i}', i)
+    clock.now += 61
+
+    backend.set('new', 'x')
+
+    assert len(backend) == 1
+    assert backend.stats()['entries'] == 1
+
+
+def test_sqlite_shared_between_instances(tmp_path, clock):
+    path = str(tmp_path / 'state.db')
+    first = SQLiteBackend('test', path, ttl=60)
+    second = SQLiteBackend('test', path, ttl=60)
+
+    first.set('a', [1, 2])
+    assert second.update('a', lambda value: (value + [3], len(value))) == 2
+    assert first.get('a') == [1, 2, 3]
+
+
+def test_session_store_expires_and_evicts(clock):
+    store = SessionStore(max_sessions=2, ttl=60)
+    questions = [{'text': '자기소개를 해주세요', 'difficulty': 'easy', 'timeLimit': 60}]
+    first = store.create(questions)
+    clock.now += 1
+    second = store.create(questions)
+    clock.now += 1
+    third = store.create(questions)
+
+    assert store.get(first) is None
+    assert store.record_answer(second, '답변', 80, '좋음') == 0
+    clock.now += 61
+    assert store.get(second) is None
+    assert store.get(third) is None
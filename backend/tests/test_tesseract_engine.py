@@ -0,0 +1,84 @@
+import subprocess
+import threading
+from types import SimpleNamespace
+
+from services import tesseract_engine
+from services.tesseract_engine import TesseractPool, find_tessdata_path
+
+
+class FakeAPI:
+    created = 0
+    lock = threading.Lock()
+
+    def __init__(self, path=None, lang=None, oem=None):
+        with FakeAPI.lock:
+            FakeAPI.created += 1
+        self.path = path
+        self.psm = None
+
+    def SetPageSegMode(self, psm):
+        self.psm = psm
+
+    def SetImage(self, image):
+        self.image = image
+
+    def GetUTF8Text(self):
+        return f'text psm={self.psm} path={self.path}'
+
+    def Clear(self):
+        self.image = None
+
+
+def _fake_tesserocr(monkeypatch):
+    FakeAPI.created = 0
+    monkeypatch.setattr(tesseract_engine, 'tesserocr', SimpleNamespace(PyTessBaseAPI=FakeAPI,
+                                                                       OEM=SimpleNamespace(DEFAULT=3)))
+
+
+def test_tessdata_path_prefers_environment(monkeypatch):
+    monkeypatch.setenv('TESSDATA_PREFIX', '/opt/tessdata')
+    assert find_tessdata_path() == '/opt/tessdata'
+
+
+def test_tessdata_path_from_cli(monkeypatch):
+    monkeypatch.delenv('TESSDATA_PREFIX', raising=False)
+    output = b'List of available languages in "/usr/share/tesseract-ocr/5/tessdata/" (3):\neng\nkor\nosd\n'
+    monkeypatch.setattr(tesseract_engine.subprocess, 'run',
+                        lambda *args, **kwargs: subprocess.CompletedProcess(args, 0, output, b''))
+    assert find_tessdata_path() == '/usr/share/tesseract-ocr/5/tessdata/'
+
+
+def test_tessdata_path_without_cli(monkeypatch):
+    monkeypatch.delenv('TESSDATA_PREFIX', raising=False)
+
+    def missing(*args, **kwargs):
+        raise FileNotFoundError('tesseract')
+
+    monkeypatch.setattr(tesseract_engine.subprocess, 'run', missing)
+    assert find_tessdata_path() is None
+
+
+def test_engines_are_loaded_once_and_reused(monkeypatch):
+    _fake_tesserocr(monkeypatch)
+    monkeypatch.setenv('TESSDATA_PREFIX', '/opt/tessdata')
+    pool = TesseractPool(size=2)
+    pool.warm_up()
+
+    results = [pool.image_to_string(object(), psm) for psm in (4, 6, 4, 6)]
+
+    assert FakeAPI.created == 1
+    assert results[:2] == ['text psm=4 path=/opt/tessdata', 'text psm=6 path=/opt/tessdata']
+
+
+def test_concurrent_calls_create_at_most_size_engines(monkeypatch):
+    _fake_tesserocr(monkeypatch)
+    monkeypatch.setenv('TESSDATA_PREFIX', '/opt/tessdata')
+    pool = TesseractPool(size=2)
+
+    threads = [threading.Thread(target=pool.image_to_string, args=(object(), 6)) for _ in range(16)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert 1 <= FakeAPI.created <= 2
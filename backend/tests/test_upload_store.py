@@ -0,0 +1,82 @@
+import hashlib
+import io
+import os
+
+import pytest
+
+from upload_store import ContentStore, UploadError
+
+
+def _payload(size):
+    return bytes((i * 7 + 3) % 251 for i in range(size))
+
+
+def _sha256(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def test_resumable_upload_matches_content_hash(tmp_path):
+    store = ContentStore(str(tmp_path))
+    data = _payload(10000)
+    meta = store.start_upload('answer.webm', len(data))
+
+    for offset in range(0, len(data), 3000):
+        store.append_chunk(meta['upload_id'], offset, io.BytesIO(data[offset:offset + 3000]))
+    result = store.complete_upload(meta['upload_id'])
+
+    assert result['sha256'] == _sha256(data)
+    with open(store.path_for(result['content_id']), 'rb') as f:
+        assert f.read() == data
+
+
+def test_chunks_split_across_store_instances(tmp_path):
+    # gunicorn 워커 두 개가 같은 저장소 디렉터리를 공유하는 상황
+    first = ContentStore(str(tmp_path))
+    second = ContentStore(str(tmp_path))
+    data = _payload(9000)
+    upload_id = first.start_upload('answer.webm', len(data))['upload_id']
+
+    first.append_chunk(upload_id, 0, io.BytesIO(data[:3000]))
+    second.append_chunk(upload_id, 3000, io.BytesIO(data[3000:6000]))
+    first.append_chunk(upload_id, 6000, io.BytesIO(data[6000:]))
+    result = first.complete_upload(upload_id)
+
+    assert result['sha256'] == _sha256(data)
+
+
+def test_complete_on_instance_without_hash_state(tmp_path):
+    first = ContentStore(str(tmp_path))
+    data = _payload(5000)
+    upload_id = first.start_upload('answer.webm', len(data))['upload_id']
+    first.append_chunk(upload_id, 0, io.BytesIO(data))
+
+    result = ContentStore(str(tmp_path)).complete_upload(upload_id)
+
+    assert result['sha256'] == _sha256(data)
+
+
+def test_offset_mismatch_reports_received(tmp_path):
+    store = ContentStore(str(tmp_path))
+    data = _payload(4000)
+    upload_id = store.start_upload('answer.webm', len(data))['upload_id']
+    store.append_chunk(upload_id, 0, io.BytesIO(data[:1000]))
+
+    with pytest.raises(UploadError) as excinfo:
+        store.append_chunk(upload_id, 2000, io.BytesIO(data[2000:]))
+
+    assert excinfo.value.status_code == 409
+    assert excinfo.value.details['received'] == 1000
+
+
+def test_same_content_is_stored_once(tmp_path):
+    store = ContentStore(str(tmp_path))
+    data = _payload(2048)
+
+    first = store.save_stream(io.BytesIO(data), 'a.webm')
+    upload_id = store.start_upload('b.webm', len(data))['upload_id']
+    store.append_chunk(upload_id, 0, io.BytesIO(data))
+    second = store.complete_upload(upload_id)
+
+    assert second['deduplicated']
+    assert first['content_id'] == second['content_id']
+    assert len(os.listdir(os.path.join(str(tmp_path), 'objects', first['content_id'][:2]))) == 1
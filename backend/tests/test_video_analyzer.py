@@ -0,0 +1,24 @@
+import video_analyzer
+
+
+class _FakeCapture:
+    def __init__(self, fps, frame_count):
+        self.values = {video_analyzer.cv2.CAP_PROP_FPS: fps, video_analyzer.cv2.CAP_PROP_FRAME_COUNT: frame_count}
+
+    def get(self, prop):
+        return self.values[prop]
+
+    def release(self):
+        pass
+
+
+def test_duration_from_container_header(monkeypatch):
+    monkeypatch.setattr(video_analyzer.cv2, 'VideoCapture', lambda path: _FakeCapture(30.0, 300.0))
+    assert video_analyzer.get_video_duration('video.mp4') == 10.0
+
+
+def test_invalid_frame_count_never_gives_negative_duration(monkeypatch):
+    # 일부 webm은 프레임 수가 음수/0으로 나옴 → ffprobe도 없으면 0 (음수 길이 금지)
+    monkeypatch.setattr(video_analyzer.cv2, 'VideoCapture', lambda path: _FakeCapture(1000.0, -9.2e18))
+    monkeypatch.setattr(video_analyzer.shutil, 'which', lambda name: None)
+    assert video_analyzer.get_video_duration('video.webm') == 0
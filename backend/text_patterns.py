@@ -0,0 +1,108 @@
+import re
+from functools import lru_cache
+
+# 자기소개서 질문 파싱에 쓰는 정규식 (모듈 로드 시 한 번만 컴파일)
+
+# 한글/영문/숫자/공백/기본 문장부호가 아닌 문자 (질문 구분자 후보 특수기호)
+SYMBOL_CLASS = r'[^가-힣a-zA-Z0-9\s.,?!()\[\]/-]'
+SPECIAL_CHAR = re.compile(SYMBOL_CLASS)
+SPECIAL_RUN = re.compile(r'[^가-힣a-zA-Z0-9\s]{5,}')
+LINE_START_SYMBOL = re.compile(rf'^\s*({SYMBOL_CLASS})', re.MULTILINE)
+SYMBOL_WORD = re.compile(rf'({SYMBOL_CLASS})\s*([가-힣]{{2,10}})')
+
+HANGUL = re.compile(r'[가-힣]')
+# 완성되지 않은 자모 (OCR이 글자를 잘못 쪼갠 흔적)
+HANGUL_JAMO = re.compile(r'[ㄱ-ㅣ]')
+LETTER = re.compile(r'[가-힣a-zA-Z]')
+WHITESPACE_RUN = re.compile(r'\s+')
+NEWLINE_RUN = re.compile(r'\n+')
+TABLE_LINES = re.compile(r'[─┌┬┐├┼┤└┴┘│┃━┏┳┓┣╋┫┗┻┛]+')
+
+# "1. 성장과정" 형태의 번호 질문
+NUMBERED_LINE = re.compile(r'^\d+\.')
+NUMBERED_PREFIX = re.compile(r'^\d+\.\s*')
+NUMBERED_ITEM = re.compile(r'(\d+)\.\s*([^0-9\n]{3,50})')
+
+# 질문 항목으로 시작하는 줄 ("1.", "2)", "Q1.", "문항 1", "■", "※" 등)
+QUESTION_PREFIX = re.compile(r'^(?:\d+\s*[.)]|Q\s*\d*\s*[.:)]|문항\s*\d+|[■□●○◆◇▶▷※◎•])')
+
+# ■ 기호 뒤의 질문 항목
+SQUARE_MARKER = '■'
+
+
+@lru_cache(maxsize=256)
+def marker_pattern(marker):
+    """특수기호 + 공백 + 3~50자 텍스트 패턴 (기호별로 한 번만 컴파일)"""
+    escaped = re.escape(marker)
+    return re.compile(rf'{escaped}\s*([^{escaped}\n]{{3,50}})')
+
+
+SQUARE_ITEM = marker_pattern(SQUARE_MARKER)
+
+
+def numbered_items(text):
+    """번호로 시작하는 줄("1. ...")에서 번호를 뗀 내용 목록 (빈 내용 포함, 줄 순서대로)"""
+    items = []
+    for line in text.split('\n'):
+        line = line.strip()
+        match = NUMBERED_PREFIX.match(line)
+        if match:
+            items.append(line[match.end():])
+    return items
+
+
+# ----------------------------------------------------
+# 마이크로 벤치마크: python text_patterns.py [자기소개서/질문 텍스트 파일 ...] [--repeat N]
+# 파일을 주지 않으면 docs/assets의 예시 텍스트를 사용합니다.
+# 함수별 소요 시간(ms, 반복 중 최소값)을 출력합니다.
+# ----------------------------------------------------
+def _benchmark(paths, repeat=20):
+    import os
+    import glob
+    import time
+    import logging
+
+    import self_util
+
+    if not paths:
+        assets = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'docs', 'assets')
+        paths = sorted(glob.glob(os.path.join(assets, '*.txt')))
+    texts = {}
+    for path in paths:
+        with open(path, encoding='utf-8') as f:
+            texts[os.path.basename(path)] = f.read()
+
+    # 함수 내부 로그 출력은 측정에서 제외
+    logging.disable(logging.INFO)
+
+    cases = {
+        'clean_hwp_text': self_util.clean_hwp_text,
+        'detect_and_convert_symbols': self_util.detect_and_convert_symbols,
+        'enhanced_symbol_detection': self_util.enhanced_symbol_detection,
+        'is_valid_question (줄별)': lambda text: [self_util.is_valid_question(line) for line in text.splitlines()],
+        'basic_question_parsing': self_util.basic_question_parsing_with_keywords,
+        'numbered_items': numbered_items,
+    }
+
+    for name, text in texts.items():
+        print(f"{name} ({len(text)}자, {text.count(chr(10)) + 1}줄)")
+        for case, func in cases.items():
+            best = None
+            for _ in range(repeat):
+                start = time.perf_counter()
+                func(text)
+                elapsed = time.perf_counter() - start
+                best = elapsed if best is None else min(best, elapsed)
+            print(f"  {case:<28} {best * 1000:8.3f} ms")
+
+
+if __name__ == '__main__':
+    import sys
+
+    args = sys.argv[1:]
+    repeat = 20
+    if '--repeat' in args:
+        index = args.index('--repeat')
+        repeat = int(args[index + 1])
+        del args[index:index + 2]
+    _benchmark(args, repeat)
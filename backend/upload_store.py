@@ -0,0 +1,240 @@
+import os
+import re
+import json
+import time
+import uuid
+import hashlib
+import tempfile
+import threading
+
+# 스트림에서 한 번에 읽는 크기
+READ_CHUNK_SIZE = 1024 * 1024
+
+# 이 시간(초) 동안 이어받지 않은 분할 업로드는 정리
+PARTIAL_UPLOAD_TTL = 24 * 60 * 60
+
+_EXTENSION_PATTERN = re.compile(r'^\.[A-Za-z0-9]{1,8}$')
+_CONTENT_ID_PATTERN = re.compile(r'^([0-9a-f]{64})(\.[A-Za-z0-9]{1,8})?$')
+_UPLOAD_ID_PATTERN = re.compile(r'^[0-9a-f]{32}$')
+
+
+class UploadError(Exception):
+    """업로드 요청이 잘못된 경우 (상태 코드 포함)"""
+
+    def __init__(self, message, status_code=400, **details):
+        super().__init__(message)
+        self.status_code = status_code
+        self.details = details
+
+
+def safe_extension(filename):
+    """원본 파일명에서 안전한 확장자만 추출 (소문자)"""
+    ext = os.path.splitext(filename or '')[1].lower()
+    return ext if _EXTENSION_PATTERN.match(ext) else ''
+
+
+class ContentStore:
+    """
+    SHA-256 내용 주소 기반 업로드 저장소
+    - 스트림을 임시 파일에 쓰면서 동시에 해시 계산 후 objects/<해시 앞 2자리>/<해시><확장자>로 원자적 이동
+    - 같은 내용이 이미 있으면 새로 저장하지 않음
+    - 분할(재개 가능) 업로드 지원
+    """
+
+    def __init__(self, root, max_upload_size=None):
+        self.root = root
+        self.max_upload_size = max_upload_size
+        self.objects_dir = os.path.join(root, 'objects')
+        self.tmp_dir = os.path.join(root, 'tmp')
+        self.partial_dir = os.path.join(root, 'partial')
+        for path in (self.objects_dir, self.tmp_dir, self.partial_dir):
+            os.makedirs(path, exist_ok=True)
+
+        # 순서대로 도착한 청크의 해시 상태: upload_id -> (hasher, 해시에 반영한 바이트 수)
+        # 청크가 다른 워커 프로세스로 갈 수 있으므로 반영한 바이트 수가 파일 크기와 다르면 파일에서 다시 읽어 맞춤
+        self._hashers = {}
+        self._locks = {}
+        self._lock = threading.Lock()
+        self.cleanup_partials()
+
+    @staticmethod
+    def object_path(root, content_id):
+        """content_id(해시+확장자)의 저장 경로 - 형식이 잘못되면 None"""
+        match = _CONTENT_ID_PATTERN.match(content_id or '')
+        if not match:
+            return None
+        return os.path.join(root, 'objects', match.group(1)[:2], content_id)
+
+    def path_for(self, content_id):
+        path = self.object_path(self.root, content_id)
+        return path if path and os.path.isfile(path) else None
+
+    def _commit(self, tmp_path, digest, ext, size):
+        """임시 파일을 내용 주소 경로로 이동 (이미 있으면 임시 파일만 삭제)"""
+        content_id = f'{digest}{ext}'
+        path = self.object_path(self.root, content_id)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        deduplicated = os.path.exists(path)
+        if deduplicated:
+            os.remove(tmp_path)
+        else:
+            os.replace(tmp_path, path)
+
+        return {
+            'content_id': content_id,
+            'sha256': digest,
+            'size': size,
+            'deduplicated': deduplicated
+        }
+
+    def save_stream(self, stream, filename):
+        """파일 스트림을 한 번만 읽으며 해시 계산 + 저장"""
+        hasher = hashlib.sha256()
+        size = 0
+        fd, tmp_path = tempfile.mkstemp(dir=self.tmp_dir)
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                while True:
+                    chunk = stream.read(READ_CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    size += len(chunk)
+                    if self.max_upload_size and size > self.max_upload_size:
+                        raise UploadError('업로드 가능한 파일 크기를 초과했습니다.', 413)
+                    hasher.update(chunk)
+                    f.write(chunk)
+            return self._commit(tmp_path, hasher.hexdigest(), safe_extension(filename), size)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    # ----------------------------------------------------
+    # 분할 업로드
+    # ----------------------------------------------------
+    def _partial_paths(self, upload_id):
+        if not _UPLOAD_ID_PATTERN.match(upload_id or ''):
+            raise UploadError('upload_id 형식이 올바르지 않습니다.')
+        base = os.path.join(self.partial_dir, upload_id)
+        return f'{base}.part', f'{base}.json'
+
+    def _upload_lock(self, upload_id):
+        with self._lock:
+            if upload_id not in self._locks:
+                self._locks[upload_id] = threading.Lock()
+            return self._locks[upload_id]
+
+    def _read_upload_meta(self, upload_id):
+        data_path, meta_path = self._partial_paths(upload_id)
+        if not os.path.exists(meta_path):
+            raise UploadError('분할 업로드를 찾을 수 없습니다.', 404)
+        with open(meta_path, 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+        meta['received'] = os.path.getsize(data_path) if os.path.exists(data_path) else 0
+        return meta
+
+    def start_upload(self, filename, total_size):
+        """분할 업로드 시작 - upload_id 반환"""
+        total_size = int(total_size)
+        if total_size <= 0:
+            raise UploadError('파일 크기가 올바르지 않습니다.')
+        if self.max_upload_size and total_size > self.max_upload_size:
+            raise UploadError('업로드 가능한 파일 크기를 초과했습니다.', 413)
+
+        upload_id = uuid.uuid4().hex
+        data_path, meta_path = self._partial_paths(upload_id)
+        open(data_path, 'wb').close()
+        meta = {
+            'upload_id': upload_id,
+            'filename': os.path.basename(filename or ''),
+            'size': total_size,
+            'created_at': time.time()
+        }
+        with open(meta_path, 'w', encoding='utf-8') as f:
+            json.dump(meta, f, ensure_ascii=False)
+
+        self._hashers[upload_id] = (hashlib.sha256(), 0)
+        meta['received'] = 0
+        return meta
+
+    def _hasher_at(self, upload_id, data_path, received):
+        """
+        파일 앞 received바이트까지 반영한 해시 상태
+        이 프로세스가 보지 못한 청크(다른 워커가 받은 청크, 재시작 전 청크)는 파일에서 읽어 따라잡음
+        """
+        hasher, consumed = self._hashers.pop(upload_id, (None, 0))
+        if hasher is None or consumed > received:
+            hasher, consumed = hashlib.sha256(), 0
+        if consumed < received:
+            with open(data_path, 'rb') as f:
+                f.seek(consumed)
+                remaining = received - consumed
+                while remaining > 0:
+                    chunk = f.read(min(READ_CHUNK_SIZE, remaining))
+                    if not chunk:
+                        raise UploadError('분할 업로드 파일이 손상되었습니다.', 409)
+                    hasher.update(chunk)
+                    remaining -= len(chunk)
+        return hasher
+
+    def upload_status(self, upload_id):
+        """이어받기용 현재 수신 바이트 수"""
+        return self._read_upload_meta(upload_id)
+
+    def append_chunk(self, upload_id, offset, stream):
+        """offset 위치부터 청크 추가 - offset이 현재 수신 크기와 다르면 409 (클라이언트가 재개 위치 확인)"""
+        with self._upload_lock(upload_id):
+            meta = self._read_upload_meta(upload_id)
+            if offset != meta['received']:
+                raise UploadError('청크 위치가 맞지 않습니다.', 409, received=meta['received'])
+
+            data_path, _ = self._partial_paths(upload_id)
+            received = meta['received']
+            hasher = self._hasher_at(upload_id, data_path, received)
+            with open(data_path, 'ab') as f:
+                while True:
+                    chunk = stream.read(READ_CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    if received + len(chunk) > meta['size']:
+                        # 해시 상태는 버림 → 다음 요청에서 파일 기준으로 다시 따라잡음
+                        raise UploadError('선언한 파일 크기를 초과했습니다.', 413)
+                    f.write(chunk)
+                    received += len(chunk)
+                    hasher.update(chunk)
+            # 청크가 중간에 끊기면(예외) 해시 상태를 저장하지 않음
+            self._hashers[upload_id] = (hasher, received)
+
+            meta['received'] = received
+            return meta
+
+    def complete_upload(self, upload_id):
+        """모든 청크 수신 후 해시 확정 + 저장소로 이동"""
+        with self._upload_lock(upload_id):
+            meta = self._read_upload_meta(upload_id)
+            if meta['received'] != meta['size']:
+                raise UploadError('아직 모든 청크를 받지 못했습니다.', 409, received=meta['received'])
+
+            data_path, meta_path = self._partial_paths(upload_id)
+            # 해시 상태가 없거나(재시작) 일부 청크만 본 경우(다른 워커가 받은 청크) 파일에서 나머지를 읽어 계산
+            hasher = self._hasher_at(upload_id, data_path, meta['received'])
+
+            result = self._commit(data_path, hasher.hexdigest(), safe_extension(meta['filename']), meta['size'])
+            os.remove(meta_path)
+
+        with self._lock:
+            self._locks.pop(upload_id, None)
+        return result
+
+    def cleanup_partials(self, max_age=PARTIAL_UPLOAD_TTL):
+        """오래된 분할 업로드와 남은 임시 파일 정리"""
+        now = time.time()
+        for directory in (self.partial_dir, self.tmp_dir):
+            for name in os.listdir(directory):
+                path = os.path.join(directory, name)
+                try:
+                    if now - os.path.getmtime(path) > max_age:
+                        os.remove(path)
+                except OSError:
+                    continue
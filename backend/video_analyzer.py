@@ -0,0 +1,430 @@
+import math
+import shutil
+import subprocess
+import multiprocessing
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+import cv2
+import numpy as np
+
+from config import VIDEO_SAMPLE_FPS, VIDEO_FACE_SAMPLE_FPS, VIDEO_ANALYSIS_WORKERS
+
+# 워커로 보내기 전 프레임 최대 가로 크기 (포즈/얼굴 추정에는 640px이면 충분)
+MAX_FRAME_WIDTH = 640
+
+# 프로세스 간 전달 중인 프레임 수 상한 (워커 수 배수) - 메모리 사용량 고정
+PENDING_FRAMES_PER_WORKER = 4
+
+# 코 위치 이동 속도가 이 값(화면 비율/초) 이상이면 머리 움직임 점수 0
+HEAD_SPEED_LIMIT = 0.15
+
+# 샘플 간격이 이 값(초)보다 길면 머리 이동/깜빡임 계산에서 끊긴 구간으로 간주
+MAX_SAMPLE_GAP = 2.0
+
+# 눈 종횡비(EAR)가 이 값 미만이면 감은 눈
+EAR_CLOSED_THRESHOLD = 0.21
+
+# 입 너비 / 얼굴 너비 비율이 이 값 이상이면 미소
+SMILE_WIDTH_RATIO = 0.45
+
+# 홍채가 눈 안에서 이 범위 안에 있고 고개가 정면이면 카메라 응시로 판단
+GAZE_IRIS_RANGE = (0.35, 0.65)
+GAZE_MAX_YAW = 0.12
+
+# 환경 점수 기준 - 평균 밝기 범위와 선명도(라플라시안 분산)
+BRIGHTNESS_RANGE = (70, 190)
+SHARPNESS_GOOD = 100.0
+
+# Pose 랜드마크
+POSE_NOSE = 0
+
+# Face Mesh 랜드마크 (refine_landmarks=True 기준)
+FACE_NOSE_TIP = 1
+FACE_LEFT_CHEEK = 234
+FACE_RIGHT_CHEEK = 454
+MOUTH_LEFT = 61
+MOUTH_RIGHT = 291
+LEFT_EYE = (33, 160, 158, 133, 153, 144)   # 바깥, 위1, 위2, 안, 아래2, 아래1
+RIGHT_EYE = (362, 385, 387, 263, 373, 380)
+LEFT_IRIS = 468
+RIGHT_IRIS = 473
+
+
+def iter_sampled_frames(video_path, sample_fps=VIDEO_SAMPLE_FPS, max_width=MAX_FRAME_WIDTH):
+    """
+    비디오를 순차적으로 읽으며 sample_fps 간격의 프레임만 (timestamp, frame)으로 반환합니다.
+    한 번에 한 프레임만 메모리에 유지하므로 영상 길이와 무관하게 메모리 사용량이 일정합니다.
+    """
+    cap = cv2.VideoCapture(video_path)
+    if not cap.isOpened():
+        raise ValueError(f'비디오 파일을 열 수 없습니다: {video_path}')
+
+    fps = cap.get(cv2.CAP_PROP_FPS)
+    if not fps or math.isnan(fps) or fps <= 0:
+        fps = 30.0
+    step = max(1, int(round(fps / sample_fps))) if sample_fps > 0 else 1
+
+    index = 0
+    try:
+        while True:
+            if index % step:
+                # 샘플링 대상이 아닌 프레임은 grab만 하고 색 변환/복사는 생략
+                if not cap.grab():
+                    break
+                index += 1
+                continue
+
+            ok, frame = cap.read()
+            if not ok:
+                break
+
+            height, width = frame.shape[:2]
+            if width > max_width:
+                scale = max_width / width
+                frame = cv2.resize(frame, (max_width, int(height * scale)), interpolation=cv2.INTER_AREA)
+
+            yield index / fps, frame
+            index += 1
+    finally:
+        cap.release()
+
+
+def _valid_positive(value):
+    return value is not None and math.isfinite(value) and value > 0
+
+
+def _probe_duration(video_path):
+    """ffprobe로 컨테이너 길이(초) 조회 - ffprobe가 없거나 실패하면 0"""
+    ffprobe = shutil.which('ffprobe')
+    if not ffprobe:
+        return 0
+    try:
+        output = subprocess.run(
+            [ffprobe, '-v', 'error', '-show_entries', 'format=duration', '-of', 'csv=p=0', video_path],
+            capture_output=True, text=True, timeout=10
+        ).stdout.strip()
+        duration = float(output)
+    except (OSError, ValueError, subprocess.SubprocessError):
+        return 0
+    return duration if _valid_positive(duration) else 0
+
+
+def get_video_duration(video_path):
+    """
+    비디오 길이(초) - 진행률 계산용, 알 수 없으면 0
+    일부 webm 컨테이너는 프레임 수가 없거나 음수로 나오므로 그때는 ffprobe로 다시 조회
+    """
+    cap = cv2.VideoCapture(video_path)
+    try:
+        fps = cap.get(cv2.CAP_PROP_FPS)
+        frame_count = cap.get(cv2.CAP_PROP_FRAME_COUNT)
+    finally:
+        cap.release()
+    if _valid_positive(fps) and _valid_positive(frame_count):
+        return frame_count / fps
+    return _probe_duration(video_path)
+
+
+def bounded_map(executor, fn, items, max_pending):
+    """
+    executor.map과 같지만 제출된 작업 수를 max_pending으로 제한합니다.
+    결과는 입력 순서대로 반환되며, 입력 이터레이터는 필요한 만큼만 소비됩니다.
+    """
+    pending = deque()
+    for item in items:
+        pending.append(executor.submit(fn, item))
+        if len(pending) >= max_pending:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+# ----------------------------------------------------
+# 워커 프로세스 (프로세스마다 MediaPipe 모델을 한 번만 로드)
+# ----------------------------------------------------
+_worker_posture_analyzer = None
+_worker_face_mesh = None
+
+
+def _init_video_worker(analyze_face):
+    global _worker_posture_analyzer, _worker_face_mesh
+    cv2.setNumThreads(1)  # 프로세스 병렬화와 OpenCV 내부 스레드 경쟁 방지
+    from posture_analyzer import PostureAnalyzer
+    _worker_posture_analyzer = PostureAnalyzer()
+
+    if analyze_face:
+        import mediapipe as mp
+        # 워커마다 연속되지 않은 프레임을 받으므로 추적 모드 대신 정적 이미지 모드 사용
+        _worker_face_mesh = mp.solutions.face_mesh.FaceMesh(
+            static_image_mode=True,
+            max_num_faces=1,
+            refine_landmarks=True,
+            min_detection_confidence=0.5
+        )
+
+
+def _eye_aspect_ratio(points, eye):
+    outer, top1, top2, inner, bottom2, bottom1 = (points[i] for i in eye)
+    width = np.linalg.norm(outer - inner)
+    if width == 0:
+        return 0.0
+    return float((np.linalg.norm(top1 - bottom1) + np.linalg.norm(top2 - bottom2)) / (2 * width))
+
+
+def _iris_position(points, eye, iris):
+    """눈 바깥쪽(0) ~ 안쪽(1) 사이 홍채의 수평 위치"""
+    outer, inner = points[eye[0]], points[eye[3]]
+    width = inner[0] - outer[0]
+    if width == 0:
+        return 0.5
+    return float((points[iris][0] - outer[0]) / width)
+
+
+def _extract_face_features(frame_rgb):
+    """Face Mesh 결과에서 (카메라 응시 여부, 입 너비 비율, EAR, 코 끝 좌표)만 계산"""
+    results = _worker_face_mesh.process(frame_rgb)
+    if not results.multi_face_landmarks:
+        return None
+
+    landmarks = results.multi_face_landmarks[0].landmark
+    points = np.array([(lm.x, lm.y) for lm in landmarks], dtype=np.float32)
+
+    face_width = abs(points[FACE_RIGHT_CHEEK][0] - points[FACE_LEFT_CHEEK][0])
+    if face_width == 0:
+        return None
+
+    mouth_ratio = float(np.linalg.norm(points[MOUTH_RIGHT] - points[MOUTH_LEFT]) / face_width)
+    ear = (_eye_aspect_ratio(points, LEFT_EYE) + _eye_aspect_ratio(points, RIGHT_EYE)) / 2
+
+    face_center_x = (points[FACE_LEFT_CHEEK][0] + points[FACE_RIGHT_CHEEK][0]) / 2
+    yaw = (points[FACE_NOSE_TIP][0] - face_center_x) / face_width
+    iris = (_iris_position(points, LEFT_EYE, LEFT_IRIS) + _iris_position(points, RIGHT_EYE, RIGHT_IRIS)) / 2
+    on_camera = abs(yaw) < GAZE_MAX_YAW and GAZE_IRIS_RANGE[0] <= iris <= GAZE_IRIS_RANGE[1]
+
+    nose = points[FACE_NOSE_TIP]
+    return on_camera, mouth_ratio, ear, (float(nose[0]), float(nose[1]))
+
+
+def _analyze_video_frame(item):
+    """
+    프레임 하나를 분석해 작은 튜플만 반환 (프레임/랜드마크 전체는 돌려보내지 않음)
+    (timestamp, 자세 분석 여부, 자세 점수, 자세 코 좌표, 얼굴 특징, 밝기, 선명도)
+    """
+    timestamp, frame, run_pose = item
+
+    posture_score, pose_nose = None, None
+    if run_pose:
+        result = _worker_posture_analyzer.analyze_frame(frame)
+        if result['success']:
+            posture_score = result['posture_score']
+            nose = result['landmarks'][POSE_NOSE]
+            pose_nose = (nose[0], nose[1])
+
+    face = None
+    if _worker_face_mesh is not None:
+        face = _extract_face_features(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+
+    gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+    brightness = float(gray.mean())
+    sharpness = float(cv2.Laplacian(gray, cv2.CV_64F).var()) if run_pose else None
+
+    return timestamp, run_pose, posture_score, pose_nose, face, brightness, sharpness
+
+
+# ----------------------------------------------------
+# 지표별 누적기 - 모두 O(1) 상태만 유지
+# ----------------------------------------------------
+class PostureAccumulator:
+    """자세 점수 평균"""
+
+    def __init__(self):
+        self.frames = 0
+        self.detected = 0
+        self.score_sum = 0.0
+
+    def update(self, score):
+        self.frames += 1
+        if score is not None:
+            self.detected += 1
+            self.score_sum += score
+
+    def result(self):
+        return round(self.score_sum / self.detected * 100) if self.detected else None
+
+
+class HeadMovementAccumulator:
+    """코 위치 이동 속도 기반 머리 안정도 (0~100, 높을수록 안정적)"""
+
+    def __init__(self):
+        self.distance = 0.0
+        self.time = 0.0
+        self._prev_nose = None
+        self._prev_time = None
+
+    def update(self, timestamp, nose):
+        if nose is None:
+            self._prev_nose = None
+            return
+        if self._prev_nose is not None and 0 < timestamp - self._prev_time <= MAX_SAMPLE_GAP:
+            self.distance += math.hypot(nose[0] - self._prev_nose[0], nose[1] - self._prev_nose[1])
+            self.time += timestamp - self._prev_time
+        self._prev_nose = nose
+        self._prev_time = timestamp
+
+    def result(self):
+        if self.time <= 0:
+            return None
+        speed = self.distance / self.time
+        return round(max(0.0, 1 - speed / HEAD_SPEED_LIMIT) * 100)
+
+
+class RatioAccumulator:
+    """조건을 만족한 프레임 비율 (%)"""
+
+    def __init__(self):
+        self.hits = 0
+        self.total = 0
+
+    def update(self, hit):
+        self.total += 1
+        if hit:
+            self.hits += 1
+
+    def result(self):
+        return round(self.hits / self.total * 100) if self.total else None
+
+
+class BlinkCounter:
+    """EAR 상태 전이(뜬 눈 → 감은 눈 → 뜬 눈)로 분당 깜빡임 수 계산"""
+
+    def __init__(self):
+        self.blinks = 0
+        self.observed_time = 0.0
+        self._closed = False
+        self._prev_time = None
+
+    def update(self, timestamp, ear):
+        if ear is None:
+            self._prev_time = None
+            self._closed = False
+            return
+        if self._prev_time is not None and 0 < timestamp - self._prev_time <= MAX_SAMPLE_GAP:
+            self.observed_time += timestamp - self._prev_time
+        self._prev_time = timestamp
+
+        closed = ear < EAR_CLOSED_THRESHOLD
+        if self._closed and not closed:
+            self.blinks += 1
+        self._closed = closed
+
+    def result(self):
+        if self.observed_time <= 0:
+            return None
+        return round(self.blinks / (self.observed_time / 60))
+
+
+class EnvironmentAccumulator:
+    """조명(평균 밝기)과 선명도 기반 촬영 환경 점수 (1.0~5.0)"""
+
+    def __init__(self):
+        self.frames = 0
+        self.well_lit = 0
+        self.sharp_frames = 0
+        self.sharp_total = 0
+
+    def update(self, brightness, sharpness):
+        self.frames += 1
+        if BRIGHTNESS_RANGE[0] <= brightness <= BRIGHTNESS_RANGE[1]:
+            self.well_lit += 1
+        if sharpness is not None:
+            self.sharp_total += 1
+            if sharpness >= SHARPNESS_GOOD:
+                self.sharp_frames += 1
+
+    def result(self):
+        if not self.frames:
+            return None
+        lighting = self.well_lit / self.frames
+        sharpness = self.sharp_frames / self.sharp_total if self.sharp_total else lighting
+        return round(1.0 + 4.0 * (0.6 * lighting + 0.4 * sharpness), 1)
+
+
+def analyze_video_frames(video_path, pose_fps=VIDEO_SAMPLE_FPS, face_fps=VIDEO_FACE_SAMPLE_FPS,
+                         workers=VIDEO_ANALYSIS_WORKERS, analyze_face=True, progress_callback=None):
+    """
+    녹화된 면접 영상을 한 번 순차 디코딩하면서 프레임 단위로 분석합니다.
+    - 얼굴(시선/미소/깜빡임/머리 움직임): face_fps (깜빡임 검출을 위해 초당 10프레임 이상 권장)
+    - 자세/환경: pose_fps
+    모델 추론은 프로세스 풀에서 병렬 실행하고, 결과는 순서대로 받아 지표별 O(1) 누적기에 반영합니다.
+    """
+    duration = get_video_duration(video_path)
+    sample_fps = max(face_fps, pose_fps) if analyze_face else pose_fps
+    pose_every = max(1, int(round(sample_fps / pose_fps)))
+
+    posture = PostureAccumulator()
+    head = HeadMovementAccumulator()
+    gaze = RatioAccumulator()
+    smile = RatioAccumulator()
+    blink = BlinkCounter()
+    environment = EnvironmentAccumulator()
+    face_frames = 0
+    last_timestamp = None
+
+    def items():
+        for index, (timestamp, frame) in enumerate(iter_sampled_frames(video_path, sample_fps)):
+            yield timestamp, frame, index % pose_every == 0
+
+    # Flask 프로세스의 MediaPipe/스레드 상태를 물려받지 않도록 spawn 사용
+    context = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context,
+                             initializer=_init_video_worker, initargs=(analyze_face,)) as executor:
+        results = bounded_map(executor, _analyze_video_frame, items(), workers * PENDING_FRAMES_PER_WORKER)
+        for timestamp, run_pose, posture_score, pose_nose, face, brightness, sharpness in results:
+            last_timestamp = timestamp
+            if run_pose:
+                posture.update(posture_score)
+                environment.update(brightness, sharpness)
+
+            if analyze_face:
+                if face is not None:
+                    face_frames += 1
+                    on_camera, mouth_ratio, ear, face_nose = face
+                    gaze.update(on_camera)
+                    smile.update(mouth_ratio >= SMILE_WIDTH_RATIO)
+                    blink.update(timestamp, ear)
+                    head.update(timestamp, face_nose)
+                else:
+                    blink.update(timestamp, None)
+                    head.update(timestamp, None)
+            elif run_pose:
+                head.update(timestamp, pose_nose)
+
+            if progress_callback and duration:
+                progress_callback(min(timestamp / duration, 1.0))
+
+    return {
+        'posture': posture.result(),
+        'headMove': head.result(),
+        'gaze': gaze.result(),
+        'smile': smile.result(),
+        'blinkPerMin': blink.result(),
+        'environment': environment.result(),
+        'frames_analyzed': posture.frames,
+        'frames_detected': posture.detected,
+        'face_frames': face_frames,
+        # 길이를 알 수 없었던 영상은 마지막으로 디코딩한 프레임 시각으로 대신함
+        'duration_sec': round(duration if duration > 0 else
+                              (last_timestamp + 1.0 / sample_fps if last_timestamp is not None else 0.0), 1)
+    }
+
+
+def analyze_video_posture(video_path, sample_fps=VIDEO_SAMPLE_FPS, workers=VIDEO_ANALYSIS_WORKERS, progress_callback=None):
+    """녹화된 면접 영상의 자세/머리 움직임만 배치 분석 (얼굴 분석 생략)"""
+    metrics = analyze_video_frames(
+        video_path,
+        pose_fps=sample_fps,
+        workers=workers,
+        analyze_face=False,
+        progress_callback=progress_callback
+    )
+    return {key: metrics[key] for key in ('posture', 'headMove', 'frames_analyzed', 'frames_detected', 'duration_sec')}